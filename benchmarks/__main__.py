@@ -0,0 +1,104 @@
+"""Run the benchmark suite, write a JSON baseline or compare against one.
+
+Run with::
+
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks compare baseline.json --threshold 15
+
+``compare`` exits with status 1 when any benchmark is slower than the baseline
+by more than ``--threshold`` percent, so it can gate performance changes in CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+from benchmarks.suite import BENCHMARKS, run_suite
+
+DEFAULT_THRESHOLD = 10.0
+
+
+def write_results(path: Path, results: dict[str, float]) -> None:
+    """Write results together with the interpreter they were measured on."""
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    baseline: dict[str, float], current: dict[str, float], threshold: float
+) -> list[str]:
+    """Print a comparison table and return the names that regressed."""
+    regressions = []
+    print(f"{'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, ns in current.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<32} {'-':>12} {ns:>12.0f} {'new':>8}")
+            continue
+        change = (ns - before) / before * 100
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {before:>12.0f} {ns:>12.0f} {change:>+7.1f}%{flag}")
+    return regressions
+
+
+def main() -> int:
+    """Parse arguments and run the requested mode."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    run_parser = subparsers.add_parser("run", help="Run and optionally save results")
+    compare_parser = subparsers.add_parser(
+        "compare", help="Run and compare against a baseline"
+    )
+    compare_parser.add_argument("baseline", type=Path, help="Baseline JSON file")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown in percent (default %(default)s)",
+    )
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--output", type=Path, help="Write results to this file")
+        sub.add_argument(
+            "--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run"
+        )
+        sub.add_argument(
+            "--scale", type=float, default=1.0, help="Iteration count multiplier"
+        )
+    args = parser.parse_args()
+
+    baseline: dict[str, float] = {}
+    if args.mode == "compare":
+        baseline = json.loads(args.baseline.read_text())["results"]
+    results = run_suite(args.only, args.scale)
+    if args.output:
+        write_results(args.output, results)
+
+    if args.mode == "run":
+        print(f"{'benchmark':<32} {'ns/op':>12}")
+        for name, ns in results.items():
+            print(f"{name:<32} {ns:>12.0f}")
+        return 0
+
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) regressed by more than "
+            f"{args.threshold:g}%: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Shared helpers for the offline benchmarks.
+
+Provides synthetic updates, a minimal bot stub, an offline Bot API request
+backend, local server helpers and small timing and percentile helpers, so each
+benchmark script can focus on the code path it measures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from telegram import Chat, Message, MessageEntity, Update, User
+from telegram.request import BaseRequest
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine
+
+    from telegram.request import RequestData
+
+
+class StubBot:
+    """Bot stand-in exposing only what command parsing needs."""
+
+    def __init__(self, username: str = "bench_bot") -> None:
+        """Initialize the stub with a bot username."""
+        self.username = username
+
+
+def api_result(
+    endpoint: str, parameters: dict[str, Any], message_id: int, username: str
+) -> object:
+    """Return a plausible ``result`` payload for a Bot API call to ``endpoint``.
+
+    ``getMe`` returns a bot user and methods that send a message echo it back as
+    a ``Message``; everything else returns ``True``.
+    """
+    if endpoint == "getMe":
+        return {"id": 1, "is_bot": True, "first_name": "Bench", "username": username}
+    if endpoint.startswith("send"):
+        return {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": parameters.get("chat_id", 0), "type": "private"},
+            "text": parameters.get("text", ""),
+        }
+    return True
+
+
+class StubRequest(BaseRequest):
+    """Offline Bot API backend that answers every method with :func:`api_result`.
+
+    Calls are counted per endpoint in :attr:`calls`.
+    """
+
+    def __init__(self, username: str = "bench_bot") -> None:
+        """Initialize the stub with the bot username returned by ``getMe``."""
+        self.username = username
+        self.calls: Counter[str] = Counter()
+
+    @property
+    def read_timeout(self) -> float | None:
+        """Stub requests never time out."""
+        return None
+
+    async def initialize(self) -> None:
+        """Nothing to set up."""
+
+    async def shutdown(self) -> None:
+        """Nothing to tear down."""
+
+    async def do_request(  # noqa: PLR0913
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        read_timeout: object = None,
+        write_timeout: object = None,
+        connect_timeout: object = None,
+        pool_timeout: object = None,
+    ) -> tuple[int, bytes]:
+        """Answer a Bot API call without touching the network."""
+        _ = method, read_timeout, write_timeout, connect_timeout, pool_timeout
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls[endpoint] += 1
+        parameters = request_data.parameters if request_data else {}
+        result = api_result(
+            endpoint, parameters, self.calls[endpoint], self.username
+        )
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+def make_update_payload(update_id: int, chat_id: int, text: str = "/start") -> dict:
+    """Build a raw message update as Telegram would send it."""
+    message: dict[str, Any] = {
+        "message_id": update_id,
+        "date": 1_700_000_000,
+        "chat": {"id": chat_id, "type": "private", "first_name": "Bench"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": "Bench"},
+        "text": text,
+    }
+    if text.startswith("/"):
+        length = len(text.split()[0])
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": length}]
+    return {"update_id": update_id, "message": message}
+
+
+def make_command_update(
+    text: str,
+    bot: object | None = None,
+    *,
+    update_id: int = 1,
+    chat_id: int = 1,
+    user_id: int = 1,
+) -> Update:
+    """Build an ``Update`` carrying a message whose text starts with a command."""
+    command_length = len(text.split()[0]) if text.startswith("/") else 0
+    entities = (
+        [MessageEntity(MessageEntity.BOT_COMMAND, 0, command_length)]
+        if command_length
+        else []
+    )
+    message = Message(
+        message_id=update_id,
+        date=datetime.now(UTC),
+        chat=Chat(chat_id, Chat.PRIVATE),
+        from_user=User(user_id, "bench", is_bot=False),
+        text=text,
+        entities=entities,
+    )
+    message.set_bot(bot or StubBot())
+    return Update(update_id=update_id, message=message)
+
+
+def measure_ns(func: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """Return the best per-call time of ``func`` in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def drive(coroutine: Coroutine[object, object, object]) -> None:
+    """Run a coroutine that never suspends to completion, without a loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+
+
+async def measure_async_ns(
+    func: Callable[[], Awaitable[object]], number: int, repeat: int = 5
+) -> float:
+    """Return the best per-call time of awaiting ``func()`` in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await func()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def free_port() -> int:
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(url: str) -> None:
+    """Poll ``url`` until a local server accepts connections."""
+    async with aiohttp.ClientSession() as session:
+        for _ in range(100):
+            try:
+                async with session.get(url):
+                    return
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(0.05)
+    msg = f"Server at {url} did not come up"
+    raise RuntimeError(msg)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``values`` (``fraction`` in 0..1)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
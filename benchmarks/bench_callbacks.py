@@ -0,0 +1,104 @@
+"""Compare callback query dispatch cost: regex handlers vs. the prefix router.
+
+Registers 500 callback namespaces (``--patterns``) once as one regex-matched
+``CallbackQueryHandler`` per entry and once through a single
+:class:`~src.core.callback_router.CallbackRouter`, then replays the handler
+scan performed by ``Application.process_update`` for the first, last and an
+unknown namespace. Also reports the cost of encoding and decoding a typed
+payload with :class:`~src.utils.callback_data.CallbackData`.
+
+Run with::
+
+    python -m benchmarks.bench_callbacks
+"""
+
+from __future__ import annotations
+
+import argparse
+import enum
+
+from telegram import CallbackQuery, Update, User
+
+from benchmarks._util import measure_ns
+from benchmarks.bench_dispatch import HandlerCollector, resolve
+from src.core.callback_router import CallbackRouter
+from src.handlers_loader import register_callback
+from src.utils.callback_data import CallbackData
+
+
+class Action(enum.Enum):
+    """Sample enum field of the benchmarked payload."""
+
+    OPEN = 1
+    CLOSE = 2
+    DELETE = 3
+
+
+PAYLOAD = CallbackData("item", item=int, action=Action, page=int, label=str)
+
+
+async def _noop(_update: object, _context: object) -> None:
+    """Do nothing; used as a synthetic callback."""
+
+
+def make_query(data: str) -> Update:
+    """Build an update carrying a callback query with ``data``."""
+    user = User(1, "bench", is_bot=False)
+    return Update(update_id=1, callback_query=CallbackQuery("1", user, "c", data=data))
+
+
+def register(size: int, strategy: str) -> HandlerCollector:
+    """Register ``size`` namespaces the way ``register_handlers`` would."""
+    collector = HandlerCollector()
+    router = CallbackRouter() if strategy == "router" else None
+    if router is not None:
+        collector.add_handler(router)
+    for i in range(size):
+        if router is not None:
+            meta = {"prefix": f"ns{i}"}
+        else:
+            meta = {"pattern": rf"^ns{i}:"}
+        register_callback(collector, _noop, meta, router)
+    return collector
+
+
+def run(size: int, number: int) -> list[tuple[str, str, float]]:
+    """Measure dispatch cost and return ``(strategy, case, ns)`` rows."""
+    cases = {
+        "first": make_query("ns0:1A.0"),
+        "last": make_query(f"ns{size - 1}:1A.0"),
+        "unknown": make_query("missing:1A.0"),
+    }
+    rows = []
+    for strategy in ("regex", "router"):
+        handlers = register(size, strategy).handlers
+        for case, update in cases.items():
+            ns = measure_ns(lambda h=handlers, u=update: resolve(h, u), number)
+            rows.append((strategy, case, ns))
+    return rows
+
+
+def main() -> None:
+    """Print a table of per-query dispatch and codec costs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patterns", type=int, default=500, help="Namespaces")
+    parser.add_argument("--number", type=int, default=200, help="Calls per sample")
+    args = parser.parse_args()
+
+    print(f"{args.patterns} callback namespaces")
+    print(f"{'strategy':<9}  {'case':<8}  {'µs/query':>9}")
+    for strategy, case, ns in run(args.patterns, args.number):
+        print(f"{strategy:<9}  {case:<8}  {ns / 1000:>9.2f}")
+
+    data = PAYLOAD.encode(123456789, Action.DELETE, 42, "report")
+    encode = measure_ns(
+        lambda: PAYLOAD.encode(123456789, Action.DELETE, 42, "report"), 20000
+    )
+    decode = measure_ns(lambda: PAYLOAD.decode(data), 20000)
+    print(f"codec      {data!r} ({len(data.encode())} bytes)")
+    print(f"encode     {encode / 1000:>9.2f} µs")
+    print(f"decode     {decode / 1000:>9.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare per-update command dispatch cost between registration strategies.
+
+Builds synthetic registries of 10, 100 and 1000 commands (each with one alias),
+registers them once per strategy and replays the handler scan performed by
+``Application.process_update`` for the first, last and an unknown command.
+
+Run with::
+
+    python -m benchmarks.bench_dispatch
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from telegram.ext import BaseHandler
+
+from benchmarks._util import StubBot, make_command_update, measure_ns
+from src.handlers_loader import register_command_handlers
+from src.utils.commands import CommandMeta
+
+SIZES = (10, 100, 1000)
+STRATEGIES = ("handlers", "indexed")
+
+
+class HandlerCollector:
+    """Application stand-in that only records added handlers."""
+
+    def __init__(self) -> None:
+        """Initialize an empty handler list."""
+        self.handlers: list[BaseHandler] = []
+
+    def add_handler(self, handler: BaseHandler) -> None:
+        """Collect a handler the way ``Application.add_handler`` would for group 0."""
+        self.handlers.append(handler)
+
+
+async def _noop(_update: object, _context: object) -> None:
+    """Do nothing; used as a synthetic command callback."""
+
+
+def make_registry(size: int) -> list[CommandMeta]:
+    """Create ``size`` synthetic commands, each with a single alias."""
+    return [
+        CommandMeta(
+            name=f"cmd{i}",
+            func=_noop,
+            description=f"Command {i}",
+            aliases=[f"c{i}"],
+        )
+        for i in range(size)
+    ]
+
+
+def resolve(handlers: list[BaseHandler], update: object) -> object:
+    """Scan handlers in order and return the first non-empty check result."""
+    for handler in handlers:
+        check = handler.check_update(update)
+        if check is not None and check is not False:
+            return check
+    return None
+
+
+def run(number: int) -> list[tuple[int, str, str, float]]:
+    """Measure dispatch cost and return ``(size, strategy, case, ns)`` rows."""
+    bot = StubBot()
+    rows: list[tuple[int, str, str, float]] = []
+    for size in SIZES:
+        registry = make_registry(size)
+        cases = {
+            "first": make_command_update("/cmd0 arg", bot),
+            "last alias": make_command_update(f"/c{size - 1}@bench_bot arg", bot),
+            "unknown": make_command_update("/missing", bot),
+        }
+        for strategy in STRATEGIES:
+            collector = HandlerCollector()
+            register_command_handlers(collector, registry, strategy)
+            for case, update in cases.items():
+                handlers = collector.handlers
+                ns = measure_ns(lambda h=handlers, u=update: resolve(h, u), number)
+                rows.append((size, strategy, case, ns))
+    return rows
+
+
+def main() -> None:
+    """Print a table of per-update dispatch costs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200, help="Calls per sample")
+    args = parser.parse_args()
+
+    print(f"{'commands':>8}  {'strategy':<9}  {'case':<11}  {'µs/update':>10}")
+    for size, strategy, case, ns in run(args.number):
+        print(f"{size:>8}  {strategy:<9}  {case:<11}  {ns / 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
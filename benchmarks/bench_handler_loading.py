@@ -0,0 +1,122 @@
+"""Compare startup time of eager and lazy handler loading.
+
+Generates a package of synthetic handler modules (200 by default), each doing
+some import-time work to stand in for heavy dependencies. Every measurement
+runs in a fresh interpreter so nothing is cached in ``sys.modules``:
+
+- ``eager``: import every module, as ``register_handlers`` does by default.
+- ``lazy (cold)``: scan the sources and write the manifest cache.
+- ``lazy (warm)``: reuse the manifest cache from the previous run.
+
+Run with::
+
+    python -m benchmarks.bench_handler_loading
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULE_TEMPLATE = '''\
+"""Synthetic handler module {index}."""
+
+from src.utils.commands import command
+
+# Stand-in for the import cost of a heavy dependency
+_TABLE = {{str(n): n * n for n in range({work})}}
+
+__callbacks__ = {{"on_button_{index}": {{"pattern": r"^b{index}:"}}}}
+
+
+@command("Synthetic command {index}", aliases=["s{index}"])
+async def synthetic{index}_command(update, context):
+    """Reply to the synthetic command."""
+    await update.message.reply_text(str(len(_TABLE)))
+
+
+async def on_button_{index}(update, context):
+    """Answer the synthetic button."""
+    await update.callback_query.answer()
+'''
+
+CHILD_TEMPLATE = """
+import importlib, sys, time
+sys.path.insert(0, {tmp!r})
+start = time.perf_counter()
+from src import handlers_loader
+ready = time.perf_counter()
+package = importlib.import_module("synthetic_handlers")
+
+class Collector:
+    def __init__(self):
+        self.handlers = []
+    def add_handler(self, handler):
+        self.handlers.append(handler)
+
+handlers_loader.HANDLER_MANIFEST_FILE = {manifest!r}
+app = Collector()
+handlers_loader.register_handlers(app, loading={loading!r}, package=package)
+done = time.perf_counter()
+print((done - ready) * 1000)
+"""
+
+
+def make_package(directory: Path, modules: int, work: int) -> None:
+    """Write a ``synthetic_handlers`` package with ``modules`` handler modules."""
+    package = directory / "synthetic_handlers"
+    package.mkdir()
+    (package / "__init__.py").write_text('"""Synthetic handlers."""\n')
+    for index in range(modules):
+        source = MODULE_TEMPLATE.format(index=index, work=work)
+        (package / f"handler_{index}.py").write_text(source)
+
+
+def run_child(tmp: Path, loading: str, manifest: Path) -> float:
+    """Load handlers in a fresh interpreter and return the load time in ms."""
+    code = textwrap.dedent(
+        CHILD_TEMPLATE.format(tmp=str(tmp), manifest=str(manifest), loading=loading)
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Print load times for eager and lazy handler loading."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=200, help="Handler modules")
+    parser.add_argument(
+        "--work", type=int, default=5000, help="Import-time work per module"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        make_package(tmp, args.modules, args.work)
+        manifest = tmp / "manifest.json"
+        rows = [
+            ("eager", run_child(tmp, "eager", manifest)),
+            ("lazy (cold)", run_child(tmp, "lazy", manifest)),
+            ("lazy (warm)", run_child(tmp, "lazy", manifest)),
+        ]
+
+    print(f"{args.modules} handler modules")
+    print(f"{'loading':<12}  {'ms':>8}")
+    for name, ms in rows:
+        print(f"{name:<12}  {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
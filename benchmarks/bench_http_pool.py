@@ -0,0 +1,114 @@
+"""Burst of Bot API calls through connection pools of different sizes.
+
+Starts :mod:`benchmarks.fake_bot_api` with a fixed per-call latency in a
+separate process and sends a burst of concurrent ``sendMessage`` calls through
+:class:`~src.core.http.InstrumentedHTTPXRequest` for each pool size. Reports
+the burst duration, per-call p50/p99 latency, the time calls waited for a free
+connection and how many found the pool saturated or timed out waiting.
+
+Run with::
+
+    python -m benchmarks.bench_http_pool --burst 500 --api-latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from telegram import Bot
+from telegram.error import TimedOut
+
+from benchmarks import fake_bot_api
+from benchmarks._util import free_port, percentile, wait_until_up
+from src.core.http import POOL_SATURATED, POOL_WAIT, InstrumentedHTTPXRequest
+
+TOKEN = "123456:bench-http-pool"  # noqa: S105
+
+
+async def burst(
+    base_url: str, pool_size: int, calls: int, pool_timeout: float
+) -> tuple[float, list[float], int]:
+    """Send ``calls`` concurrent messages; return elapsed, latencies, timeouts."""
+    request = InstrumentedHTTPXRequest(
+        f"bench-{pool_size}", pool_size, pool_timeout=pool_timeout
+    )
+    latencies: list[float] = []
+    timeouts = 0
+
+    async def send(index: int) -> None:
+        nonlocal timeouts
+        start = time.perf_counter()
+        try:
+            await bot.send_message(index, "burst")
+        except TimedOut:
+            timeouts += 1
+            return
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    async with Bot(TOKEN, base_url=base_url, request=request) as bot:
+        # Warm up: open the connections before the measured burst
+        await asyncio.gather(*(send(index) for index in range(pool_size)))
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(send(index) for index in range(calls)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, timeouts
+
+
+def main() -> None:
+    """Run the burst for each pool size and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--burst", type=int, default=500, help="Concurrent calls")
+    parser.add_argument(
+        "--pool-sizes", default="1,8,32,128,256", help="Comma-separated sizes"
+    )
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Seconds")
+    parser.add_argument(
+        "--pool-timeout", type=float, default=60.0, help="Seconds to wait for a slot"
+    )
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.pool_sizes.split(",")]
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(
+        target=fake_bot_api.serve,
+        args=(port,),
+        kwargs={"latency": args.api_latency},
+        daemon=True,
+    )
+    server.start()
+    print(f"burst of {args.burst} sendMessage calls, API latency {args.api_latency}s")
+    print(
+        f"{'pool':>5} {'total s':>8} {'calls/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'wait ms':>8} {'saturated':>9} {'timeouts':>8}"
+    )
+    try:
+        asyncio.run(wait_until_up(f"http://127.0.0.1:{port}/stats"))
+        for size in sizes:
+            elapsed, latencies, timeouts = asyncio.run(
+                burst(
+                    f"http://127.0.0.1:{port}/bot",
+                    size,
+                    args.burst,
+                    args.pool_timeout,
+                )
+            )
+            wait = POOL_WAIT.labels(f"bench-{size}")
+            mean_wait = wait.sum / wait.count * 1000 if wait.count else 0.0
+            saturated = POOL_SATURATED.labels(f"bench-{size}").value
+            p50, p99 = percentile(latencies, 0.5), percentile(latencies, 0.99)
+            print(
+                f"{size:>5} {elapsed:>8.2f} {args.burst / elapsed:>8.0f} "
+                f"{p50:>8.1f} {p99:>8.1f} {mean_wait:>8.1f} "
+                f"{saturated:>9.0f} {timeouts:>8}"
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
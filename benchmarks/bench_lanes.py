@@ -0,0 +1,66 @@
+"""Measure update throughput against the number of per-chat lanes.
+
+Feeds synthetic updates from many chats through ``ChatShardedUpdateProcessor``
+the way ``Application`` does (one task per update) with I/O-bound handlers that
+sleep for a fixed time, and reports updates per second for each lane count.
+One lane corresponds to PTB's default sequential processing.
+
+Run with::
+
+    python -m benchmarks.bench_lanes
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from benchmarks._util import make_command_update
+from src.core.update_processor import ChatShardedUpdateProcessor
+
+LANE_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+async def _io_bound_handler(delay: float) -> None:
+    """Simulate a handler waiting on a downstream service."""
+    await asyncio.sleep(delay)
+
+
+async def measure(lanes: int, updates: int, chats: int, delay: float) -> float:
+    """Process ``updates`` updates and return the throughput in updates/s."""
+    batch = [
+        make_command_update("/start", update_id=i, chat_id=i % chats)
+        for i in range(updates)
+    ]
+    processor = ChatShardedUpdateProcessor(lanes, queue_size=updates)
+    async with processor:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                processor.process_update(update, _io_bound_handler(delay))
+                for update in batch
+            )
+        )
+        elapsed = time.perf_counter() - start
+    return updates / elapsed
+
+
+def main() -> None:
+    """Print throughput for each lane count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=400, help="Updates per run")
+    parser.add_argument("--chats", type=int, default=100, help="Distinct chats")
+    parser.add_argument(
+        "--delay", type=float, default=0.005, help="Handler I/O wait in seconds"
+    )
+    args = parser.parse_args()
+
+    print(f"{'lanes':>5}  {'updates/s':>10}")
+    for lanes in LANE_COUNTS:
+        rate = asyncio.run(measure(lanes, args.updates, args.chats, args.delay))
+        print(f"{lanes:>5}  {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
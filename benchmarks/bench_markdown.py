@@ -0,0 +1,100 @@
+"""Microbenchmark for ``escape_markdown``, ``escape_many`` and templates.
+
+Compares the precompiled escape tables against the previous implementation,
+which built and compiled a regex and ran two debug log calls on every call.
+Inputs cover short, long and Unicode-heavy texts. The ``/start`` message is
+also rendered both ways handlers can build it: formatting the whole text and
+escaping everything, or rendering a :class:`MarkdownTemplate` that only escapes
+the interpolated user ID.
+
+Run with::
+
+    python -m benchmarks.bench_markdown
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+
+from benchmarks._util import measure_ns
+from src.handlers.start import START_TEMPLATE
+from src.utils.markdown import escape_many, escape_markdown
+
+logger = logging.getLogger("bot_bot")
+
+INPUTS = {
+    "short": "Hello! User ID: 123456",
+    "long": (
+        "This is a base template for a Telegram bot.\n"
+        "Use this bot as a starting point (see /help - it's free)!\n"
+    )
+    * 40,
+    "unicode": "Привет, мир! 🚀 Добро пожаловать — это тест. こんにちは。" * 10,
+}
+
+
+def legacy_escape_markdown(text: str, version: int = 2) -> str:
+    """Reproduce the previous regex-per-call implementation."""
+    escape_chars = r"_*\[\]()~`>#+\-=|{}.!"
+    escaped = re.sub(f"([{re.escape(escape_chars)}])", r"\\\1", text)
+    logger.debug("Escaped MarkdownV%s: %s", version, escaped)
+    if version == 2 and re.search(r"(\*{2,}|_{2,})", text):  # noqa: PLR2004
+        logger.warning("Possible nested or excessive bold/italic syntax detected.")
+    logger.debug("Escaping text for Markdown v%s with entity='%s'", version, None)
+    return escaped
+
+
+def escape_everything(user_id: int) -> str:
+    """Build the ``/start`` message by formatting, then escaping the whole text."""
+    return escape_markdown(
+        f"Hello! User ID: {user_id}\n\n"
+        "This is a base template for a Telegram bot.\n"
+        "Use this bot as a starting point to build your own functionality.\n\n"
+        "You can see the list of commands by typing /help.",
+        version=2,
+    )
+
+
+def run(number: int) -> list[tuple[str, str, float]]:
+    """Measure each implementation and return ``(input, impl, ns)`` rows."""
+    rows: list[tuple[str, str, float]] = []
+    for name, text in INPUTS.items():
+        if legacy_escape_markdown(text) != escape_markdown(text):
+            msg = f"Implementations disagree on {name!r} input"
+            raise AssertionError(msg)
+        legacy_ns = measure_ns(lambda t=text: legacy_escape_markdown(t), number)
+        rows.append((name, "legacy", legacy_ns))
+        current_ns = measure_ns(lambda t=text: escape_markdown(t), number)
+        rows.append((name, "escape_markdown", current_ns))
+
+    batch = list(INPUTS.values()) * 10
+    loop_ns = measure_ns(lambda: [escape_markdown(t) for t in batch], number // 10)
+    rows.append((f"batch x{len(batch)}", "loop", loop_ns))
+    many_ns = measure_ns(lambda: escape_many(batch), number // 10)
+    rows.append((f"batch x{len(batch)}", "escape_many", many_ns))
+
+    if escape_everything(123456) != START_TEMPLATE.render(user_id=123456):
+        msg = "Template and escape-everything disagree on the /start message"
+        raise AssertionError(msg)
+    escape_all_ns = measure_ns(lambda: escape_everything(123456), number)
+    rows.append(("/start", "escape all", escape_all_ns))
+    template_ns = measure_ns(lambda: START_TEMPLATE.render(user_id=123456), number)
+    rows.append(("/start", "template", template_ns))
+    return rows
+
+
+def main() -> None:
+    """Print a table of per-call escaping costs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Calls per sample")
+    args = parser.parse_args()
+
+    print(f"{'input':<10}  {'implementation':<16}  {'µs/call':>9}")
+    for name, impl, ns in run(args.number):
+        print(f"{name:<10}  {impl:<16}  {ns / 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
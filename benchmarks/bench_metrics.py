@@ -0,0 +1,51 @@
+"""Measure the overhead of command metrics on the handler hot path.
+
+Compares awaiting a trivial command callback directly with awaiting it through
+``instrument_command`` (call counter, latency histogram, in-flight gauge), and
+times rendering the exposition text for a registry with many commands.
+Coroutines are driven without an event loop so only the wrapper cost shows up.
+
+Run with::
+
+    python -m benchmarks.bench_metrics
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks._util import drive, measure_ns
+from src.utils.metrics import METRICS, instrument_command
+
+
+async def _noop_command(_update: object, _context: object) -> None:
+    """Do nothing; stands in for a fast command handler."""
+
+
+def main() -> None:
+    """Print per-call cost with and without instrumentation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="Calls per run")
+    parser.add_argument(
+        "--commands", type=int, default=100, help="Commands in the rendered registry"
+    )
+    args = parser.parse_args()
+
+    wrapped = instrument_command("bench", _noop_command)
+    raw_ns = measure_ns(lambda: drive(_noop_command(None, None)), args.number)
+    wrapped_ns = measure_ns(lambda: drive(wrapped(None, None)), args.number)
+
+    for index in range(args.commands):
+        command = instrument_command(f"bench{index}", _noop_command)
+        drive(command(None, None))
+    render_us = measure_ns(METRICS.render, 50) / 1000
+
+    print(f"{'path':<14}  {'ns/call':>9}")
+    print(f"{'raw':<14}  {raw_ns:>9.0f}")
+    print(f"{'instrumented':<14}  {wrapped_ns:>9.0f}")
+    print(f"{'overhead':<14}  {wrapped_ns - raw_ns:>9.0f}")
+    print(f"render with {args.commands} commands: {render_us:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare ``PicklePersistence`` with :class:`~src.core.persistence.SqlitePersistence`.
+
+For each store size (``--sizes``, default 10k, 100k and 1M users) both
+persistences are seeded with one small ``user_data`` dict per user, then:
+
+* **startup** opens the file and loads what ``Application.initialize`` asks
+  for (user, chat and bot data); the lazy SQLite store also reads one user;
+* **flush** changes ``--changed`` percent of the users and writes them out.
+
+Run with::
+
+    python -m benchmarks.bench_persistence --sizes 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from telegram.ext import PicklePersistence
+
+from src.core.persistence import SqlitePersistence
+
+
+def user(user_id: int) -> dict:
+    """Return a typical small ``user_data`` entry."""
+    return {"lang": "en", "visits": user_id % 100, "last_command": "/start"}
+
+
+async def seed(directory: Path, size: int) -> tuple[Path, Path]:
+    """Write ``size`` users to a pickle file and a SQLite file."""
+    pickle_path = directory / f"pickle-{size}"
+    pickle = PicklePersistence(pickle_path, on_flush=True)
+    pickle.user_data = {user_id: user(user_id) for user_id in range(size)}
+    await pickle.flush()
+    sqlite_path = directory / f"sqlite-{size}.db"
+    # One batch, so seeding a large store is a single transaction
+    sqlite = SqlitePersistence(sqlite_path, batch_size=size + 1)
+    for user_id in range(size):
+        await sqlite.update_user_data(user_id, user(user_id))
+    await sqlite.flush()
+    return pickle_path, sqlite_path
+
+
+async def start(persistence: PicklePersistence | SqlitePersistence) -> None:
+    """Load the data ``Application.initialize`` requests."""
+    await persistence.get_user_data()
+    await persistence.get_chat_data()
+    await persistence.get_bot_data()
+    if isinstance(persistence, SqlitePersistence):
+        persistence.load("user_data", 0)
+
+
+async def measure(
+    factory: type, path: Path, size: int, changed: int
+) -> tuple[float, float]:
+    """Return ``(startup, flush)`` seconds for one persistence."""
+    began = time.perf_counter()
+    if factory is PicklePersistence:
+        persistence = PicklePersistence(path, on_flush=True)
+    else:
+        persistence = SqlitePersistence(path)
+    await start(persistence)
+    startup = time.perf_counter() - began
+    step = max(size // changed, 1)
+    for user_id in range(0, size, step):
+        await persistence.update_user_data(user_id, {"lang": "de"})
+    began = time.perf_counter()
+    await persistence.flush()
+    return startup, time.perf_counter() - began
+
+
+async def run(sizes: list[int], percent: float) -> list[tuple[int, str, float, float]]:
+    """Return ``(size, persistence, startup, flush)`` rows."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            pickle_path, sqlite_path = await seed(Path(tmp), size)
+            changed = max(int(size * percent / 100), 1)
+            for name, factory, path in (
+                ("pickle", PicklePersistence, pickle_path),
+                ("sqlite", SqlitePersistence, sqlite_path),
+            ):
+                startup, flush = await measure(factory, path, size, changed)
+                rows.append((size, name, startup, flush))
+    return rows
+
+
+def main() -> None:
+    """Print startup and flush latency for each store size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Number of users",
+    )
+    parser.add_argument(
+        "--changed", type=float, default=1.0, help="Percent of users changed"
+    )
+    args = parser.parse_args()
+
+    print(f"{'users':>9}  {'store':<6}  {'startup ms':>10}  {'flush ms':>9}")
+    for size, name, startup, flush in asyncio.run(run(args.sizes, args.changed)):
+        print(f"{size:>9}  {name:<6}  {startup * 1000:>10.1f}  {flush * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Compare "did you mean" lookups: bigram index vs. scanning every command.
+
+Builds a registry of random command names (``--sizes``, default 100, 1000 and
+10000), each with one alias, and looks up typos of registered names plus
+unrelated words. For each size it reports the time per lookup of the
+:class:`~src.utils.suggest.NgramIndex` used by the unknown-command fallback, of
+a linear scan computing the edit distance to every name, and of
+``difflib.get_close_matches``, together with the share of names whose edit
+distance the index still had to compute.
+
+Run with::
+
+    python -m benchmarks.bench_suggest --sizes 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import string
+
+from benchmarks._util import measure_ns
+from src.utils import suggest
+from src.utils.commands import CommandMeta, CommandRegistry
+from src.utils.suggest import (
+    NgramIndex,
+    command_index,
+    edit_distance,
+    max_typo_distance,
+)
+
+
+async def _noop(_update: object, _context: object) -> None:
+    """Do nothing; used as a synthetic callback."""
+
+
+def make_registry(size: int, rng: random.Random) -> CommandRegistry:
+    """Create ``size`` commands with random 4-12 letter names and one alias."""
+    names: set[str] = set()
+    while len(names) < size * 2:
+        length = rng.randint(4, 12)
+        names.add("".join(rng.choices(string.ascii_lowercase, k=length)))
+    words = sorted(names)
+    rng.shuffle(words)
+    return CommandRegistry(
+        CommandMeta(words[i], _noop, f"Command {i}", aliases=[words[size + i]])
+        for i in range(size)
+    )
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Swap two adjacent letters of ``word``."""
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+
+
+def linear(name: str, words: list[str]) -> list[str]:
+    """Return the closest words by comparing ``name`` with every one."""
+    limit = max_typo_distance(name)
+    matches = sorted(
+        (distance, word)
+        for word in words
+        if (distance := edit_distance(name, word, limit)) <= limit
+    )
+    return [word for _, word in matches[: suggest.MAX_SUGGESTIONS]]
+
+
+def verified_share(index: NgramIndex, queries: list[str]) -> float:
+    """Return the average share of indexed words passing the bigram filter."""
+    verified = sum(
+        len(index.candidates(query, max_typo_distance(query))) for query in queries
+    )
+    return verified / len(queries) / len(index)
+
+
+def run(size: int, number: int) -> list[tuple[str, float]]:
+    """Measure lookups at ``size`` commands and return ``(strategy, ns)`` rows."""
+    rng = random.Random(size)
+    registry = make_registry(size, rng)
+    words = [word for meta in registry for word in (meta.name, *meta.aliases)]
+    queries = [typo(rng.choice(words), rng) for _ in range(20)]
+    queries += ["".join(rng.choices(string.ascii_lowercase, k=7)) for _ in range(5)]
+    index = command_index(registry)
+    strategies = {
+        "index": lambda q: suggest.suggest_commands(q, registry),
+        "linear": lambda q: linear(q, words),
+        "difflib": lambda q: difflib.get_close_matches(q, words, n=3),
+    }
+    rows = [
+        (
+            strategy,
+            sum(measure_ns(lambda q=q, f=f: f(q), number) for q in queries)
+            / len(queries),
+        )
+        for strategy, f in strategies.items()
+    ]
+    rows.append(("verified", verified_share(index, queries)))
+    return rows
+
+
+def main() -> None:
+    """Print per-lookup cost for each registry size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Commands"
+    )
+    parser.add_argument("--number", type=int, default=3, help="Calls per sample")
+    args = parser.parse_args()
+
+    print(
+        f"{'commands':>8}  {'index µs':>10}  {'linear µs':>10}  "
+        f"{'difflib µs':>10}  {'verified':>8}"
+    )
+    for size in args.sizes:
+        rows = dict(run(size, args.number))
+        print(
+            f"{size:>8}  {rows['index'] / 1000:>10.1f}  "
+            f"{rows['linear'] / 1000:>10.1f}  {rows['difflib'] / 1000:>10.1f}  "
+            f"{rows['verified']:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Load-test the aiohttp webhook server: requests per second and tail latency.
+
+By default a local server is started in a separate process, serving
+``create_webhook_app`` with a bounded queue that a consumer drains by decoding
+each update with ``Update.de_json``, much like the aiohttp webhook mode does.
+Pass ``--url`` to target an already running instance instead.
+
+Requests carry the secret-token header, so the check is part of the measured
+path. Responses other than ``200`` (e.g. ``503`` from a full queue) are counted
+separately.
+
+Run with::
+
+    python -m benchmarks.bench_webhook
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+from telegram import Update
+
+from benchmarks._util import (
+    StubBot,
+    free_port,
+    make_update_payload,
+    percentile,
+    wait_until_up,
+)
+from src.core.webhook_server import (
+    JSON_BACKEND,
+    SECRET_HEADER,
+    create_webhook_app,
+)
+
+SECRET = "bench-secret"  # noqa: S105
+PATH = "/webhook"
+
+
+async def _serve(port: int, queue_size: int) -> None:
+    updates: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    bot = StubBot()
+
+    def submit(data: dict, _payload: bytes) -> bool:
+        if updates.full():
+            return False
+        updates.put_nowait(data)
+        return True
+
+    async def consume() -> None:
+        while True:
+            Update.de_json(await updates.get(), bot)
+
+    consumer = asyncio.create_task(consume())
+    runner = web.AppRunner(create_webhook_app(submit, PATH, SECRET), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        consumer.cancel()
+        await runner.cleanup()
+
+
+def serve_local(port: int, queue_size: int) -> None:
+    """Process entry point for the local server."""
+    asyncio.run(_serve(port, queue_size))
+
+
+async def load(
+    url: str, requests: int, concurrency: int, chats: int
+) -> tuple[float, list[float], Counter]:
+    """Send ``requests`` POSTs with ``concurrency`` clients.
+
+    Returns the elapsed seconds, per-request latencies in ms and status counts.
+    """
+    bodies = [make_update_payload(i, i % chats) for i in range(requests)]
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    next_index = iter(range(requests))
+    headers = {SECRET_HEADER: SECRET}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def client() -> None:
+            for index in next_index:
+                start = time.perf_counter()
+                async with session.post(url, json=bodies[index], headers=headers) as r:
+                    await r.read()
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[r.status] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, statuses
+
+
+def main() -> None:
+    """Run the load test and print throughput and latency percentiles."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target a running server instead")
+    parser.add_argument("--requests", type=int, default=20000, help="Total POSTs")
+    parser.add_argument("--concurrency", type=int, default=64, help="Clients")
+    parser.add_argument("--chats", type=int, default=1000, help="Distinct chats")
+    parser.add_argument(
+        "--queue-size", type=int, default=1000, help="Local server queue size"
+    )
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}{PATH}"
+        server = multiprocessing.get_context("spawn").Process(
+            target=serve_local, args=(port, args.queue_size), daemon=True
+        )
+        server.start()
+    try:
+        asyncio.run(wait_until_up(url))
+        elapsed, latencies, statuses = asyncio.run(
+            load(url, args.requests, args.concurrency, args.chats)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    print(f"{args.requests} requests, {args.concurrency} clients, JSON: {JSON_BACKEND}")
+    print(f"throughput  {args.requests / elapsed:>10.0f} req/s")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label:<10}  {percentile(latencies, fraction):>10.2f} ms")
+    print(f"{'max':<10}  {max(latencies):>10.2f} ms")
+    print("statuses    " + ", ".join(f"{s}: {n}" for s, n in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Local stand-in for ``api.telegram.org``.
+
+Answers every Bot API method (``getMe``, ``sendMessage``, ``setMyCommands``,
+...) with a plausible result after a configurable latency, and fails a
+configurable share of calls with ``429 Too Many Requests``. Calls and injected
+errors are counted per method and exposed as JSON on ``GET /stats``.
+
+Point the bot at it with ``BOT_API_BASE_URL=http://127.0.0.1:8081/bot``. Run
+with::
+
+    python -m benchmarks.fake_bot_api --port 8081 --latency 0.05 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from typing import Any
+
+from aiohttp import web
+
+from benchmarks._util import api_result
+
+BOT_USERNAME = "bench_bot"
+
+
+class FakeBotApi:
+    """Bot API emulation with injected latency and flood errors."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: int | None = None,
+    ) -> None:
+        """Configure latency (seconds), jitter (seconds) and 429 error rate."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.calls: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self._random = random.Random(seed)  # noqa: S311
+
+    @staticmethod
+    async def parameters(request: web.Request) -> dict[str, Any]:
+        """Decode call parameters from a JSON, form or multipart body."""
+        if request.content_type == "application/json":
+            return await request.json()
+        form = await request.post()
+        parameters: dict[str, Any] = {
+            key: value for key, value in form.items() if isinstance(value, str)
+        }
+        if "chat_id" in parameters:
+            # PTB sends every value as a JSON-encoded form field
+            parameters["chat_id"] = json.loads(parameters["chat_id"])
+        return parameters
+
+    async def call(self, request: web.Request) -> web.Response:
+        """Answer a single Bot API method call."""
+        method = request.match_info["method"]
+        parameters = await self.parameters(request)
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if method != "getMe" and self._random.random() < self.error_rate:
+            self.errors[method] += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after "
+                    f"{self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+        self.calls[method] += 1
+        result = api_result(method, parameters, self.calls[method], BOT_USERNAME)
+        return web.json_response({"ok": True, "result": result})
+
+    async def stats(self, _request: web.Request) -> web.Response:
+        """Return call and error counts per method."""
+        return web.json_response({"calls": self.calls, "errors": self.errors})
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application serving ``/bot<token>/<method>``."""
+        app = web.Application()
+        app.router.add_get("/stats", self.stats)
+        app.router.add_route("*", "/{token}/{method}", self.call)
+        return app
+
+
+def serve(port: int, **options: Any) -> None:  # noqa: ANN401
+    """Run a fake Bot API server on ``port`` until the process is terminated."""
+    web.run_app(
+        FakeBotApi(**options).create_app(),
+        host="127.0.0.1",
+        port=port,
+        print=None,
+        access_log=None,
+    )
+
+
+def main() -> None:
+    """Start the fake server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of calls answered 429"
+    )
+    args = parser.parse_args()
+
+    print(f"BOT_API_BASE_URL=http://127.0.0.1:{args.port}/bot")
+    serve(
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Replay recorded updates through the bot against a fake Bot API server.
+
+Reads a recording written with ``UPDATE_RECORD_FILE`` (or synthesizes traffic
+with ``--synthetic``), starts :mod:`benchmarks.fake_bot_api` in a separate
+process and feeds the updates into ``create_application`` at the original pace
+(``--speed 1``), ``N`` times faster (``--speed N``) or as fast as possible
+(``--speed max``). Updates are processed through the application's update
+processor, so ``UPDATE_LANES`` and the outbound scheduler apply as in
+production.
+
+Reports end-to-end throughput, per-command p50/p95/p99 latency and the Bot API
+calls the bot made. Run with::
+
+    python -m benchmarks.replay updates.jsonl --speed 10 --api-latency 0.05
+    python -m benchmarks.replay --synthetic 2000 --speed max
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from typing import Any
+
+import aiohttp
+from telegram import Update
+
+from benchmarks import fake_bot_api
+from benchmarks._util import (
+    free_port,
+    make_update_payload,
+    percentile,
+    wait_until_up,
+)
+from src.core import runner
+from src.core.dispatcher import parse_command
+from src.core.recorder import read_recording
+
+SYNTHETIC_COMMANDS = ("/start", "/help", "/alias", "/a", "/missing")
+
+
+def synthesize(count: int, rate: float, chats: int) -> list[tuple[float, dict]]:
+    """Build ``count`` command updates arriving at ``rate`` per second."""
+    commands = SYNTHETIC_COMMANDS
+    return [
+        (
+            index / rate,
+            make_update_payload(index, index % chats, commands[index % len(commands)]),
+        )
+        for index in range(count)
+    ]
+
+
+def label(update: Update) -> str:
+    """Name an update by its command, or by its type for non-commands."""
+    parsed = parse_command(update)
+    if parsed is not None:
+        return f"/{parsed[0]}"
+    data = update.to_dict()
+    return next((key for key in data if key != "update_id"), "empty")
+
+
+async def replay(
+    entries: list[tuple[float, dict[str, Any]]],
+    speed: float | None,
+    base_url: str,
+    *,
+    scheduler: bool = True,
+) -> tuple[float, dict[str, list[float]]]:
+    """Feed ``entries`` into the application; return elapsed seconds and latencies.
+
+    ``speed`` of ``None`` replays as fast as possible. ``scheduler=False``
+    disables the outbound scheduler to measure handlers without flood limits.
+    """
+    if not runner.BOT_TOKEN:
+        runner.BOT_TOKEN = "123456:offline-replay"
+    runner.OUTBOUND_SCHEDULER_ENABLED = scheduler
+    app = runner.create_application(
+        metrics_port=0, base_url=base_url, record_file=None
+    )
+    latencies: dict[str, list[float]] = defaultdict(list)
+
+    async def handle(update: Update) -> None:
+        start = time.perf_counter()
+        await app.update_processor.process_update(update, app.process_update(update))
+        latencies[label(update)].append((time.perf_counter() - start) * 1000)
+
+    async with app:
+        tasks = []
+        first_ts = entries[0][0] if entries else 0.0
+        start = time.perf_counter()
+        for ts, data in entries:
+            if speed is not None:
+                delay = (ts - first_ts) / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            update = Update.de_json(data, app.bot)
+            tasks.append(asyncio.create_task(handle(update)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+async def fetch_stats(url: str) -> dict[str, dict[str, int]]:
+    """Return the fake server's call and error counters."""
+    async with aiohttp.ClientSession() as session, session.get(url) as response:
+        return await response.json()
+
+
+def parse_speed(value: str) -> float | None:
+    """Parse ``--speed``: a positive factor or ``max``."""
+    if value == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        msg = "speed must be positive or 'max'"
+        raise argparse.ArgumentTypeError(msg)
+    return speed
+
+
+def report(
+    count: int, elapsed: float, latencies: dict[str, list[float]], stats: dict
+) -> None:
+    """Print throughput, per-command latency percentiles and Bot API calls."""
+    print(f"{count} updates in {elapsed:.2f}s: {count / elapsed:.0f} updates/s")
+    print(f"{'update':<16} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, values in sorted(latencies.items()):
+        p50, p95, p99 = (percentile(values, q) for q in (0.5, 0.95, 0.99))
+        print(f"{name:<16} {len(values):>7} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f}")
+    print("Bot API calls:")
+    for method, calls in sorted(stats["calls"].items()):
+        errors = stats["errors"].get(method, 0)
+        print(f"  {method:<20} {calls:>7}  (429s injected: {errors})")
+
+
+def main() -> None:
+    """Replay a recording and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", nargs="?", help="UPDATE_RECORD_FILE to replay")
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Replay N synthetic updates instead"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=100, help="Synthetic updates per second"
+    )
+    parser.add_argument("--chats", type=int, default=50, help="Synthetic chats")
+    parser.add_argument(
+        "--speed", type=parse_speed, default=1.0, help="Factor or 'max' (default 1)"
+    )
+    parser.add_argument("--limit", type=int, help="Replay at most N updates")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--api-jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 share")
+    parser.add_argument(
+        "--no-scheduler",
+        action="store_true",
+        help="Bypass the outbound scheduler's flood limits",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show bot warnings")
+    args = parser.parse_args()
+    if not args.recording and not args.synthetic:
+        parser.error("pass a recording file or --synthetic N")
+    if not args.verbose:
+        logging.getLogger("bot_bot").setLevel(logging.ERROR)
+        # Injected 429s otherwise print a traceback per failed update
+        logging.getLogger("errors").setLevel(logging.CRITICAL)
+
+    if args.synthetic:
+        entries = synthesize(args.synthetic, args.rate, args.chats)
+    else:
+        entries = list(read_recording(args.recording))
+    entries = entries[: args.limit]
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(
+        target=fake_bot_api.serve,
+        args=(port,),
+        kwargs={
+            "latency": args.api_latency,
+            "jitter": args.api_jitter,
+            "error_rate": args.error_rate,
+        },
+        daemon=True,
+    )
+    server.start()
+    stats_url = f"http://127.0.0.1:{port}/stats"
+    try:
+        asyncio.run(wait_until_up(stats_url))
+        elapsed, latencies = asyncio.run(
+            replay(
+                entries,
+                args.speed,
+                f"http://127.0.0.1:{port}/bot",
+                scheduler=not args.no_scheduler,
+            )
+        )
+        stats = asyncio.run(fetch_stats(stats_url))
+    finally:
+        server.terminate()
+        server.join()
+    report(len(entries), elapsed, latencies, stats)
+
+
+if __name__ == "__main__":
+    main()
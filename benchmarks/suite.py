@@ -0,0 +1,219 @@
+"""Benchmark suite for the bot's hot utilities.
+
+Each benchmark is a function registered with :func:`benchmark` that returns the
+best per-operation time in nanoseconds. Everything runs offline: the
+application benchmarks use :class:`~benchmarks._util.StubRequest` instead of
+the Telegram Bot API. See :mod:`benchmarks.__main__` for the command line and
+the regression gate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from typing import TYPE_CHECKING
+
+from benchmarks._util import (
+    StubBot,
+    StubRequest,
+    drive,
+    make_command_update,
+    measure_async_ns,
+    measure_ns,
+)
+from benchmarks.bench_dispatch import HandlerCollector, make_registry
+from src import config
+from src.core import runner
+from src.core.dedup import UpdateIdWindow
+from src.handlers.start import START_TEMPLATE
+from src.handlers_loader import register_handlers
+from src.utils import commands, decorators
+from src.utils.logger import ColorFormatter, JsonFormatter, record_factory
+from src.utils.markdown import escape_markdown
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+BENCHMARKS: dict[str, Callable[[float], float]] = {}
+# Synthetic registry size for the registry-wide benchmarks
+REGISTRY_SIZE = 1000
+
+LONG_TEXT = (
+    "This is a base template for a Telegram bot.\n"
+    "Use this bot as a starting point (see /help - it's free)!\n"
+) * 40
+
+
+def benchmark(
+    name: str,
+) -> Callable[[Callable[[float], float]], Callable[[float], float]]:
+    """Register a benchmark taking a scale factor and returning ns per op."""
+
+    def decorator(func: Callable[[float], float]) -> Callable[[float], float]:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def scaled(number: int, scale: float) -> int:
+    """Scale an iteration count, keeping at least one iteration."""
+    return max(1, int(number * scale))
+
+
+@benchmark("escape_markdown.short")
+def bench_escape_short(scale: float) -> float:
+    """Escape a short greeting."""
+    return measure_ns(
+        lambda: escape_markdown("Hello! User ID: 123456"), scaled(20000, scale)
+    )
+
+
+@benchmark("escape_markdown.long")
+def bench_escape_long(scale: float) -> float:
+    """Escape a multi-kilobyte text."""
+    return measure_ns(lambda: escape_markdown(LONG_TEXT), scaled(2000, scale))
+
+
+@benchmark("markdown_template.start")
+def bench_markdown_template(scale: float) -> float:
+    """Render the /start message, escaping only the interpolated user ID."""
+    return measure_ns(
+        lambda: START_TEMPLATE.render(user_id=123456), scaled(20000, scale)
+    )
+
+
+@benchmark("json_formatter.format")
+def bench_json_formatter(scale: float) -> float:
+    """Format a record logged while handling /start as one JSON line."""
+    formatter = JsonFormatter()
+    record = record_factory(
+        "bot_bot", logging.INFO, __file__, 1, "📥 Received %s", ("/start",), None
+    )
+    record.telegram_update = make_command_update("/start", chat_id=123456)
+    return measure_ns(lambda: formatter.format(record), scaled(10000, scale))
+
+
+@benchmark("update_dedup.add")
+def bench_update_dedup(scale: float) -> float:
+    """Record a new update id in the default-sized duplicate window."""
+    window = UpdateIdWindow(100_000)
+    ids = itertools.count(500_000_000)
+    return measure_ns(lambda: window.add(next(ids)), scaled(50000, scale))
+
+
+@benchmark("color_formatter.format")
+def bench_color_formatter(scale: float) -> float:
+    """Format a console record carrying user metadata."""
+    formatter = ColorFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    record = logging.LogRecord(
+        "bot_bot", logging.INFO, __file__, 1, "📥 Received %s", ("/start",), None
+    )
+    record.user_id = 123456
+    record.user_name = "bench"
+    return measure_ns(lambda: formatter.format(record), scaled(10000, scale))
+
+
+def _swap_registry(registry: commands.CommandRegistry) -> commands.CommandRegistry:
+    """Install ``registry`` as the global command registry; return the old one."""
+    previous = commands.COMMAND_REGISTRY
+    commands.COMMAND_REGISTRY = registry
+    return previous
+
+
+@benchmark("commands.descriptions.cached")
+def bench_descriptions_cached(scale: float) -> float:
+    """Serve the help text of a large registry from the memoized view."""
+    previous = _swap_registry(commands.CommandRegistry(make_registry(REGISTRY_SIZE)))
+    try:
+        return measure_ns(commands.get_commands_descriptions, scaled(20000, scale))
+    finally:
+        _swap_registry(previous)
+
+
+@benchmark("commands.descriptions.rebuild")
+def bench_descriptions_rebuild(scale: float) -> float:
+    """Build the help text of a large registry from scratch."""
+    metas = make_registry(REGISTRY_SIZE)
+    return measure_ns(
+        lambda: commands.CommandRegistry(metas).help_text, scaled(100, scale)
+    )
+
+
+def _bench_register_handlers(dispatch: str, scale: float) -> float:
+    # Import the real handler modules first so they do not register into the
+    # synthetic registry below
+    register_handlers(HandlerCollector(), dispatch=dispatch)
+    previous = _swap_registry(commands.CommandRegistry(make_registry(REGISTRY_SIZE)))
+    try:
+        return measure_ns(
+            lambda: register_handlers(HandlerCollector(), dispatch=dispatch),
+            scaled(20, scale),
+        )
+    finally:
+        _swap_registry(previous)
+
+
+@benchmark("register_handlers.handlers")
+def bench_register_handlers(scale: float) -> float:
+    """Register a large registry with one ``CommandHandler`` per name."""
+    return _bench_register_handlers("handlers", scale)
+
+
+@benchmark("register_handlers.indexed")
+def bench_register_indexed(scale: float) -> float:
+    """Register a large registry behind the indexed dispatcher."""
+    return _bench_register_handlers("indexed", scale)
+
+
+@benchmark("admin_required.wrapper")
+def bench_admin_required(scale: float) -> float:
+    """Await an admin-only no-op command as the admin."""
+
+    async def noop(_update: object, _context: object) -> None:
+        """Do nothing."""
+
+    wrapped = decorators.admin_required(noop)
+    update = make_command_update("/secret", StubBot(), user_id=config.ADMIN_ID)
+    return measure_ns(lambda: drive(wrapped(update, None)), scaled(50000, scale))
+
+
+async def _bench_application(text: str, scale: float) -> float:
+    if not runner.BOT_TOKEN:
+        runner.BOT_TOKEN = "123456:offline-benchmark"
+    # Measure dispatch, not the flood limits of the outbound scheduler
+    runner.OUTBOUND_SCHEDULER_ENABLED = False
+    app = runner.create_application(metrics_port=0, request=StubRequest())
+    number = scaled(2000, scale)
+    async with app:
+        # Distinct update ids: the deduplicator drops a repeated update unhandled
+        updates = iter(
+            [
+                make_command_update(text, app.bot, update_id=update_id)
+                for update_id in range(1, 5 * number + 1)
+            ]
+        )
+        return await measure_async_ns(
+            lambda: app.process_update(next(updates)), number, repeat=5
+        )
+
+
+@benchmark("application.dispatch.start")
+def bench_application_start(scale: float) -> float:
+    """Process ``/start`` through the full application against a stub bot."""
+    return asyncio.run(_bench_application("/start", scale))
+
+
+@benchmark("application.dispatch.help")
+def bench_application_help(scale: float) -> float:
+    """Process ``/help`` through the full application against a stub bot."""
+    return asyncio.run(_bench_application("/help", scale))
+
+
+def run_suite(
+    names: list[str] | None = None, scale: float = 1.0
+) -> dict[str, float]:
+    """Run the selected benchmarks (all by default) and return ns per op."""
+    selected = names or list(BENCHMARKS)
+    return {name: BENCHMARKS[name](scale) for name in selected}
@@ -5,8 +5,17 @@ configuration values used throughout the project.
 
 Sections:
 - Telegram bot authentication
+- Bot API HTTP connection pools
 - Webhook settings for production deployment
+- Command dispatch strategy
+- Outbound send scheduling
+- Concurrent update processing and backlog catch-up
+- Restart supervision
+- Bounded user and chat data storage
+- SQLite persistence
 - Logging configuration
+- Metrics collection and exposition
+- Error storm protection
 - Admin access control
 
 Refer to `.env.example` for variable definitions.
@@ -19,9 +28,37 @@ from dotenv import load_dotenv
 # Load environment variables from the .env file into the system environment
 load_dotenv()
 
+
+def _env_flag(name: str, *, default: bool = False) -> bool:
+    """Interpret an environment variable as a boolean flag."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 # === Telegram Authentication ===
 # Token used to authenticate the bot with Telegram API
 BOT_TOKEN = os.getenv("BOT_TOKEN")
+# Alternative Bot API server, e.g. a local one ("http://localhost:8081/bot")
+BOT_API_BASE_URL = os.getenv("BOT_API_BASE_URL") or None
+
+# === Bot API HTTP ===
+# Connection pool for regular Bot API calls (sendMessage, answerCallbackQuery, ...)
+BOT_API_POOL_SIZE = int(os.getenv("BOT_API_POOL_SIZE", "256"))
+# Idle connections kept open for reuse; empty keeps the whole pool
+BOT_API_KEEPALIVE = int(os.getenv("BOT_API_KEEPALIVE") or BOT_API_POOL_SIZE)
+BOT_API_KEEPALIVE_EXPIRY = float(os.getenv("BOT_API_KEEPALIVE_EXPIRY", "30"))  # s
+BOT_API_CONNECT_TIMEOUT = float(os.getenv("BOT_API_CONNECT_TIMEOUT", "5"))  # s
+BOT_API_READ_TIMEOUT = float(os.getenv("BOT_API_READ_TIMEOUT", "5"))  # s
+BOT_API_WRITE_TIMEOUT = float(os.getenv("BOT_API_WRITE_TIMEOUT", "5"))  # s
+# Longest wait for a free connection before a call fails with TimedOut
+BOT_API_POOL_TIMEOUT = float(os.getenv("BOT_API_POOL_TIMEOUT", "1"))  # s
+# HTTP/2 for both pools; needs the optional 'h2' package (httpx[http2])
+BOT_API_HTTP2 = _env_flag("BOT_API_HTTP2")
+# Separate pool for getUpdates, so long polls never block outgoing calls
+GET_UPDATES_POOL_SIZE = int(os.getenv("GET_UPDATES_POOL_SIZE", "1"))
+GET_UPDATES_READ_TIMEOUT = float(os.getenv("GET_UPDATES_READ_TIMEOUT", "5"))  # s
 
 # === Run Mode ===
 # Select between 'polling' or 'webhook' startup modes
@@ -32,6 +69,87 @@ RUN_MODE = os.getenv("RUN_MODE", "webhook").lower()
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")  # Webhook URL
 WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")  # noqa: S104
 WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))  # Webhook port
+# Worker processes behind the webhook ingress; 1 runs a single process
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "1"))
+WORKER_QUEUE_SIZE = int(os.getenv("WORKER_QUEUE_SIZE", "1000"))  # per worker
+# Single-process webhook server: "ptb" (built-in) or "aiohttp" (lean ingress)
+WEBHOOK_SERVER = os.getenv("WEBHOOK_SERVER", "ptb").lower()
+# Value Telegram sends in X-Telegram-Bot-Api-Secret-Token; empty disables the check
+WEBHOOK_SECRET_TOKEN = os.getenv("WEBHOOK_SECRET_TOKEN") or None
+WEBHOOK_MAX_BODY = int(os.getenv("WEBHOOK_MAX_BODY", "1048576"))  # bytes
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))  # aiohttp server
+
+# === Command Dispatch ===
+# "handlers" registers one CommandHandler per command and alias;
+# "indexed" routes every command through a single dictionary lookup
+COMMAND_DISPATCH = os.getenv("COMMAND_DISPATCH", "handlers").lower()
+# "eager" imports every handler module at startup; "lazy" reads a static
+# manifest and imports each module on first use
+HANDLER_LOADING = os.getenv("HANDLER_LOADING", "eager").lower()
+HANDLER_MANIFEST_FILE = os.getenv(
+    "HANDLER_MANIFEST_FILE", ".cache/handlers_manifest.json"
+)
+# Re-read .env and re-import changed handler modules on SIGHUP or /reload
+HOT_RELOAD = _env_flag("HOT_RELOAD", default=True)
+
+# === Outbound Scheduler ===
+# Throttle Bot API requests to stay within Telegram's flood limits
+OUTBOUND_SCHEDULER_ENABLED = _env_flag("OUTBOUND_SCHEDULER_ENABLED", default=True)
+OUTBOUND_GLOBAL_RATE = float(os.getenv("OUTBOUND_GLOBAL_RATE", "30"))  # msg/s
+OUTBOUND_CHAT_RATE = float(os.getenv("OUTBOUND_CHAT_RATE", "1"))  # msg/s per chat
+OUTBOUND_CHAT_BURST = float(os.getenv("OUTBOUND_CHAT_BURST", "3"))  # burst per chat
+OUTBOUND_GROUP_RATE = float(os.getenv("OUTBOUND_GROUP_RATE", "20"))  # msg/min
+# Merge consecutive sendMessage calls to the same chat into one message
+OUTBOUND_COALESCE = _env_flag("OUTBOUND_COALESCE")
+OUTBOUND_MAX_RETRIES = int(os.getenv("OUTBOUND_MAX_RETRIES", "3"))
+
+# === Update Processing ===
+# Number of per-chat ordered lanes; 1 keeps PTB's sequential processing
+UPDATE_LANES = int(os.getenv("UPDATE_LANES", "1"))
+UPDATE_LANE_QUEUE_SIZE = int(os.getenv("UPDATE_LANE_QUEUE_SIZE", "100"))  # per lane
+# Append every received update to this JSON Lines file for replay (empty disables)
+UPDATE_RECORD_FILE = os.getenv("UPDATE_RECORD_FILE") or None
+# Update types requested from Telegram: empty derives them from the registered
+# handlers, "all" requests every type, or a comma-separated list
+ALLOWED_UPDATES = os.getenv("ALLOWED_UPDATES", "").strip().lower()
+# Drop updates whose id is among this many recently seen ones (0 disables)
+UPDATE_DEDUP_WINDOW = int(os.getenv("UPDATE_DEDUP_WINDOW", "100000"))
+# How the backlog pending at startup is handled: "none" or a comma-separated mix
+# of "drop" (older than CATCHUP_MAX_AGE), "rate" (CATCHUP_RATE per second) and
+# "newest_first" (per chat)
+CATCHUP_POLICY = os.getenv("CATCHUP_POLICY", "none").lower()
+CATCHUP_MAX_AGE = float(os.getenv("CATCHUP_MAX_AGE", "300"))  # s
+CATCHUP_RATE = float(os.getenv("CATCHUP_RATE", "20"))  # updates/s
+
+# === Supervisor ===
+# Restart the bot in-process after network errors, with jittered exponential
+# backoff between SUPERVISOR_BACKOFF_INITIAL and SUPERVISOR_BACKOFF_MAX seconds
+SUPERVISOR_BACKOFF_INITIAL = float(os.getenv("SUPERVISOR_BACKOFF_INITIAL", "1"))
+SUPERVISOR_BACKOFF_MAX = float(os.getenv("SUPERVISOR_BACKOFF_MAX", "300"))
+# A run lasting this many seconds resets the backoff
+SUPERVISOR_HEALTHY_AFTER = float(os.getenv("SUPERVISOR_HEALTHY_AFTER", "60"))
+# Consecutive failed starts before giving up (0 retries forever)
+SUPERVISOR_MAX_RESTARTS = int(os.getenv("SUPERVISOR_MAX_RESTARTS", "0"))
+
+# === Context Data ===
+# Cap on resident user_data and chat_data entries each (0 keeps PTB's dicts)
+CONTEXT_DATA_MAX_ENTRIES = int(os.getenv("CONTEXT_DATA_MAX_ENTRIES", "0"))
+# Evict entries idle for this many seconds (0 disables expiry)
+CONTEXT_DATA_TTL = float(os.getenv("CONTEXT_DATA_TTL", "0"))
+# SQLite file that keeps evicted entries until they are used again (empty drops them)
+CONTEXT_DATA_SPILL_FILE = os.getenv("CONTEXT_DATA_SPILL_FILE") or None
+
+# === Persistence ===
+# SQLite file persisting user, chat and bot data (empty disables persistence)
+PERSISTENCE_FILE = os.getenv("PERSISTENCE_FILE") or None
+# Seconds between PTB handing changed data to the persistence
+PERSISTENCE_UPDATE_INTERVAL = float(os.getenv("PERSISTENCE_UPDATE_INTERVAL", "10"))
+# Seconds changed keys wait before being written
+PERSISTENCE_FLUSH_INTERVAL = float(os.getenv("PERSISTENCE_FLUSH_INTERVAL", "1"))
+# Write immediately once this many keys are waiting
+PERSISTENCE_BATCH_SIZE = int(os.getenv("PERSISTENCE_BATCH_SIZE", "1000"))
+# Load user and chat data on first access instead of at startup
+PERSISTENCE_LAZY = _env_flag("PERSISTENCE_LAZY", default=True)
 
 # === Logging ===
 # Configuration for logging output level and file locations
@@ -39,6 +157,33 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()  # Log level
 LOG_DIR = os.getenv("LOG_DIR", "logs")  # Log folder
 LOG_BOT_FILE = os.getenv("LOG_BOT_FILE", "bot.log")
 LOG_ERRORS_FILE = os.getenv("LOG_ERRORS_FILE", "errors.log")
+# Format of the log files: "text" or "json" (one object per line)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Share of DEBUG records kept on hot paths such as /start and escaping
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+# Route log records through a bounded queue drained by a background thread
+LOG_QUEUE_ENABLED = _env_flag("LOG_QUEUE_ENABLED")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Max queued records
+# Policy when the queue is full: "block", "drop_debug" or "count"
+LOG_QUEUE_OVERFLOW = os.getenv("LOG_QUEUE_OVERFLOW", "drop_debug").lower()
+
+# === Metrics ===
+# Record per-command calls, errors and latency in the in-process registry
+METRICS_ENABLED = _env_flag("METRICS_ENABLED", default=True)
+# Serve the metrics in Prometheus text format on this port (0 disables)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_LISTEN = os.getenv("METRICS_LISTEN", WEBHOOK_LISTEN)
+
+# === Error Handling ===
+# Log the full traceback of an error group once per this many seconds
+ERROR_LOG_WINDOW = float(os.getenv("ERROR_LOG_WINDOW", "60"))
+# Tell a chat about failures at most once per this many seconds
+ERROR_NOTICE_CHAT_INTERVAL = float(os.getenv("ERROR_NOTICE_CHAT_INTERVAL", "60"))
+# Error notices per second across all chats, and the burst allowed on top
+ERROR_NOTICE_RATE = float(os.getenv("ERROR_NOTICE_RATE", "1"))
+ERROR_NOTICE_BURST = int(os.getenv("ERROR_NOTICE_BURST", "5"))
+# Seconds between error digests sent to ADMIN_ID (0 disables)
+ERROR_DIGEST_INTERVAL = float(os.getenv("ERROR_DIGEST_INTERVAL", "300"))
 
 # === Admin ===
 # Telegram user ID with admin access to the bot
@@ -47,8 +192,8 @@ ADMIN_ID = int(os.getenv("ADMIN_ID") or 0)  # Telegram user ID with admin access
 
 # === Validation ===
 # Ensures that required environment variables are defined before the bot starts
-def validate_config() -> None:
-    """Validate required environment variables are set."""
+def validate_config(mode: str = RUN_MODE, workers: int = WEBHOOK_WORKERS) -> None:
+    """Validate required environment variables are set and fit the run mode."""
     missing: list[str] = []
     if not BOT_TOKEN:
         missing.append("BOT_TOKEN")
@@ -58,3 +203,7 @@ def validate_config() -> None:
         names = ", ".join(missing)
         msg = f"Missing required configuration variables: {names}"
         raise ValueError(msg)
+    if PERSISTENCE_FILE and mode == "webhook" and workers > 1:
+        # Each worker would cache and overwrite the same keys independently
+        msg = "PERSISTENCE_FILE cannot be shared by multiple webhook workers"
+        raise ValueError(msg)
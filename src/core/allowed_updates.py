@@ -0,0 +1,142 @@
+"""Derive the ``allowed_updates`` list from the registered handlers.
+
+Without ``allowed_updates`` Telegram delivers every default update type (edits,
+channel posts, polls, ...), which the bot downloads, decodes and routes only to
+find that no handler consumes them. :func:`derive_allowed_updates` maps each
+installed handler to the update types it handles: ``CommandHandler``,
+``MessageHandler`` and the indexed ``CommandDispatcher`` imply ``message``,
+``__callbacks__`` (``CallbackQueryHandler``) imply ``callback_query``, and so
+on. ``TypeHandler`` instances observe updates (recording, profiling) without
+consuming a type of their own, so they do not widen the list; neither do the
+log context and duplicate filters installed ahead of every handler group.
+
+``ALLOWED_UPDATES`` overrides the derived list with explicit types or ``all``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from telegram import Update
+from telegram.ext import (
+    BusinessConnectionHandler,
+    BusinessMessagesDeletedHandler,
+    CallbackQueryHandler,
+    ChatBoostHandler,
+    ChatJoinRequestHandler,
+    ChatMemberHandler,
+    ChosenInlineResultHandler,
+    CommandHandler,
+    ConversationHandler,
+    InlineQueryHandler,
+    MessageHandler,
+    MessageReactionHandler,
+    PaidMediaPurchasedHandler,
+    PollAnswerHandler,
+    PollHandler,
+    PreCheckoutQueryHandler,
+    PrefixHandler,
+    ShippingQueryHandler,
+    TypeHandler,
+)
+
+from src.config import ALLOWED_UPDATES
+from src.core.callback_router import CallbackRouter
+from src.core.dedup import DuplicateUpdateFilter
+from src.core.dispatcher import CommandDispatcher
+from src.core.log_context import LogContextHandler
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from telegram.ext import Application, BaseHandler
+
+HANDLER_UPDATE_TYPES: dict[type, tuple[str, ...]] = {
+    # Observers of every update
+    LogContextHandler: (),
+    DuplicateUpdateFilter: (),
+    CommandDispatcher: ("message",),
+    CallbackRouter: ("callback_query",),
+    CommandHandler: ("message",),
+    PrefixHandler: ("message",),
+    MessageHandler: ("message",),
+    CallbackQueryHandler: ("callback_query",),
+    InlineQueryHandler: ("inline_query",),
+    ChosenInlineResultHandler: ("chosen_inline_result",),
+    ShippingQueryHandler: ("shipping_query",),
+    PreCheckoutQueryHandler: ("pre_checkout_query",),
+    PollHandler: ("poll",),
+    PollAnswerHandler: ("poll_answer",),
+    ChatMemberHandler: ("my_chat_member", "chat_member"),
+    ChatJoinRequestHandler: ("chat_join_request",),
+    ChatBoostHandler: ("chat_boost", "removed_chat_boost"),
+    MessageReactionHandler: ("message_reaction", "message_reaction_count"),
+    BusinessConnectionHandler: ("business_connection",),
+    BusinessMessagesDeletedHandler: ("deleted_business_messages",),
+    PaidMediaPurchasedHandler: ("purchased_paid_media",),
+}
+
+
+def handler_update_types(handler: BaseHandler) -> set[str]:
+    """Return the update types ``handler`` can consume."""
+    if isinstance(handler, TypeHandler):
+        return set()
+    if isinstance(handler, CallbackRouter) and not handler.index:
+        # Always installed by register_handlers, even without prefixed callbacks
+        return set()
+    if isinstance(handler, ConversationHandler):
+        nested = [*handler.entry_points, *handler.fallbacks]
+        for state_handlers in handler.states.values():
+            nested.extend(state_handlers)
+        return _collect(nested)
+    for handler_type, update_types in HANDLER_UPDATE_TYPES.items():
+        if isinstance(handler, handler_type):
+            return set(update_types)
+    logger.warning(
+        "⚠️ Unknown handler %s: allowing all update types",
+        type(handler).__name__,
+    )
+    return set(Update.ALL_TYPES)
+
+
+def _collect(handlers: Iterable[BaseHandler]) -> set[str]:
+    update_types: set[str] = set()
+    for handler in handlers:
+        update_types |= handler_update_types(handler)
+    return update_types
+
+
+def derive_allowed_updates(app: Application) -> list[str] | None:
+    """Return the update types consumed by ``app``'s handlers, in API order.
+
+    ``None`` (no consuming handler) leaves Telegram's default set in place,
+    since an empty list would not restrict anything.
+    """
+    consumed = _collect(
+        handler for group in app.handlers.values() for handler in group
+    )
+    allowed = [str(name) for name in Update.ALL_TYPES if name in consumed]
+    return allowed or None
+
+
+def resolve_allowed_updates(
+    app: Application, override: str = ALLOWED_UPDATES
+) -> list[str] | None:
+    """Return the configured or derived ``allowed_updates`` and log it."""
+    if override == "all":
+        allowed: list[str] | None = [str(name) for name in Update.ALL_TYPES]
+    elif override:
+        allowed = [name.strip() for name in override.split(",") if name.strip()]
+        unknown = set(allowed) - set(Update.ALL_TYPES)
+        if unknown:
+            msg = f"Unknown update types in ALLOWED_UPDATES: {sorted(unknown)}"
+            raise ValueError(msg)
+    else:
+        allowed = derive_allowed_updates(app)
+    logger.info(
+        "📬 Allowed updates (%s): %s",
+        "configured" if override else "derived from handlers",
+        ", ".join(allowed) if allowed else "Telegram default",
+    )
+    return allowed
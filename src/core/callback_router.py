@@ -0,0 +1,85 @@
+"""Prefix-indexed callback query router.
+
+``__callbacks__`` entries declared with a ``prefix`` (instead of a regex
+``pattern``) are collected into a single :class:`CallbackRouter`. It splits the
+namespace prefix off ``callback_data`` once (see
+:mod:`src.utils.callback_data`) and resolves the callback with a dictionary
+lookup, so a button press no longer scans one ``CallbackQueryHandler`` regex
+per entry. Unknown prefixes are left unclaimed and fall through to the
+remaining pattern-based handlers.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from telegram import Update
+from telegram.ext import BaseHandler
+
+from src.utils.callback_data import callback_prefix
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from telegram.ext import Application, CallbackContext
+
+    QueryCallback = Callable[..., Awaitable[Any]]
+
+CALLBACK_DISPATCH_TOTAL = METRICS.counter(
+    "bot_callback_dispatch_total",
+    "Callback queries seen by the prefix router, by outcome.",
+    ("outcome",),
+)
+_MATCHED = CALLBACK_DISPATCH_TOTAL.labels("matched")
+_UNMATCHED = CALLBACK_DISPATCH_TOTAL.labels("unmatched")
+
+
+class CallbackRouter(BaseHandler[Update, "CallbackContext", Any]):
+    """Route callback queries on their ``callback_data`` prefix."""
+
+    __slots__ = ("index",)
+
+    def __init__(
+        self, index: dict[str, QueryCallback] | None = None, *, block: bool = True
+    ) -> None:
+        """Initialize the router with an optional prebuilt prefix index."""
+        super().__init__(self._unused_callback, block=block)
+        self.index: dict[str, QueryCallback] = index if index is not None else {}
+
+    @staticmethod
+    async def _unused_callback(_update: object, _context: object) -> None:
+        """Satisfy ``BaseHandler``; dispatch goes through :meth:`handle_update`."""
+
+    def add(self, prefix: str, func: QueryCallback) -> None:
+        """Route ``prefix`` to ``func``; the first registration of a prefix wins."""
+        if prefix in self.index:
+            logger.warning("⚠️ Callback prefix %r is already routed", prefix)
+            return
+        self.index[prefix] = func
+
+    def check_update(self, update: object) -> QueryCallback | None:
+        """Return the callback for the query's prefix, or ``None`` to fall through."""
+        if not isinstance(update, Update) or update.callback_query is None:
+            return None
+        data = update.callback_query.data
+        if not isinstance(data, str):
+            return None
+        func = self.index.get(callback_prefix(data))
+        if func is None:
+            _UNMATCHED.inc()
+            return None
+        _MATCHED.inc()
+        return func
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: QueryCallback,
+        context: CallbackContext,
+    ) -> Any:  # noqa: ANN401
+        """Invoke the callback resolved by :meth:`check_update`."""
+        _ = application
+        return await check_result(update, context)
@@ -0,0 +1,273 @@
+"""Controlled catch-up on the update backlog after a (re)start.
+
+Telegram keeps the updates sent while the bot is down. On startup
+:func:`attach_catch_up` asks for their number (``getWebhookInfo``), and the
+application's :class:`CatchUpQueue` treats that many of the next updates as the
+backlog. ``CATCHUP_POLICY`` combines any of:
+
+- ``drop``: backlog updates older than ``CATCHUP_MAX_AGE`` seconds are
+  discarded as they are queued. Updates without a date (callback and inline
+  queries, polls, ...) are kept;
+- ``rate``: backlog updates leave the queue at most ``CATCHUP_RATE`` per
+  second, so a long outage does not turn into a burst on downstream services;
+- ``newest_first``: each chat's backlog is handled newest first, with chats
+  taking turns.
+
+Telegram delivers updates in order, so a recent update ends the backlog early.
+Updates arriving after the backlog queue up behind it in arrival order. The
+remaining backlog and the progress are exported as metrics and logged in 10%
+steps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from telegram import Update
+
+from src.config import CATCHUP_MAX_AGE, CATCHUP_POLICY, CATCHUP_RATE
+from src.core.outbound import TokenBucket
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from telegram.ext import Application
+
+POLICIES = frozenset({"drop", "rate", "newest_first"})
+# Updates younger than this (seconds) are live, which ends the backlog
+LIVE_AGE = 10.0
+# How often progress is logged, as a fraction of the backlog
+PROGRESS_STEPS = 10
+
+CATCHUP_DROPPED = METRICS.counter(
+    "bot_catchup_dropped_total",
+    "Backlog updates dropped for being older than CATCHUP_MAX_AGE.",
+)
+
+
+def parse_policies(value: str) -> frozenset[str]:
+    """Parse a comma-separated ``CATCHUP_POLICY``; ``none`` or empty disables."""
+    names = {name.strip() for name in value.lower().split(",")} - {"", "none"}
+    unknown = names - POLICIES
+    if unknown:
+        msg = f"Unknown catch-up policies in CATCHUP_POLICY: {sorted(unknown)}"
+        raise ValueError(msg)
+    return frozenset(names)
+
+
+def update_age(update: Update, now: float) -> float | None:
+    """Return the seconds since ``update`` was created, if it has a date."""
+    message = (
+        update.message
+        or update.edited_message
+        or update.channel_post
+        or update.edited_channel_post
+    )
+    if message is not None:
+        sent = message.edit_date or message.date
+    else:
+        event = update.chat_member or update.my_chat_member or update.chat_join_request
+        if event is None:
+            return None
+        sent = event.date
+    return now - sent.timestamp()
+
+
+def chat_key(update: Update) -> int:
+    """Return the chat id of ``update``, or its user id, or its update id."""
+    chat = update.effective_chat
+    if chat is not None:
+        return chat.id
+    user = update.effective_user
+    if user is not None:
+        return user.id
+    return update.update_id
+
+
+class CatchUpQueue(asyncio.Queue):
+    """Update queue applying the catch-up policies to the startup backlog.
+
+    Backlog updates are kept per chat (newest first) or in one FIFO next to
+    the regular queue and are always served before it. Objects other than
+    updates, such as PTB's stop signal, lift the rate cap so that shutting
+    down never waits on it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        policies: frozenset[str] = POLICIES,
+        max_age: float = CATCHUP_MAX_AGE,
+        rate: float = CATCHUP_RATE,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Apply ``policies`` with the given age limit and rate."""
+        super().__init__(maxsize)
+        self.policies = policies
+        self.max_age = max_age
+        self.rate = rate
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._newest_first = "newest_first" in policies
+        self._bucket = TokenBucket(rate, 1.0, clock())
+        self.backlog = 0
+        self.processed = 0
+        self.dropped = 0
+        self._expected = 0
+        self._incoming = False
+        self._from_backlog = False
+        self._stopping = False
+        self._started = 0.0
+
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)
+        # Backlog per chat (a single key unless newest first), oldest first
+        self._chats: dict[int, deque[Any]] = {}
+        # Chats with backlog left, in serving order
+        self._turns: deque[int] = deque()
+        self._backlog_size = 0
+
+    @property
+    def remaining(self) -> int:
+        """Backlog updates not yet handed out or dropped."""
+        return self.backlog - self.processed
+
+    @property
+    def progress(self) -> float:
+        """Share of the backlog handed out or dropped, from 0 to 1."""
+        return self.processed / self.backlog if self.backlog else 1.0
+
+    def begin(self, backlog: int) -> None:
+        """Treat the next ``backlog`` updates as the backlog."""
+        self.backlog = self._expected = backlog
+        self.processed = self.dropped = 0
+        self._started = self._clock()
+        if backlog:
+            logger.info(
+                "📥 Catching up on %s pending updates (%s)",
+                backlog,
+                ", ".join(sorted(self.policies)),
+            )
+
+    def qsize(self) -> int:
+        """Number of queued items, backlog included."""
+        return super().qsize() + self._backlog_size
+
+    def empty(self) -> bool:
+        """Whether nothing is queued, backlog included."""
+        return self.qsize() == 0
+
+    def put_nowait(self, item: Any) -> None:  # noqa: ANN401
+        """Queue ``item``; backlog updates may be dropped or set aside."""
+        if not isinstance(item, Update):
+            self._stopping = True
+        elif self._expected:
+            age = update_age(item, self._wall_clock())
+            if age is not None and age < LIVE_AGE:
+                # Delivered in order: everything from here on is live
+                self.backlog -= self._expected
+                self._expected = 0
+                self._advance(0)
+            else:
+                self._expected -= 1
+                if "drop" in self.policies and age is not None and age > self.max_age:
+                    self.dropped += 1
+                    CATCHUP_DROPPED.inc()
+                    self._advance(1)
+                    return
+                self._incoming = True
+        super().put_nowait(item)
+
+    def _put(self, item: Any) -> None:  # noqa: ANN401
+        if not self._incoming:
+            super()._put(item)
+            return
+        self._incoming = False
+        key = chat_key(item) if self._newest_first else 0
+        chat = self._chats.get(key)
+        if chat is None:
+            chat = self._chats[key] = deque()
+            self._turns.append(key)
+        chat.append(item)
+        self._backlog_size += 1
+
+    def _get(self) -> Any:  # noqa: ANN401
+        self._from_backlog = bool(self._turns)
+        if not self._from_backlog:
+            return super()._get()
+        key = self._turns.popleft()
+        chat = self._chats[key]
+        item = chat.pop() if self._newest_first else chat.popleft()
+        if chat:
+            self._turns.append(key)
+        else:
+            del self._chats[key]
+        self._backlog_size -= 1
+        self._advance(1)
+        return item
+
+    async def get(self) -> Any:  # noqa: ANN401
+        """Return the next item, pacing backlog updates under ``rate``."""
+        item = await super().get()
+        if self._from_backlog and "rate" in self.policies and not self._stopping:
+            delay = self._bucket.delay(self._clock())
+            if delay:
+                await asyncio.sleep(delay)
+            self._bucket.consume(self._clock())
+        return item
+
+    def _advance(self, count: int) -> None:
+        """Count ``count`` backlog updates as done and log the progress."""
+        if not self.backlog:
+            return
+        self.processed += count
+        step = max(1, self.backlog // PROGRESS_STEPS)
+        if self.processed >= self.backlog:
+            logger.info(
+                "✅ Caught up on %s updates in %.1fs (%s dropped)",
+                self.backlog,
+                self._clock() - self._started,
+                self.dropped,
+            )
+            self.backlog = self.processed = 0
+        elif count and self.processed % step == 0:
+            logger.info(
+                "📥 Catch-up %.0f%% (%s/%s, %s dropped)",
+                self.progress * 100,
+                self.processed,
+                self.backlog,
+                self.dropped,
+            )
+
+
+def create_update_queue(
+    maxsize: int = 0, policy: str = CATCHUP_POLICY
+) -> asyncio.Queue:
+    """Return a :class:`CatchUpQueue` for ``policy``, or a plain queue."""
+    policies = parse_policies(policy)
+    if not policies:
+        return asyncio.Queue(maxsize)
+    return CatchUpQueue(maxsize, policies=policies)
+
+
+def attach_catch_up(app: Application) -> None:
+    """Size the backlog of ``app``'s :class:`CatchUpQueue` when it starts."""
+    update_queue = app.update_queue
+    if not isinstance(update_queue, CatchUpQueue):
+        return
+    previous_init = app.post_init
+
+    async def post_init(application: Application) -> None:
+        if previous_init:
+            await previous_init(application)
+        info = await application.bot.get_webhook_info()
+        update_queue.begin(info.pending_update_count)
+
+    app.post_init = post_init
@@ -2,7 +2,7 @@ import argparse
 import logging
 import sys
 
-from src.config import RUN_MODE, validate_config
+from src.config import RUN_MODE, WEBHOOK_WORKERS, validate_config
 from src.core.runner import run_telegram_bot
 from src.utils.environment import check_environment
 from src.utils.logger import setup_logging
@@ -17,6 +17,12 @@ def create_parser() -> argparse.ArgumentParser:
         default=RUN_MODE,
         help="Run mode: polling or webhook",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WEBHOOK_WORKERS,
+        help="Webhook mode: number of worker processes behind the ingress",
+    )
     parser.add_argument(
         "--diagnostics",
         action="store_true",
@@ -32,12 +38,12 @@ def cli(argv: list[str] | None = None) -> None:
     args = parser.parse_args(argv)
     startup_logger = logging.getLogger("startup")
     try:
-        validate_config()
+        validate_config(args.mode, args.workers)
     except ValueError:
         startup_logger.exception("Configuration error")
         sys.exit(1)
     if args.diagnostics:
         check_environment()
     startup_logger.info("🚀 Starting Telegram Bot in %s mode", args.mode)
-    run_telegram_bot(args.mode)
+    run_telegram_bot(args.mode, workers=args.workers)
 
@@ -0,0 +1,310 @@
+"""Bounded storage for ``context.user_data`` and ``context.chat_data``.
+
+PTB keeps one dict per user and chat that ever talked to the bot in a plain
+``defaultdict``, so memory grows for the lifetime of the process.
+:class:`BoundedContextStore` is a drop-in replacement that keeps at most
+``max_entries`` entries in least-recently-used order and drops entries idle for
+longer than ``ttl`` seconds.
+
+Evicted entries are lost unless a :class:`SpillStore` is given: non-empty
+entries are then written to it on eviction and faulted back in on the next
+access, so evicting only costs a round trip to local storage.
+:class:`SqliteSpillStore` keeps them in a single SQLite file.
+
+:class:`~src.core.persistence.SqlitePersistence` also implements the spill store
+interface, which is how it loads user and chat data lazily.
+
+PTB has no public hook for this storage, so :func:`install_context_stores`
+swaps the application's private ``_user_data``/``_chat_data`` mappings (and the
+read-only proxies over them) right after the application is built.
+"""
+
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Protocol
+
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from telegram.ext import Application
+
+# How many spilled writes are batched into one SQLite transaction
+SPILL_COMMIT_EVERY = 100
+
+
+class SpillStore(Protocol):
+    """Local storage for entries evicted from a :class:`BoundedContextStore`."""
+
+    def load(self, kind: str, key: int) -> Any | None:  # noqa: ANN401
+        """Return the spilled entry, or ``None`` if there is none."""
+
+    def save(self, kind: str, key: int, data: Any) -> None:  # noqa: ANN401
+        """Store an evicted entry."""
+
+    def delete(self, kind: str, key: int) -> None:
+        """Forget a spilled entry."""
+
+
+class SqliteSpillStore:
+    """Spill store keeping pickled entries in one SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (or create) the spill database at ``path``."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS spill ("
+            "kind TEXT NOT NULL, key INTEGER NOT NULL, data BLOB NOT NULL, "
+            "PRIMARY KEY (kind, key))"
+        )
+        self._pending = 0
+
+    def _wrote(self) -> None:
+        self._pending += 1
+        if self._pending >= SPILL_COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def load(self, kind: str, key: int) -> Any | None:  # noqa: ANN401
+        """Return the spilled entry, or ``None`` if there is none."""
+        row = self._db.execute(
+            "SELECT data FROM spill WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return None if row is None else pickle.loads(row[0])  # noqa: S301
+
+    def save(self, kind: str, key: int, data: Any) -> None:  # noqa: ANN401
+        """Store an evicted entry."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO spill (kind, key, data) VALUES (?, ?, ?)",
+            (kind, key, pickle.dumps(data, pickle.HIGHEST_PROTOCOL)),
+        )
+        self._wrote()
+
+    def delete(self, kind: str, key: int) -> None:
+        """Forget a spilled entry."""
+        self._db.execute("DELETE FROM spill WHERE kind = ? AND key = ?", (kind, key))
+        self._wrote()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        self._db.commit()
+        self._db.close()
+
+
+class BoundedContextStore(MutableMapping[int, Any]):
+    """LRU + idle-TTL mapping that creates missing entries like a ``defaultdict``.
+
+    An entry that a handler still holds a reference to is only safe from
+    eviction while it stays among the ``max_entries`` most recently used ones,
+    which is always the case for the update being processed.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        factory: Callable[[], Any],
+        max_entries: int,
+        ttl: float = 0.0,
+        spill: SpillStore | None = None,
+        kind: str = "user_data",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Keep at most ``max_entries`` entries; ``ttl`` of 0 disables expiry."""
+        self.factory = factory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.spill = spill
+        self.kind = kind
+        self._clock = clock
+        # key -> [data, last access, faulted in from the spill store]
+        self._entries: OrderedDict[int, list[Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.restored = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __getitem__(self, key: int) -> Any:  # noqa: ANN401
+        """Return the entry for ``key``, restoring or creating it when missing."""
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry[1] = now
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        data = self.spill.load(self.kind, key) if self.spill is not None else None
+        if data is None:
+            data = self.factory()
+            self._insert(key, [data, now, False], now)
+        else:
+            self.restored += 1
+            self._insert(key, [data, now, True], now)
+        return data
+
+    def __setitem__(self, key: int, value: Any) -> None:  # noqa: ANN401
+        """Store ``value`` for ``key`` as the most recently used entry."""
+        now = self._clock()
+        entry = self._entries.pop(key, None)
+        restored = entry[2] if entry is not None else self.spill is not None
+        self._insert(key, [value, now, restored], now)
+
+    def __delitem__(self, key: int) -> None:
+        """Remove ``key`` from memory and from the spill store."""
+        entry = self._entries.pop(key, None)
+        if self.spill is not None:
+            self.spill.delete(self.kind, key)
+        elif entry is None:
+            raise KeyError(key)
+
+    def pop(self, key: int, *default: Any) -> Any:  # noqa: ANN401
+        """Remove ``key`` without restoring it; used by ``drop_user_data``."""
+        entry = self._entries.pop(key, None)
+        if self.spill is not None:
+            self.spill.delete(self.kind, key)
+        if entry is not None:
+            return entry[0]
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Whether ``key`` is resident (spilled entries are not loaded)."""
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the resident keys, least recently used first."""
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        """Number of resident entries."""
+        return len(self._entries)
+
+    def _insert(self, key: int, entry: list[Any], now: float) -> None:
+        self._entries[key] = entry
+        if self.ttl:
+            self._expire(now)
+        while len(self._entries) > self.max_entries:
+            self._evict()
+            self.evictions += 1
+
+    def _expire(self, now: float) -> None:
+        """Drop idle entries; the LRU head is always the longest idle one."""
+        deadline = now - self.ttl
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry[1] > deadline:
+                return
+            self._evict()
+            self.expirations += 1
+
+    def _evict(self) -> None:
+        key, (data, _, restored) = self._entries.popitem(last=False)
+        if self.spill is None:
+            return
+        if data:
+            self.spill.save(self.kind, key, data)
+        elif restored:
+            # Emptied since it was restored: drop the stale spilled copy
+            self.spill.delete(self.kind, key)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of accesses served from memory."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, float]:
+        """Return size, hit rate and eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "restored": self.restored,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hit_rate,
+        }
+
+
+def register_store_metrics(store: BoundedContextStore) -> None:
+    """Expose the store's size and counters, read at scrape time."""
+    prefix = f"bot_{store.kind}"
+    METRICS.gauge(
+        f"{prefix}_entries", f"Resident {store.kind} entries.", function=store.__len__
+    )
+    for counter, documentation in (
+        ("hits", "Accesses served from memory."),
+        ("misses", "Accesses to entries that were not resident."),
+        ("restored", "Entries faulted back in from the spill store."),
+        ("evictions", "Entries evicted by the size limit."),
+        ("expirations", "Entries evicted after the idle TTL."),
+    ):
+        METRICS.counter(
+            f"{prefix}_{counter}_total",
+            f"{store.kind}: {documentation}",
+            function=lambda counter=counter: getattr(store, counter),
+        )
+
+
+def install_context_stores(
+    app: Application,
+    max_entries: int,
+    ttl: float = 0.0,
+    spill_file: str | None = None,
+    spill: SpillStore | None = None,
+) -> tuple[BoundedContextStore, BoundedContextStore]:
+    """Replace ``app``'s user and chat data storage with bounded stores.
+
+    Evicted entries go to a :class:`SqliteSpillStore` at ``spill_file``, which
+    is closed on shutdown, or to ``spill``, whose lifecycle the caller owns.
+    """
+    owned = SqliteSpillStore(spill_file) if spill_file else None
+    spill = owned or spill
+    stores = []
+    for kind, factory in (
+        ("user_data", app.context_types.user_data),
+        ("chat_data", app.context_types.chat_data),
+    ):
+        store = BoundedContextStore(factory, max_entries, ttl, spill, kind)
+        register_store_metrics(store)
+        stores.append(store)
+    user_store, chat_store = stores
+    app._user_data = user_store  # type: ignore[assignment]  # noqa: SLF001
+    app._chat_data = chat_store  # type: ignore[assignment]  # noqa: SLF001
+    app.user_data = MappingProxyType(user_store)  # type: ignore[arg-type]
+    app.chat_data = MappingProxyType(chat_store)  # type: ignore[arg-type]
+
+    if owned is not None:
+        previous_shutdown = app.post_shutdown
+
+        async def post_shutdown(application: Application) -> None:
+            # Keep the resident entries for the next start
+            for store in stores:
+                while len(store):
+                    store._evict()  # noqa: SLF001
+            owned.close()
+            if previous_shutdown:
+                await previous_shutdown(application)
+
+        app.post_shutdown = post_shutdown
+    logger.info(
+        "🗃️ Context data capped at %s entries (TTL %ss, spill: %s)",
+        max_entries,
+        ttl or "off",
+        spill_file or (type(spill).__name__ if spill else "off"),
+    )
+    return user_store, chat_store
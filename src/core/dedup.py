@@ -0,0 +1,119 @@
+"""Drop redelivered updates before they reach the handlers.
+
+Telegram retries a webhook POST it did not get an answer to in time, so a slow
+bot can process the same ``update_id`` twice and reply twice. Update ids grow
+monotonically, which lets :class:`UpdateIdWindow` remember the last ``size``
+ids in a fixed ring of bits indexed by ``update_id % size``: lookups and
+inserts are O(1) and memory is ``size / 8`` bytes regardless of uptime.
+
+:class:`DuplicateUpdateFilter` runs the check in front of every handler group.
+The multi-process ingress (:mod:`src.core.workers`) checks the raw update
+before routing it, so one window covers all workers.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop, BaseHandler
+
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from telegram.ext import Application, CallbackContext
+
+# Runs before every other handler group, including the recorder
+DEDUP_HANDLER_GROUP = -2000
+
+DUPLICATE_UPDATES = METRICS.counter(
+    "bot_duplicate_updates_total",
+    "Redelivered updates dropped before dispatch, by stage.",
+    ("stage",),
+)
+
+
+class UpdateIdWindow:
+    """Sliding window of recently seen update ids, one bit per id."""
+
+    def __init__(self, size: int) -> None:
+        """Remember the last ``size`` update ids."""
+        self.size = size
+        self._bits = bytearray((size + 7) // 8)
+        self._high: int | None = None
+        self.duplicates = 0
+        self.resets = 0
+
+    def __contains__(self, update_id: int) -> bool:
+        """Whether ``update_id`` was already added and is still in the window."""
+        high = self._high
+        if high is None or update_id > high or update_id <= high - self.size:
+            return False
+        slot = update_id % self.size
+        return bool(self._bits[slot >> 3] & (1 << (slot & 7)))
+
+    def add(self, update_id: int) -> bool:
+        """Record ``update_id``; return False if it is a duplicate."""
+        high = self._high
+        if high is None or not high - self.size < update_id < high + self.size:
+            if high is not None and update_id < high:
+                # Telegram picks a random id after a week without updates
+                self.resets += 1
+                logger.info("🔁 update_id sequence restarted at %s", update_id)
+            self._bits[:] = bytes(len(self._bits))
+            self._high = update_id
+        elif update_id > high:
+            # Free the slots of the ids that just left the window
+            for stale in range(high + 1, update_id + 1):
+                slot = stale % self.size
+                self._bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+            self._high = update_id
+        slot = update_id % self.size
+        mask = 1 << (slot & 7)
+        if self._bits[slot >> 3] & mask:
+            self.duplicates += 1
+            return False
+        self._bits[slot >> 3] |= mask
+        return True
+
+
+class DuplicateUpdateFilter(BaseHandler[Update, "CallbackContext", Any]):
+    """Claim updates whose id was seen before and stop their dispatch."""
+
+    __slots__ = ("window",)
+
+    def __init__(self, window: UpdateIdWindow) -> None:
+        """Filter updates through ``window``."""
+        super().__init__(self._unused_callback)
+        self.window = window
+
+    @staticmethod
+    async def _unused_callback(_update: object, _context: object) -> None:
+        """Satisfy ``BaseHandler``; duplicates are stopped in :meth:`handle_update`."""
+
+    def check_update(self, update: object) -> bool:
+        """Return True for a duplicate; new updates pass at the cost of one lookup."""
+        if not isinstance(update, Update):
+            return False
+        return not self.window.add(update.update_id)
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: object,
+        context: CallbackContext,
+    ) -> None:
+        """Stop processing of the duplicate in all handler groups."""
+        DUPLICATE_UPDATES.labels("dispatch").inc()
+        logger.debug("♻️ Dropped duplicate update %s", update.update_id)
+        raise ApplicationHandlerStop
+
+
+def attach_deduplicator(app: Application, size: int) -> UpdateIdWindow:
+    """Drop updates ``app`` already processed among the last ``size`` ids."""
+    window = UpdateIdWindow(size)
+    app.add_handler(DuplicateUpdateFilter(window), DEDUP_HANDLER_GROUP)
+    logger.debug("♻️ Deduplicating the last %s update ids", size)
+    return window
@@ -0,0 +1,115 @@
+"""Indexed command dispatcher for the Telegram bot.
+
+Registers a single handler that parses the leading ``/command@botname`` token of
+a message once and resolves it through a dictionary built from
+``COMMAND_REGISTRY`` (aliases included). Compared to one ``CommandHandler`` per
+command, dispatch cost no longer grows with the number of registered commands.
+Commands that are not in the index are left unclaimed, so the update falls
+through to the ``unknown_command`` fallback registered after it.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from telegram import MessageEntity, Update
+from telegram.ext import BaseHandler
+
+from src.utils.metrics import DISPATCH_TOTAL
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from telegram.ext import Application, CallbackContext
+
+    from src.utils.commands import CommandMeta
+
+    CommandCallback = Callable[..., Awaitable[Any]]
+
+_MATCHED = DISPATCH_TOTAL.labels("matched")
+_UNMATCHED = DISPATCH_TOTAL.labels("unmatched")
+
+
+def build_command_index(registry: Iterable[CommandMeta]) -> dict[str, CommandCallback]:
+    """Map every command name and alias to its callback.
+
+    The first registration of a name wins, mirroring the per-handler mode where
+    the earliest ``CommandHandler`` for a command shadows later ones.
+    """
+    index: dict[str, CommandCallback] = {}
+    for meta in registry:
+        index.setdefault(meta.name.lower(), meta.func)
+        for alias in meta.aliases:
+            index.setdefault(alias.lower(), meta.func)
+    return index
+
+
+def parse_command(update: object) -> tuple[str, list[str]] | None:
+    """Extract the lowercased command name and its arguments from an update.
+
+    Returns ``None`` when the update is not a (possibly edited) message starting
+    with a bot command, or when the command is addressed to another bot.
+    """
+    if not isinstance(update, Update):
+        return None
+    message = update.message or update.edited_message
+    if message is None:
+        return None
+    text = message.text
+    entities = message.entities
+    if not text or not entities:
+        return None
+    entity = entities[0]
+    if entity.offset != 0 or entity.type != MessageEntity.BOT_COMMAND:
+        return None
+
+    name, _, target = text[1 : entity.length].partition("@")
+    # Only look up the bot username when the command names a recipient
+    if target and target.lower() != message.get_bot().username.lower():
+        return None
+    return name.lower(), text.split()[1:]
+
+
+class CommandDispatcher(BaseHandler[Update, "CallbackContext", Any]):
+    """Route bot commands through a single dictionary lookup."""
+
+    __slots__ = ("index",)
+
+    def __init__(
+        self, index: dict[str, CommandCallback], *, block: bool = True
+    ) -> None:
+        """Initialize the dispatcher with a prebuilt command index."""
+        super().__init__(self._unused_callback, block=block)
+        self.index = index
+
+    @staticmethod
+    async def _unused_callback(_update: object, _context: object) -> None:
+        """Satisfy ``BaseHandler``; dispatch goes through :meth:`handle_update`."""
+
+    def check_update(
+        self, update: object
+    ) -> tuple[CommandCallback, list[str]] | None:
+        """Return the resolved callback and arguments, or ``None`` to fall through."""
+        parsed = parse_command(update)
+        if parsed is None:
+            return None
+        name, args = parsed
+        func = self.index.get(name)
+        if func is None:
+            _UNMATCHED.inc()
+            return None
+        _MATCHED.inc()
+        return func, args
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: tuple[CommandCallback, list[str]],
+        context: CallbackContext,
+    ) -> Any:  # noqa: ANN401
+        """Invoke the command callback resolved by :meth:`check_update`."""
+        _ = application
+        func, args = check_result
+        context.args = args
+        return await func(update, context)
@@ -2,18 +2,283 @@
 
 Captures and logs all exceptions raised during update processing,
 and optionally notifies the user with a fallback message.
+
+When a dependency fails, the same error hits thousands of updates. Errors are
+therefore grouped by :func:`error_fingerprint`, the exception type plus the
+code path that raised it: a group's full traceback is logged once per
+``ERROR_LOG_WINDOW`` and further occurrences only as periodic "N more"
+summaries. User notices are limited per chat and globally, and
+:func:`attach_error_digest` sends ``ADMIN_ID`` a periodic digest of the busiest
+groups. :class:`ErrorTracker` keeps at most ``MAX_ERROR_GROUPS`` groups and
+``MAX_NOTICE_CHATS`` chats in memory.
 """
 
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
 import logging
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from telegram import Update
-from telegram.ext import ContextTypes
+from telegram.error import TelegramError
+
+from src.config import (
+    ADMIN_ID,
+    ERROR_DIGEST_INTERVAL,
+    ERROR_LOG_WINDOW,
+    ERROR_NOTICE_BURST,
+    ERROR_NOTICE_CHAT_INTERVAL,
+    ERROR_NOTICE_RATE,
+)
+from src.core.outbound import TokenBucket
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from telegram.ext import Application, ContextTypes
+
+# Least recently seen groups beyond this are forgotten
+MAX_ERROR_GROUPS = 256
+# Chats remembered for the per-chat notice limit
+MAX_NOTICE_CHATS = 10_000
+# Groups listed in the admin digest
+DIGEST_TOP = 10
+# Exception messages are cut to this many characters in summaries
+MESSAGE_PREVIEW = 120
+
+ERRORS_TOTAL = METRICS.counter(
+    "bot_update_errors_total",
+    "Exceptions raised while processing updates, by exception type.",
+    ("error",),
+)
+ERROR_NOTICES_TOTAL = METRICS.counter(
+    "bot_error_notices_total",
+    "Error notices to users, sent or suppressed by the rate limits.",
+    ("outcome",),
+)
+_NOTICE_SENT = ERROR_NOTICES_TOTAL.labels("sent")
+_NOTICE_SUPPRESSED = ERROR_NOTICES_TOTAL.labels("suppressed")
+
+errors_logger = logging.getLogger("errors")
+
+
+def error_fingerprint(exc: BaseException) -> str:
+    """Return a short id of the exception type and the frames it went through.
+
+    Messages and line numbers are left out, so errors embedding ids or
+    timestamps still group together and survive unrelated edits.
+    """
+    parts = [type(exc).__module__, type(exc).__qualname__]
+    parts += [
+        f"{Path(frame.f_code.co_filename).name}:{frame.f_code.co_name}"
+        for frame, _ in traceback.walk_tb(exc.__traceback__)
+    ]
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=6).hexdigest()
+
+
+@dataclass(slots=True)
+class ErrorGroup:
+    """Occurrences of one error fingerprint."""
+
+    fingerprint: str
+    name: str
+    message: str
+    # When the traceback was last logged
+    logged_at: float
+    # Start of the period counted by ``suppressed``
+    since: float
+    total: int = 1
+    # Occurrences since the traceback or the last summary was logged
+    suppressed: int = 0
+    # Occurrences since the last admin digest
+    recent: int = 1
+
+
+class ErrorTracker:
+    """Group errors by fingerprint and rate-limit user notices."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        window: float = ERROR_LOG_WINDOW,
+        chat_interval: float = ERROR_NOTICE_CHAT_INTERVAL,
+        notice_rate: float = ERROR_NOTICE_RATE,
+        notice_burst: int = ERROR_NOTICE_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Log each group's traceback once per ``window`` seconds."""
+        self.window = window
+        self.chat_interval = chat_interval
+        self._clock = clock
+        self._groups: OrderedDict[str, ErrorGroup] = OrderedDict()
+        # chat id -> time of its last notice, oldest first
+        self._noticed: OrderedDict[int, float] = OrderedDict()
+        self._notices = TokenBucket(notice_rate, notice_burst, clock())
+        self.errors_since_digest = 0
+
+    def __len__(self) -> int:
+        """Number of tracked error groups."""
+        return len(self._groups)
+
+    def record(self, exc: BaseException) -> tuple[ErrorGroup, bool]:
+        """Count ``exc``; return its group and whether to log the traceback."""
+        now = self._clock()
+        self.errors_since_digest += 1
+        key = error_fingerprint(exc)
+        group = self._groups.get(key)
+        if group is None:
+            message = str(exc).partition("\n")[0][:MESSAGE_PREVIEW]
+            group = ErrorGroup(key, type(exc).__name__, message, now, now)
+            self._groups[key] = group
+            if len(self._groups) > MAX_ERROR_GROUPS:
+                self._groups.popitem(last=False)
+            return group, True
+        self._groups.move_to_end(key)
+        group.total += 1
+        group.recent += 1
+        if now - group.logged_at >= self.window:
+            self._summarize(group, now)
+            group.logged_at = group.since = now
+            return group, True
+        group.suppressed += 1
+        return group, False
+
+    def _summarize(self, group: ErrorGroup, now: float) -> None:
+        """Log how often ``group`` occurred since its last log line."""
+        if group.suppressed:
+            errors_logger.error(
+                "🔁 %s more of %s [%s] in the last %.0fs (%s in total)",
+                group.suppressed,
+                group.name,
+                group.fingerprint,
+                now - group.since,
+                group.total,
+            )
+            group.suppressed = 0
+        group.since = now
+
+    def summarize(self) -> None:
+        """Log the "N more" summary of every group with suppressed occurrences."""
+        now = self._clock()
+        for group in self._groups.values():
+            self._summarize(group, now)
+
+    def allow_notice(self, chat_id: int) -> bool:
+        """Whether the user in ``chat_id`` may be told about another error."""
+        now = self._clock()
+        noticed = self._noticed
+        # Oldest first: forget chats whose interval is over
+        while noticed and now - next(iter(noticed.values())) >= self.chat_interval:
+            noticed.popitem(last=False)
+        if chat_id in noticed or self._notices.delay(now) > 0:
+            return False
+        self._notices.consume(now)
+        noticed[chat_id] = now
+        if len(noticed) > MAX_NOTICE_CHATS:
+            noticed.popitem(last=False)
+        return True
+
+    def digest(self, interval: float) -> str | None:
+        """Describe the busiest groups since the last digest and reset the counts."""
+        if not self.errors_since_digest:
+            return None
+        busiest = sorted(
+            (group for group in self._groups.values() if group.recent),
+            key=lambda group: group.recent,
+            reverse=True,
+        )
+        total = self.errors_since_digest
+        lines = [f"⚠️ {total} errors in the last {interval:.0f}s"]
+        lines += [
+            f"{group.recent}× {group.name} [{group.fingerprint}]: {group.message}"
+            for group in busiest[:DIGEST_TOP]
+        ]
+        if len(busiest) > DIGEST_TOP:
+            lines.append(f"… and {len(busiest) - DIGEST_TOP} more error types")
+        for group in busiest:
+            group.recent = 0
+        self.errors_since_digest = 0
+        return "\n".join(lines)
+
+
+ERROR_TRACKER = ErrorTracker()
 
 
 async def handle_error(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle errors raised during update processing and optionally notify the user."""
-    logging.getLogger("errors").error(
-        "Exception while handling an update:", exc_info=context.error
-    )
-    if isinstance(update, Update) and update.effective_message:
+    error = context.error
+    if error is None:
+        return
+    ERRORS_TOTAL.labels(type(error).__name__).inc()
+    group, first = ERROR_TRACKER.record(error)
+    if first:
+        errors_logger.error(
+            "Exception while handling an update [%s]:",
+            group.fingerprint,
+            exc_info=error,
+        )
+    if not isinstance(update, Update) or not update.effective_message:
+        return
+    if not ERROR_TRACKER.allow_notice(update.effective_message.chat_id):
+        _NOTICE_SUPPRESSED.inc()
+        return
+    _NOTICE_SENT.inc()
+    try:
         await update.effective_message.reply_text("⚠️ An unexpected error occurred.")
+    except TelegramError as exc:
+        # The Bot API is often what is failing; do not add another traceback
+        logger.debug("⚠️ Could not send the error notice: %s", exc)
+
+
+def attach_error_digest(
+    app: Application,
+    interval: float = ERROR_DIGEST_INTERVAL,
+    admin_id: int = ADMIN_ID,
+    tracker: ErrorTracker = ERROR_TRACKER,
+) -> None:
+    """Log error summaries and message ``admin_id`` a digest every ``interval``."""
+    previous_init = app.post_init
+    previous_shutdown = app.post_shutdown
+    task: asyncio.Task | None = None
+
+    async def run() -> None:
+        last_digest = time.monotonic()
+        while True:
+            await asyncio.sleep(min(tracker.window, interval or tracker.window))
+            tracker.summarize()
+            if not interval or time.monotonic() - last_digest < interval:
+                continue
+            last_digest = time.monotonic()
+            text = tracker.digest(interval)
+            if text is None or not admin_id:
+                continue
+            try:
+                await app.bot.send_message(admin_id, text)
+            except TelegramError as exc:
+                logger.warning("⚠️ Could not send the error digest: %s", exc)
+
+    async def post_init(application: Application) -> None:
+        nonlocal task
+        if previous_init:
+            await previous_init(application)
+        task = asyncio.create_task(run())
+
+    async def post_shutdown(application: Application) -> None:
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        tracker.summarize()
+        if previous_shutdown:
+            await previous_shutdown(application)
+
+    app.post_init = post_init
+    app.post_shutdown = post_shutdown
@@ -0,0 +1,218 @@
+"""HTTP connection pools for Bot API calls.
+
+``create_application`` builds two requests objects: one for regular Bot API
+calls and one for ``getUpdates``, so a long poll never occupies a connection a
+``reply_text`` burst needs. Pool size, keep-alive, timeouts and HTTP/2 are
+configured per pool (see the "Bot API HTTP" section of ``src/config.py``).
+
+:class:`InstrumentedHTTPXRequest` hands out the pool's connections through a
+semaphore of the same size, which makes the time spent waiting for a free
+connection measurable (with HTTP/2 it caps concurrent streams instead).
+Waits, saturation and connections in use are exported as metrics, and long
+waits are logged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+from telegram._utils.defaultvalue import DefaultValue
+from telegram.error import TimedOut
+from telegram.request import BaseRequest, HTTPXRequest
+
+from src.config import (
+    BOT_API_CONNECT_TIMEOUT,
+    BOT_API_HTTP2,
+    BOT_API_KEEPALIVE,
+    BOT_API_KEEPALIVE_EXPIRY,
+    BOT_API_POOL_SIZE,
+    BOT_API_POOL_TIMEOUT,
+    BOT_API_READ_TIMEOUT,
+    BOT_API_WRITE_TIMEOUT,
+    GET_UPDATES_POOL_SIZE,
+    GET_UPDATES_READ_TIMEOUT,
+)
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from telegram._utils.types import ODVInput
+    from telegram.request import RequestData
+
+# Waits longer than this are logged, at most once per POOL_WARNING_INTERVAL
+POOL_WAIT_WARNING = 0.1
+POOL_WARNING_INTERVAL = 30.0
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+POOL_WAIT = METRICS.histogram(
+    "bot_api_pool_wait_seconds",
+    "Time Bot API calls waited for a free connection.",
+    ("pool",),
+    buckets=POOL_WAIT_BUCKETS,
+)
+POOL_SATURATED = METRICS.counter(
+    "bot_api_pool_saturated_total",
+    "Bot API calls that found every connection of the pool busy.",
+    ("pool",),
+)
+POOL_IN_USE = METRICS.gauge(
+    "bot_api_pool_in_use", "Connections currently used by Bot API calls.", ("pool",)
+)
+POOL_SIZE = METRICS.gauge(
+    "bot_api_pool_size", "Configured connection pool size.", ("pool",)
+)
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class InstrumentedHTTPXRequest(HTTPXRequest):
+    """``HTTPXRequest`` that measures and reports connection pool waits."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        connection_pool_size: int,
+        *,
+        keepalive: int | None = None,
+        keepalive_expiry: float | None = 5.0,
+        connect_timeout: float | None = 5.0,
+        read_timeout: float | None = 5.0,
+        write_timeout: float | None = 5.0,
+        pool_timeout: float | None = 1.0,
+        http2: bool = False,
+    ) -> None:
+        """Create a pool of ``connection_pool_size`` connections named ``name``."""
+        if http2 and not http2_available():
+            logger.warning(
+                "HTTP/2 requested for the %s pool but 'h2' is not installed "
+                "(pip install 'httpx[http2]'); using HTTP/1.1",
+                name,
+            )
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=connection_pool_size,
+            max_keepalive_connections=(
+                connection_pool_size if keepalive is None else keepalive
+            ),
+            keepalive_expiry=keepalive_expiry,
+        )
+        super().__init__(
+            connection_pool_size=connection_pool_size,
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            connect_timeout=connect_timeout,
+            pool_timeout=pool_timeout,
+            http_version="2" if http2 else "1.1",
+            httpx_kwargs={"limits": limits},
+        )
+        self.name = name
+        self.size = connection_pool_size
+        self._slots = asyncio.Semaphore(connection_pool_size)
+        self._wait = POOL_WAIT.labels(name)
+        self._saturated = POOL_SATURATED.labels(name)
+        self._in_use = POOL_IN_USE.labels(name)
+        POOL_SIZE.labels(name).set(connection_pool_size)
+        self._waits_since_warning = 0
+        self._last_warning = 0.0
+
+    async def _acquire(self, timeout: float | None) -> None:
+        """Take a connection slot, raising ``TimedOut`` like httpx's pool would."""
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return
+        self._saturated.inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except TimeoutError as exc:
+            self._wait.observe(time.perf_counter() - start)
+            error_msg = (
+                f"Pool timeout: all {self.size} connections of the {self.name} "
+                "pool are occupied"
+            )
+            raise TimedOut(error_msg) from exc
+        waited = time.perf_counter() - start
+        self._wait.observe(waited)
+        if waited >= POOL_WAIT_WARNING:
+            self._warn(waited)
+
+    def _warn(self, waited: float) -> None:
+        """Log a long pool wait, at most once per ``POOL_WARNING_INTERVAL``."""
+        self._waits_since_warning += 1
+        now = time.monotonic()
+        if now - self._last_warning < POOL_WARNING_INTERVAL:
+            return
+        logger.warning(
+            "⏳ Bot API %s pool saturated: waited %.0f ms for a connection "
+            "(%s long waits since last report, pool size %s)",
+            self.name,
+            waited * 1000,
+            self._waits_since_warning,
+            self.size,
+        )
+        self._last_warning = now
+        self._waits_since_warning = 0
+
+    async def do_request(  # noqa: PLR0913
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        read_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+        write_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+        connect_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+        pool_timeout: ODVInput[float] = BaseRequest.DEFAULT_NONE,
+    ) -> tuple[int, bytes]:
+        """Wait for a free connection, then perform the request."""
+        timeout = (
+            self._client.timeout.pool
+            if isinstance(pool_timeout, DefaultValue)
+            else pool_timeout
+        )
+        await self._acquire(timeout)
+        self._in_use.value += 1
+        try:
+            return await super().do_request(
+                url,
+                method,
+                request_data,
+                read_timeout,
+                write_timeout,
+                connect_timeout,
+                pool_timeout,
+            )
+        finally:
+            self._in_use.value -= 1
+            self._slots.release()
+
+
+def create_requests() -> tuple[InstrumentedHTTPXRequest, InstrumentedHTTPXRequest]:
+    """Build the (regular calls, ``getUpdates``) request objects from config."""
+    regular = InstrumentedHTTPXRequest(
+        "default",
+        BOT_API_POOL_SIZE,
+        keepalive=BOT_API_KEEPALIVE,
+        keepalive_expiry=BOT_API_KEEPALIVE_EXPIRY,
+        connect_timeout=BOT_API_CONNECT_TIMEOUT,
+        read_timeout=BOT_API_READ_TIMEOUT,
+        write_timeout=BOT_API_WRITE_TIMEOUT,
+        pool_timeout=BOT_API_POOL_TIMEOUT,
+        http2=BOT_API_HTTP2,
+    )
+    get_updates = InstrumentedHTTPXRequest(
+        "get_updates",
+        GET_UPDATES_POOL_SIZE,
+        connect_timeout=BOT_API_CONNECT_TIMEOUT,
+        read_timeout=GET_UPDATES_READ_TIMEOUT,
+        write_timeout=BOT_API_WRITE_TIMEOUT,
+        pool_timeout=BOT_API_POOL_TIMEOUT,
+        http2=BOT_API_HTTP2,
+    )
+    return regular, get_updates
@@ -0,0 +1,51 @@
+"""Tag log records with the update being processed.
+
+:class:`LogContextHandler` runs ahead of every other handler group. Its
+``check_update`` stores each update in
+:data:`~src.utils.logger.UPDATE_CONTEXT` and never claims it, so it costs one
+context variable write and no callback. Handlers (and tasks they start) run in
+the same context, so every record they log carries the update; its ids and
+command are extracted only if a record is actually written. The update
+processors in :mod:`src.core.update_processor` clear the context again once the
+update has been handled.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from telegram import Update
+from telegram.ext import BaseHandler
+
+from src.utils.logger import UPDATE_CONTEXT
+
+if TYPE_CHECKING:
+    from telegram.ext import Application, CallbackContext
+
+# Runs before the deduplicator, so dropped duplicates are tagged as well
+LOG_CONTEXT_HANDLER_GROUP = -3000
+
+
+class LogContextHandler(BaseHandler[Update, "CallbackContext", Any]):
+    """Set the logging context of each update without handling it."""
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """Initialize the handler; it never runs a callback."""
+        super().__init__(self._unused_callback)
+
+    @staticmethod
+    async def _unused_callback(_update: object, _context: object) -> None:
+        """Satisfy ``BaseHandler``; updates are never claimed."""
+
+    def check_update(self, update: object) -> bool:
+        """Make ``update`` the logging context, then let it pass."""
+        if isinstance(update, Update):
+            UPDATE_CONTEXT.set(update)
+        return False
+
+
+def attach_log_context(app: Application) -> None:
+    """Tag every record logged while ``app`` processes an update."""
+    app.add_handler(LogContextHandler(), LOG_CONTEXT_HANDLER_GROUP)
@@ -0,0 +1,419 @@
+"""Outbound send scheduler for Bot API requests.
+
+Plugs into python-telegram-bot as a :class:`~telegram.ext.BaseRateLimiter`, so
+every request made through ``Application.bot`` (including ``reply_text``) passes
+through it. Requests that target a chat are throttled with token buckets for the
+global limit, the per-chat limit and the per-group limit, ordered by priority
+across chats and strictly FIFO within a chat. ``RetryAfter`` responses pause
+sending for the advertised time and the request is retried automatically.
+Consecutive ``sendMessage`` calls to the same chat can optionally be coalesced
+into a single message.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from telegram.constants import MessageLimit
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+    RequestCallback = Callable[..., Coroutine[Any, Any, Any]]
+
+# Extra pause on top of ``retry_after`` to absorb clock skew
+RETRY_AFTER_MARGIN = 0.1
+# Idle per-chat buckets are pruned once this many are tracked
+MAX_IDLE_BUCKETS = 1024
+
+
+class Priority(IntEnum):
+    """Priority classes for outbound requests; lower values are sent first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Return how long to wait until a token is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now: float) -> None:
+        """Take one token; callers check :meth:`delay` first."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        """Return whether the bucket has refilled completely."""
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass(slots=True)
+class _Request:
+    """A queued chat-bound request and the future awaiting its result."""
+
+    callback: RequestCallback
+    endpoint: str
+    data: dict[str, Any]
+    kwargs: dict[str, Any]
+    priority: int
+    future: asyncio.Future
+    retries: int = field(default=0)
+
+
+class OutboundScheduler(BaseRateLimiter[int]):
+    """Throttle, prioritize and retry outbound Bot API requests.
+
+    ``rate_limit_args`` passed to bot methods is interpreted as a
+    :class:`Priority` (``NORMAL`` by default). Requests without a ``chat_id``,
+    such as ``answerCallbackQuery``, bypass the queue and are only delayed while
+    a ``RetryAfter`` pause is active.
+    """
+
+    __slots__ = (
+        "_chat_buckets",
+        "_chat_burst",
+        "_chat_queues",
+        "_chat_rate",
+        "_coalesce",
+        "_global",
+        "_global_burst",
+        "_global_rate",
+        "_group_buckets",
+        "_group_rate",
+        "_in_flight",
+        "_max_retries",
+        "_paused_until",
+        "_ready",
+        "_scheduled",
+        "_sequence",
+        "_tasks",
+        "_waiting",
+        "_wakeup",
+        "_worker",
+        "coalesced",
+        "retried",
+        "sent",
+    )
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        group_rate_per_minute: float = 20,
+        *,
+        global_burst: float | None = None,
+        chat_burst: float = 3,
+        coalesce: bool = False,
+        max_retries: int = 3,
+    ) -> None:
+        """Configure the rate limits and retry behaviour."""
+        self._global_rate = global_rate
+        self._global_burst = global_burst or global_rate
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._group_rate = group_rate_per_minute / 60
+        self._coalesce = coalesce
+        self._max_retries = max_retries
+
+        self._global: TokenBucket | None = None
+        self._chat_buckets: dict[int | str, TokenBucket] = {}
+        self._group_buckets: dict[int | str, TokenBucket] = {}
+        self._chat_queues: dict[int | str, deque[_Request]] = {}
+        # Heap of (priority, sequence, chat) ready to send and of
+        # (ready_at, priority, sequence, chat) blocked on a chat/group bucket
+        self._ready: list[tuple[int, int, int | str]] = []
+        self._waiting: list[tuple[float, int, int, int | str]] = []
+        self._scheduled: set[int | str] = set()
+        self._in_flight: set[int | str] = set()
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.sent = 0
+        self.retried = 0
+        self.coalesced = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of chat-bound requests waiting to be sent."""
+        return sum(len(queue) for queue in self._chat_queues.values())
+
+    async def initialize(self) -> None:
+        """Start the background send loop."""
+        if self._worker is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._global = TokenBucket(self._global_rate, self._global_burst, loop.time())
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run(), name="OutboundScheduler")
+
+    async def shutdown(self) -> None:
+        """Stop the send loop and cancel requests that were never sent."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+        for queue in self._chat_queues.values():
+            for request in queue:
+                request.future.cancel()
+        self._chat_queues.clear()
+        self._ready.clear()
+        self._waiting.clear()
+        self._scheduled.clear()
+
+    async def process_request(
+        self,
+        callback: RequestCallback,
+        args: Any,  # noqa: ANN401
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: int | None,
+    ) -> Any:  # noqa: ANN401
+        """Queue chat-bound requests; send everything else once unpaused."""
+        chat_id = data.get("chat_id")
+        if chat_id is None or self._worker is None:
+            return await self._call_direct(callback, args, kwargs)
+
+        loop = asyncio.get_running_loop()
+        priority = Priority.NORMAL if rate_limit_args is None else int(rate_limit_args)
+        request = _Request(
+            callback=callback,
+            endpoint=endpoint,
+            data=data,
+            kwargs=kwargs,
+            priority=priority,
+            future=loop.create_future(),
+        )
+        key = self._chat_key(chat_id)
+        self._chat_queues.setdefault(key, deque()).append(request)
+        if key not in self._scheduled and key not in self._in_flight:
+            self._schedule(key)
+        return await request.future
+
+    @staticmethod
+    def _chat_key(chat_id: object) -> int | str:
+        """Normalize ``chat_id`` so ``"123"`` and ``123`` share a bucket."""
+        if isinstance(chat_id, int):
+            return chat_id
+        text = str(chat_id)
+        with contextlib.suppress(ValueError):
+            return int(text)
+        return text
+
+    @staticmethod
+    def _is_group(key: int | str) -> bool:
+        """Negative ids and ``@username`` targets are groups or channels."""
+        return isinstance(key, str) or key < 0
+
+    async def _call_direct(
+        self,
+        callback: RequestCallback,
+        args: Any,  # noqa: ANN401
+        kwargs: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        """Call ``callback`` outside the queue, honoring ``RetryAfter`` pauses."""
+        loop = asyncio.get_running_loop()
+        retries = 0
+        while True:
+            delay = self._paused_until - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as exc:
+                if retries >= self._max_retries:
+                    raise
+                retries += 1
+                self._pause(exc, loop.time())
+
+    def _pause(self, exc: RetryAfter, now: float) -> None:
+        """Stop sending until the ``retry_after`` interval has passed."""
+        self.retried += 1
+        until = now + float(exc.retry_after) + RETRY_AFTER_MARGIN
+        if until > self._paused_until:
+            logger.warning("⏳ Flood limit hit, pausing sends for %ss", exc.retry_after)
+            self._paused_until = until
+
+    def _schedule(self, key: int | str) -> None:
+        """Put the head request of ``key`` on the ready heap."""
+        queue = self._chat_queues[key]
+        entry = (queue[0].priority, next(self._sequence), key)
+        heapq.heappush(self._ready, entry)
+        self._scheduled.add(key)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _chat_delay(self, key: int | str, now: float) -> float:
+        """Return how long the per-chat and per-group buckets block ``key``."""
+        bucket = self._chat_buckets.get(key)
+        if bucket is None:
+            bucket = self._chat_buckets[key] = TokenBucket(
+                self._chat_rate, self._chat_burst, now
+            )
+        delay = bucket.delay(now)
+        if self._is_group(key) and self._group_rate:
+            group = self._group_buckets.get(key)
+            if group is None:
+                group = self._group_buckets[key] = TokenBucket(
+                    self._group_rate, self._group_rate * 60, now
+                )
+            delay = max(delay, group.delay(now))
+        return delay
+
+    def _consume(self, key: int | str, now: float) -> None:
+        """Take a token from every bucket that applies to ``key``."""
+        self._global.consume(now)
+        self._chat_buckets[key].consume(now)
+        if key in self._group_buckets:
+            self._group_buckets[key].consume(now)
+
+    def _prune_buckets(self, now: float) -> None:
+        """Drop refilled buckets of idle chats to keep memory bounded."""
+        for buckets in (self._chat_buckets, self._group_buckets):
+            if len(buckets) <= MAX_IDLE_BUCKETS:
+                continue
+            for key in [k for k, b in buckets.items() if b.is_full(now)]:
+                if key not in self._chat_queues:
+                    del buckets[key]
+
+    def _take_batch(self, key: int | str) -> list[_Request]:
+        """Pop the next request of ``key`` plus any coalescible followers."""
+        queue = self._chat_queues[key]
+        # Skip requests whose caller has gone away
+        while queue and queue[0].future.done():
+            queue.popleft()
+        if not queue:
+            return []
+        batch = [queue.popleft()]
+        if not (self._coalesce and batch[0].endpoint == "sendMessage"):
+            return batch
+
+        head = batch[0]
+        shape = {k: v for k, v in head.data.items() if k != "text"}
+        length = len(head.data.get("text", ""))
+        while queue:
+            candidate = queue[0]
+            text = candidate.data.get("text", "")
+            if (
+                candidate.endpoint != "sendMessage"
+                or candidate.future.done()
+                or {k: v for k, v in candidate.data.items() if k != "text"} != shape
+                or length + 1 + len(text) > MessageLimit.MAX_TEXT_LENGTH
+            ):
+                break
+            length += 1 + len(text)
+            batch.append(queue.popleft())
+        return batch
+
+    async def _run(self) -> None:
+        """Pick the next eligible chat and send its head request."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            now = loop.time()
+            while self._waiting and self._waiting[0][0] <= now:
+                _, priority, sequence, key = heapq.heappop(self._waiting)
+                heapq.heappush(self._ready, (priority, sequence, key))
+
+            if not self._ready:
+                timeout = self._waiting[0][0] - now if self._waiting else None
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue
+
+            delay = max(self._paused_until - now, self._global.delay(now))
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            priority, sequence, key = heapq.heappop(self._ready)
+            chat_delay = self._chat_delay(key, now)
+            if chat_delay > 0:
+                entry = (now + chat_delay, priority, sequence, key)
+                heapq.heappush(self._waiting, entry)
+                continue
+
+            batch = self._take_batch(key)
+            self._scheduled.discard(key)
+            if not batch:
+                self._chat_queues.pop(key, None)
+                continue
+            self._consume(key, now)
+            self._in_flight.add(key)
+            task = asyncio.create_task(self._send(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            self._prune_buckets(now)
+
+    async def _send(self, key: int | str, batch: list[_Request]) -> None:
+        """Send a batch as one request and resolve every waiting future."""
+        loop = asyncio.get_running_loop()
+        head = batch[0]
+        data = head.data
+        if len(batch) > 1:
+            data = {**head.data, "text": "\n".join(r.data["text"] for r in batch)}
+        try:
+            result = await head.callback(head.endpoint, data, **head.kwargs)
+        except RetryAfter as exc:
+            self._pause(exc, loop.time())
+            if head.retries < self._max_retries:
+                head.retries += 1
+                self._chat_queues.setdefault(key, deque()).extendleft(reversed(batch))
+            else:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+        except Exception as exc:  # noqa: BLE001
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+        else:
+            self.sent += 1
+            self.coalesced += len(batch) - 1
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_result(result)
+        finally:
+            self._in_flight.discard(key)
+            if self._chat_queues.get(key):
+                self._schedule(key)
+            else:
+                self._chat_queues.pop(key, None)
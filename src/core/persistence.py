@@ -0,0 +1,301 @@
+"""SQLite persistence with write-behind batching and lazy loading.
+
+:class:`SqlitePersistence` stores user, chat and bot data, callback data and
+conversation states in one SQLite file in WAL mode, one row per key.
+
+Writes are buffered: ``update_*``/``drop_*`` calls only record the latest value
+of a dirty key. The buffer is flushed ``flush_interval`` seconds after the
+first dirty key arrives or as soon as ``batch_size`` keys are dirty, so a flush
+costs the number of changed keys rather than the size of the whole store
+(``PicklePersistence`` rewrites the entire file). The buffered values are the
+live ``user_data``/``chat_data`` dicts, so a flush pickles them on the event
+loop, where handlers mutate them, and only hands the bytes to a worker thread
+that writes them in a single transaction.
+
+With ``lazy=True`` user and chat data are not read at startup:
+``get_user_data``/``get_chat_data`` return empty dicts and the persistence
+acts as the :class:`~src.core.context_store.SpillStore` of the application's
+context stores, which fault each entry in on first access (see
+:func:`~src.core.context_store.install_context_stores`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from telegram.ext._utils.types import CDCData, ConversationDict, ConversationKey
+
+FLUSH_SECONDS = METRICS.histogram(
+    "bot_persistence_flush_seconds",
+    "Time spent writing one batch of dirty keys.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+FLUSHED_KEYS = METRICS.counter(
+    "bot_persistence_flushed_keys_total", "Keys written or deleted by flushes."
+)
+
+# Names of the single-value rows of the "singletons" table
+BOT_DATA = "bot_data"
+CALLBACK_DATA = "callback_data"
+# Row filter used to delete a key from each table
+DELETE_WHERE = {
+    "user_data": "key = ?",
+    "chat_data": "key = ?",
+    "singletons": "name = ?",
+    "conversations": "name = ? AND key = ?",
+}
+_DELETED = object()
+
+# Rows of one flush per table: parameters of the deletes and of the upserts
+_Rows = dict[str, list[tuple[Any, ...]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_data (key INTEGER PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS chat_data (key INTEGER PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS singletons (name TEXT PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS conversations (
+    name TEXT NOT NULL, key TEXT NOT NULL, state BLOB NOT NULL,
+    PRIMARY KEY (name, key)
+);
+"""
+
+
+def _dumps(value: object) -> bytes:
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _loads(data: bytes) -> Any:  # noqa: ANN401
+    return pickle.loads(data)  # noqa: S301
+
+
+class SqlitePersistence(BasePersistence[dict, dict, dict]):
+    """``BasePersistence`` backed by a single SQLite file with batched writes."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str | Path,
+        *,
+        store_data: PersistenceInput | None = None,
+        update_interval: float = 60,
+        flush_interval: float = 1.0,
+        batch_size: int = 1000,
+        lazy: bool = True,
+    ) -> None:
+        """Open (or create) the database at ``path``."""
+        super().__init__(store_data=store_data, update_interval=update_interval)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.lazy = lazy
+        # The writer runs in a worker thread; reads stay on the event loop
+        self._writer = self._connect(check_same_thread=False)
+        self._writer.executescript(SCHEMA)
+        self._reader = self._connect()
+        # (table, key) -> latest value or _DELETED, not yet handed to a flush
+        self._dirty: dict[tuple[str, Any], Any] = {}
+        # The batch a running flush is writing, still visible to load()
+        self._flushing: dict[tuple[str, Any], Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    def _connect(self, *, check_same_thread: bool = True) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA busy_timeout=5000")
+        return db
+
+    # --- Write-behind buffer -------------------------------------------------
+
+    def _mark(self, table: str, key: Any, value: Any) -> None:  # noqa: ANN401
+        """Record the latest value of a key and schedule a flush."""
+        self._dirty[table, key] = value
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Outside the event loop: written by the next flush
+        if len(self._dirty) >= self.batch_size:
+            self._start_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        async with self._flush_lock:
+            while self._dirty:
+                self._flushing, self._dirty = self._dirty, {}
+                start = time.perf_counter()
+                deletes, upserts = self._serialize(self._flushing)
+                await asyncio.to_thread(self._write, deletes, upserts)
+                FLUSH_SECONDS.observe(time.perf_counter() - start)
+                FLUSHED_KEYS.inc(len(self._flushing))
+                self._flushing = {}
+
+    @staticmethod
+    def _serialize(batch: dict[tuple[str, Any], Any]) -> tuple[_Rows, _Rows]:
+        """Pickle ``batch`` into delete and upsert rows (on the event loop)."""
+        deletes: _Rows = {}
+        upserts: _Rows = {}
+        for (table, key), value in batch.items():
+            params = key if table == "conversations" else (key,)
+            if value is _DELETED:
+                deletes.setdefault(table, []).append(params)
+            else:
+                upserts.setdefault(table, []).append((*params, _dumps(value)))
+        return deletes, upserts
+
+    def _write(self, deletes: _Rows, upserts: _Rows) -> None:
+        """Write serialized rows in one transaction (runs in a worker thread)."""
+        with self._writer:
+            for table, rows in deletes.items():
+                self._writer.executemany(
+                    f"DELETE FROM {table} WHERE {DELETE_WHERE[table]}",  # noqa: S608
+                    rows,
+                )
+            for table, rows in upserts.items():
+                marks = "?, ?, ?" if table == "conversations" else "?, ?"
+                self._writer.executemany(
+                    f"INSERT OR REPLACE INTO {table} VALUES ({marks})",  # noqa: S608
+                    rows,
+                )
+
+    def _pending(self, table: str, key: Any) -> Any:  # noqa: ANN401
+        """Return a buffered value for ``key``, ``_DELETED`` or ``None``."""
+        value = self._dirty.get((table, key))
+        if value is None:
+            value = self._flushing.get((table, key))
+        return value
+
+    # --- SpillStore interface (lazy loading) ---------------------------------
+
+    def load(self, kind: str, key: int) -> Any | None:  # noqa: ANN401
+        """Return the stored entry of ``kind`` (``user_data``/``chat_data``)."""
+        pending = self._pending(kind, key)
+        if pending is not None:
+            return None if pending is _DELETED else pending
+        row = self._reader.execute(
+            f"SELECT data FROM {kind} WHERE key = ?",  # noqa: S608
+            (key,),
+        ).fetchone()
+        return None if row is None else _loads(row[0])
+
+    def save(self, kind: str, key: int, data: Any) -> None:  # noqa: ANN401
+        """Persist an entry evicted from a context store."""
+        self._mark(kind, key, data)
+
+    def delete(self, kind: str, key: int) -> None:
+        """Delete an entry."""
+        self._mark(kind, key, _DELETED)
+
+    # --- BasePersistence ------------------------------------------------------
+
+    def _load_table(self, table: str) -> dict[int, dict]:
+        if self.lazy:
+            return {}
+        rows = self._reader.execute(f"SELECT key, data FROM {table}")  # noqa: S608
+        data = {key: _loads(blob) for key, blob in rows}
+        logger.info("💾 Loaded %s %s entries from %s", len(data), table, self.path)
+        return data
+
+    def _load_singleton(self, name: str) -> Any | None:  # noqa: ANN401
+        pending = self._pending("singletons", name)
+        if pending is not None:
+            return None if pending is _DELETED else pending
+        row = self._reader.execute(
+            "SELECT data FROM singletons WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else _loads(row[0])
+
+    async def get_user_data(self) -> dict[int, dict]:
+        """Return all user data, or nothing when loading lazily."""
+        return self._load_table("user_data")
+
+    async def get_chat_data(self) -> dict[int, dict]:
+        """Return all chat data, or nothing when loading lazily."""
+        return self._load_table("chat_data")
+
+    async def get_bot_data(self) -> dict:
+        """Return the bot data."""
+        return self._load_singleton(BOT_DATA) or {}
+
+    async def get_callback_data(self) -> CDCData | None:
+        """Return the stored callback data, if any."""
+        return self._load_singleton(CALLBACK_DATA)
+
+    async def get_conversations(self, name: str) -> ConversationDict:
+        """Return the states of the conversation handler ``name``."""
+        return {
+            tuple(json.loads(key)): _loads(state)
+            for key, state in self._reader.execute(
+                "SELECT key, state FROM conversations WHERE name = ?", (name,)
+            )
+        }
+
+    async def update_conversation(
+        self, name: str, key: ConversationKey, new_state: object | None
+    ) -> None:
+        """Buffer a conversation state change."""
+        value = _DELETED if new_state is None else new_state
+        self._mark("conversations", (name, json.dumps(list(key))), value)
+
+    async def update_user_data(self, user_id: int, data: dict) -> None:
+        """Buffer changed user data."""
+        self._mark("user_data", user_id, data)
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        """Buffer changed chat data."""
+        self._mark("chat_data", chat_id, data)
+
+    async def update_bot_data(self, data: dict) -> None:
+        """Buffer changed bot data."""
+        self._mark("singletons", BOT_DATA, data)
+
+    async def update_callback_data(self, data: CDCData) -> None:
+        """Buffer changed callback data."""
+        self._mark("singletons", CALLBACK_DATA, data)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        """Delete the data of ``user_id``."""
+        self.delete("user_data", user_id)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        """Delete the data of ``chat_id``."""
+        self.delete("chat_data", chat_id)
+
+    async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+        """Nothing to refresh: this process is the only writer of its keys."""
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        """Nothing to refresh: this process is the only writer of its keys."""
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        """Nothing to refresh: this process is the only writer of its keys."""
+
+    async def flush(self) -> None:
+        """Write every buffered change and close the database."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        await self._flush()
+        self._writer.close()
+        self._reader.close()
@@ -0,0 +1,90 @@
+"""Record incoming updates for later replay.
+
+With ``UPDATE_RECORD_FILE`` set, every update the application receives (in
+polling or webhook mode) is appended to that file as one JSON line::
+
+    {"ts": 1718000000.123, "update": {...}}
+
+``ts`` is the wall-clock receive time, so a replay can reproduce the original
+traffic shape (see ``benchmarks/replay.py``). Lines are written through a
+buffered file and flushed when the application shuts down.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from telegram import Update
+from telegram.ext import TypeHandler
+
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from telegram.ext import Application
+
+# Runs before every other handler group, so every update is recorded
+RECORD_HANDLER_GROUP = -1000
+
+
+class UpdateRecorder:
+    """Append-only JSON Lines writer for raw updates."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open ``path`` for appending, creating parent directories."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self.recorded = 0
+
+    def record(self, data: dict[str, Any], ts: float | None = None) -> None:
+        """Append one raw update with its receive time."""
+        line = json.dumps(
+            {"ts": time.time() if ts is None else ts, "update": data},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self._file.write(line + "\n")
+        self.recorded += 1
+
+    async def record_update(self, update: Update, _context: object) -> None:
+        """Handler callback recording a received ``Update``."""
+        self.record(update.to_dict())
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._file.closed:
+            self._file.close()
+            logger.info("📼 Recorded %s updates to %s", self.recorded, self.path)
+
+
+def read_recording(path: str | Path) -> Iterator[tuple[float, dict[str, Any]]]:
+    """Yield ``(ts, update)`` pairs from a recording, skipping torn lines."""
+    with Path(path).open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A crash may leave the last line half-written
+                continue
+            yield entry["ts"], entry["update"]
+
+
+def attach_recorder(app: Application, path: str | Path) -> UpdateRecorder:
+    """Record every update ``app`` processes to ``path`` until it shuts down."""
+    recorder = UpdateRecorder(path)
+    app.add_handler(TypeHandler(Update, recorder.record_update), RECORD_HANDLER_GROUP)
+    previous_shutdown = app.post_shutdown
+
+    async def post_shutdown(application: Application) -> None:
+        recorder.close()
+        if previous_shutdown:
+            await previous_shutdown(application)
+
+    app.post_shutdown = post_shutdown
+    logger.info("📼 Recording updates to %s", recorder.path)
+    return recorder
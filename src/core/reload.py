@@ -0,0 +1,290 @@
+"""Hot reload of handler modules and configuration.
+
+:class:`HandlerReloader` re-reads ``.env`` into :mod:`src.config`, then
+re-imports the handler modules whose file changed (by mtime and size, as in
+:mod:`src.handlers_manifest`) or which imported a changed setting. Their
+commands go into a fresh :class:`~src.utils.commands.CommandRegistry` next to
+the unchanged modules' ones, and the command and callback handlers are
+collected into a new list instead of the live handler group. That list then
+replaces handler group 0 in a single assignment: updates already being handled
+finish with the handlers they matched, the next update sees the new table.
+``set_my_commands`` is only sent again when the visible commands changed. If a
+module fails to import, the running table and registry stay in place.
+
+A reload is triggered by ``SIGHUP`` (see :func:`attach_reloader`) or by the
+admin ``/reload`` command. Settings read once at startup (connection pools,
+ports, run mode, dispatch strategy, ...) still need a restart. In multi-process
+webhook mode the ingress answers ``SIGHUP`` with a rolling restart of its
+workers instead (see :mod:`src.core.workers`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib
+import os
+import signal
+import sys
+import time
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dotenv import dotenv_values
+from telegram.error import TelegramError
+from telegram.ext import BaseHandler
+
+from src import config, handlers
+from src.config import HANDLER_LOADING
+from src.core.allowed_updates import derive_allowed_updates
+from src.utils import commands
+from src.utils.commands import CommandRegistry, make_set_commands
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import ModuleType
+
+    from telegram.ext import Application
+
+RELOADS_TOTAL = METRICS.counter(
+    "bot_reloads_total",
+    "Hot reloads of handler modules and configuration, by outcome.",
+    ("outcome",),
+)
+_RELOADED = RELOADS_TOTAL.labels("reloaded")
+_FAILED = RELOADS_TOTAL.labels("failed")
+
+# PTB's default handler group, which holds the command and callback handlers
+DISPATCH_GROUP = 0
+
+# Reloader of each application, for the /reload command
+_RELOADERS: weakref.WeakKeyDictionary[Application, HandlerReloader] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def module_stats(package: ModuleType) -> dict[str, tuple[int, int]]:
+    """Return ``(mtime_ns, size)`` of every module file of ``package``."""
+    stats = {}
+    for path in sorted(Path(package.__path__[0]).glob("*.py")):
+        if path.stem != "__init__":
+            stat = path.stat()
+            stats[f"{package.__name__}.{path.stem}"] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+def apply_dotenv(previous: dict[str, str | None]) -> dict[str, str | None]:
+    """Apply the current ``.env`` to ``os.environ`` and return its values.
+
+    Variables set outside ``.env`` keep precedence, as with ``load_dotenv``:
+    only variables that are unset or still hold ``previous`` values change.
+    """
+    current = dotenv_values()
+    for name in previous.keys() - current.keys():
+        if os.environ.get(name) == previous[name]:
+            os.environ.pop(name, None)
+    for name, value in current.items():
+        if value is not None and os.environ.get(name, value) == previous.get(
+            name, value
+        ):
+            os.environ[name] = value
+    return current
+
+
+def reload_config() -> set[str]:
+    """Re-evaluate :mod:`src.config` and return the settings that changed."""
+    before = {name: value for name, value in vars(config).items() if name.isupper()}
+    importlib.reload(config)
+    return {
+        name
+        for name, value in vars(config).items()
+        if name.isupper() and (name not in before or before[name] != value)
+    }
+
+
+class HandlerTable:
+    """Application stand-in collecting the handlers of a new dispatch table."""
+
+    def __init__(self) -> None:
+        """Start with an empty handler list."""
+        self.handlers: list[BaseHandler] = []
+
+    def add_handler(self, handler: BaseHandler, group: int = DISPATCH_GROUP) -> None:
+        """Collect a handler the way ``Application.add_handler`` would for group 0."""
+        if group != DISPATCH_GROUP:
+            error_msg = f"Reloadable handlers must use group {DISPATCH_GROUP}"
+            raise ValueError(error_msg)
+        self.handlers.append(handler)
+
+
+@dataclass(slots=True)
+class ReloadReport:
+    """What a successful reload changed."""
+
+    modules: list[str] = field(default_factory=list)
+    settings: list[str] = field(default_factory=list)
+    commands_changed: bool = False
+
+
+class HandlerReloader:
+    """Rebuild handler group 0 from changed handler modules and configuration."""
+
+    def __init__(
+        self,
+        app: Application,
+        build: Callable[[HandlerTable], None],
+        *,
+        package: ModuleType = handlers,
+        loading: str = HANDLER_LOADING,
+        set_commands: Callable[[Application], Awaitable[None]] | None = None,
+    ) -> None:
+        """Reload ``package`` into the group-0 handlers registered by ``build``.
+
+        ``build`` registers the same handlers on a :class:`HandlerTable` that
+        were registered on ``app`` at startup, with the same ``loading`` mode;
+        ``set_commands`` publishes the command list and defaults to
+        :func:`make_set_commands`.
+        """
+        self.app = app
+        self.build = build
+        self.package = package
+        self.loading = loading
+        self.set_commands = set_commands or make_set_commands()
+        self._stats = module_stats(package)
+        self._dotenv = dotenv_values()
+        self._lock = asyncio.Lock()
+
+    def stale_modules(
+        self, stats: dict[str, tuple[int, int]], settings: set[str]
+    ) -> set[str]:
+        """Return modules that changed on disk or imported a changed setting."""
+        stale = {name for name, stat in stats.items() if self._stats.get(name) != stat}
+        for name in stats.keys() - stale:
+            module = sys.modules.get(name)
+            if module is not None and not settings.isdisjoint(vars(module)):
+                stale.add(name)
+        return stale
+
+    def _rebuild(
+        self, stats: dict[str, tuple[int, int]], stale: set[str]
+    ) -> HandlerTable:
+        """Re-import ``stale`` modules and build the new table and registry.
+
+        Commands of unchanged, imported modules are carried over; the others
+        are registered again by the imports or by the manifest. On return the
+        new registry is installed as ``COMMAND_REGISTRY``.
+        """
+        previous = commands.COMMAND_REGISTRY
+        dropped = stale | (self._stats.keys() - stats.keys())
+        commands.COMMAND_REGISTRY = CommandRegistry(
+            meta
+            for meta in previous
+            if meta.module not in dropped and meta.module in sys.modules
+        )
+        # New module files may not be in the import system's directory caches
+        importlib.invalidate_caches()
+        try:
+            for name in sorted(stale):
+                module = sys.modules.get(name)
+                if module is not None:
+                    importlib.reload(module)
+                elif self.loading != "lazy":
+                    importlib.import_module(name)
+            table = HandlerTable()
+            self.build(table)
+        except BaseException:
+            commands.COMMAND_REGISTRY = previous
+            raise
+        # Keep the registration order of a fresh start: module by module
+        order = {name: index for index, name in enumerate(stats)}
+        commands.COMMAND_REGISTRY = CommandRegistry(
+            sorted(
+                commands.COMMAND_REGISTRY, key=lambda meta: order.get(meta.module, -1)
+            )
+        )
+        return table
+
+    async def reload(self) -> ReloadReport | None:
+        """Apply changed modules and settings; ``None`` if the reload failed."""
+        async with self._lock:
+            started = time.perf_counter()
+            previous = commands.COMMAND_REGISTRY
+            try:
+                self._dotenv = apply_dotenv(self._dotenv)
+                settings = reload_config()
+                stats = module_stats(self.package)
+                stale = self.stale_modules(stats, settings)
+                report = ReloadReport(sorted(stale), sorted(settings))
+                if stale or self._stats.keys() != stats.keys():
+                    table = self._rebuild(stats, stale)
+                    self._stats = stats
+                    allowed = derive_allowed_updates(self.app)
+                    # The swap: one assignment, nothing awaited in between
+                    self.app.handlers[DISPATCH_GROUP] = table.handlers
+                    if derive_allowed_updates(self.app) != allowed:
+                        logger.warning(
+                            "⚠️ Handled update types changed; allowed_updates "
+                            "is only updated on restart"
+                        )
+            except Exception:
+                logger.exception("🔁 Reload failed; keeping the running handlers")
+                _FAILED.inc()
+                return None
+
+            registry = commands.COMMAND_REGISTRY
+            report.commands_changed = [
+                (cmd.command, cmd.description) for cmd in previous.bot_commands
+            ] != [(cmd.command, cmd.description) for cmd in registry.bot_commands]
+            if report.commands_changed:
+                try:
+                    await self.set_commands(self.app)
+                except TelegramError as exc:
+                    logger.warning("⚠️ Could not publish the commands: %s", exc)
+            _RELOADED.inc()
+            logger.info(
+                "🔁 Reloaded in %.1f ms: modules %s, settings %s%s",
+                (time.perf_counter() - started) * 1000,
+                ", ".join(report.modules) or "unchanged",
+                ", ".join(report.settings) or "unchanged",
+                ", commands republished" if report.commands_changed else "",
+            )
+            return report
+
+
+def reloader_for(app: Application) -> HandlerReloader | None:
+    """Return the reloader attached to ``app``, if hot reload is enabled."""
+    return _RELOADERS.get(app)
+
+
+def attach_reloader(
+    app: Application, build: Callable[[HandlerTable], None]
+) -> HandlerReloader:
+    """Enable ``/reload`` for ``app`` and reload on ``SIGHUP`` while it runs."""
+    reloader = HandlerReloader(app, build)
+    _RELOADERS[app] = reloader
+    previous_init = app.post_init
+    previous_shutdown = app.post_shutdown
+
+    def on_sighup() -> None:
+        app.create_task(reloader.reload(), name="handler_reload")
+
+    async def post_init(application: Application) -> None:
+        if previous_init:
+            await previous_init(application)
+        # Windows has no SIGHUP; /reload still works there
+        with contextlib.suppress(AttributeError, NotImplementedError):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, on_sighup)
+
+    async def post_shutdown(application: Application) -> None:
+        with contextlib.suppress(AttributeError, NotImplementedError):
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        if previous_shutdown:
+            await previous_shutdown(application)
+
+    app.post_init = post_init
+    app.post_shutdown = post_shutdown
+    return reloader
@@ -3,32 +3,262 @@
 Initializes the Telegram bot application with all handlers, error processing,
 and startup mode (polling or webhook). Provides entry points for bot execution
 and integrates logging, command registration, and graceful exception handling.
+The bot runs under an in-process supervisor (see :mod:`src.core.supervisor`)
+that restarts it with backoff after network failures.
 """
 
+import asyncio
+import sys
+from functools import partial
+
 from telegram.ext import Application, ApplicationBuilder, MessageHandler, filters
+from telegram.request import BaseRequest
 
 from src.config import (
+    BOT_API_BASE_URL,
     BOT_TOKEN,
+    CATCHUP_POLICY,
+    CONTEXT_DATA_MAX_ENTRIES,
+    CONTEXT_DATA_SPILL_FILE,
+    CONTEXT_DATA_TTL,
+    HOT_RELOAD,
+    METRICS_LISTEN,
+    METRICS_PORT,
+    OUTBOUND_CHAT_BURST,
+    OUTBOUND_CHAT_RATE,
+    OUTBOUND_COALESCE,
+    OUTBOUND_GLOBAL_RATE,
+    OUTBOUND_GROUP_RATE,
+    OUTBOUND_MAX_RETRIES,
+    OUTBOUND_SCHEDULER_ENABLED,
+    PERSISTENCE_BATCH_SIZE,
+    PERSISTENCE_FILE,
+    PERSISTENCE_FLUSH_INTERVAL,
+    PERSISTENCE_LAZY,
+    PERSISTENCE_UPDATE_INTERVAL,
     RUN_MODE,
+    UPDATE_DEDUP_WINDOW,
+    UPDATE_LANE_QUEUE_SIZE,
+    UPDATE_LANES,
+    UPDATE_RECORD_FILE,
     WEBHOOK_LISTEN,
     WEBHOOK_PORT,
+    WEBHOOK_SECRET_TOKEN,
+    WEBHOOK_SERVER,
     WEBHOOK_URL,
+    WEBHOOK_WORKERS,
+)
+from src.core.allowed_updates import resolve_allowed_updates
+from src.core.catchup import CatchUpQueue, attach_catch_up, create_update_queue
+from src.core.context_store import install_context_stores
+from src.core.dedup import attach_deduplicator
+from src.core.error_handler import attach_error_digest, handle_error
+from src.core.http import create_requests
+from src.core.log_context import attach_log_context
+from src.core.outbound import OutboundScheduler
+from src.core.persistence import SqlitePersistence
+from src.core.recorder import attach_recorder
+from src.core.reload import attach_reloader
+from src.core.supervisor import RETRYABLE_ERRORS, supervise
+from src.core.update_processor import (
+    ChatShardedUpdateProcessor,
+    SequentialUpdateProcessor,
 )
-from src.core.error_handler import handle_error
-from src.handlers.fallback import unknown_command
+from src.handlers import fallback
 from src.handlers_loader import register_handlers
 from src.utils.commands import make_set_commands
-from src.utils.logger import logger
+from src.utils.logger import logger, shutdown_logging
+from src.utils.metrics import METRICS, start_metrics_server
 
 
-def create_application() -> Application:
-    """Build and configure the Telegram bot application."""
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
-    logger.debug("✅ Application built")
+def create_outbound_scheduler(processes: int = 1) -> OutboundScheduler:
+    """Create the outbound send scheduler from configuration.
+
+    ``processes`` schedulers share the bot's global limit, so each gets an
+    equal part of it. Chats are routed to a single process, which keeps the
+    per-chat and per-group limits whole.
+    """
+    return OutboundScheduler(
+        global_rate=OUTBOUND_GLOBAL_RATE / processes,
+        chat_rate=OUTBOUND_CHAT_RATE,
+        group_rate_per_minute=OUTBOUND_GROUP_RATE,
+        chat_burst=OUTBOUND_CHAT_BURST,
+        coalesce=OUTBOUND_COALESCE,
+        max_retries=OUTBOUND_MAX_RETRIES,
+    )
+
+
+def register_app_metrics(
+    app: Application, scheduler: OutboundScheduler | None = None
+) -> None:
+    """Expose queue depths and outbound counters, read at scrape time."""
+    METRICS.gauge(
+        "bot_update_queue_depth",
+        "Updates waiting in the application's update queue.",
+        function=app.update_queue.qsize,
+    )
+    processor = app.update_processor
+    if isinstance(processor, ChatShardedUpdateProcessor):
+        METRICS.gauge(
+            "bot_update_lanes_depth",
+            "Updates waiting in the per-chat lanes.",
+            function=lambda: sum(processor.queue_depths),
+        )
+    update_queue = app.update_queue
+    if isinstance(update_queue, CatchUpQueue):
+        METRICS.gauge(
+            "bot_catchup_backlog",
+            "Updates of the startup backlog not yet handled or dropped.",
+            function=lambda: update_queue.remaining,
+        )
+        METRICS.gauge(
+            "bot_catchup_progress",
+            "Share of the startup backlog handled or dropped (1 when caught up).",
+            function=lambda: update_queue.progress,
+        )
+    if scheduler is not None:
+        METRICS.counter(
+            "bot_outbound_sent_total",
+            "Bot API requests sent by the outbound scheduler.",
+            function=lambda: scheduler.sent,
+        )
+        METRICS.counter(
+            "bot_outbound_retried_total",
+            "Requests retried after a 429 response.",
+            function=lambda: scheduler.retried,
+        )
+        METRICS.counter(
+            "bot_outbound_coalesced_total",
+            "Messages merged into a preceding sendMessage.",
+            function=lambda: scheduler.coalesced,
+        )
+        METRICS.gauge(
+            "bot_outbound_pending",
+            "Requests waiting in the outbound scheduler.",
+            function=lambda: scheduler.pending,
+        )
+
+
+def attach_metrics_server(
+    app: Application, port: int, host: str = METRICS_LISTEN
+) -> None:
+    """Serve the metrics endpoint for the lifetime of ``app``."""
+    previous_init = app.post_init
+    previous_shutdown = app.post_shutdown
+    metrics_runner = None
+
+    async def post_init(application: Application) -> None:
+        nonlocal metrics_runner
+        if previous_init:
+            await previous_init(application)
+        metrics_runner = await start_metrics_server(host, port)
+
+    async def post_shutdown(application: Application) -> None:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        if previous_shutdown:
+            await previous_shutdown(application)
+
+    app.post_init = post_init
+    app.post_shutdown = post_shutdown
+
+
+def register_dispatch_table(app: Application) -> None:
+    """Register the handler modules and the unknown-command fallback in group 0."""
     register_handlers(app)
-    app.add_handler(MessageHandler(filters.COMMAND, unknown_command))
+    # Looked up on the module, so a reload picks up the re-imported callback
+    app.add_handler(MessageHandler(filters.COMMAND, fallback.unknown_command))
+
+
+def create_application(
+    update_queue: asyncio.Queue | None = None,
+    *,
+    metrics_port: int = METRICS_PORT,
+    request: BaseRequest | None = None,
+    base_url: str | None = BOT_API_BASE_URL,
+    record_file: str | None = UPDATE_RECORD_FILE,
+    catch_up: str = CATCHUP_POLICY,
+    processes: int = 1,
+) -> Application:
+    """Build and configure the Telegram bot application.
+
+    ``update_queue`` replaces PTB's unbounded update queue, e.g. with a bounded
+    one for the aiohttp webhook server. A non-zero ``metrics_port`` serves the
+    metrics endpoint once the application is initialized. ``request`` replaces
+    the HTTP backend of the bot, e.g. with an offline stub in benchmarks;
+    otherwise regular calls and ``getUpdates`` get separate, instrumented
+    connection pools. ``base_url`` points the bot at another Bot API server.
+    With ``record_file`` every received update is appended to that file for
+    later replay. ``catch_up`` is the policy for the backlog pending at startup
+    (see :mod:`src.core.catchup`); it only applies to the default update queue.
+    ``processes`` is the number of processes sending as this bot, which share
+    ``OUTBOUND_GLOBAL_RATE``.
+    ``PERSISTENCE_FILE`` enables :class:`SqlitePersistence`.
+    ``HOT_RELOAD`` rebuilds the handlers on ``SIGHUP`` or ``/reload``.
+    """
+    builder = ApplicationBuilder().token(BOT_TOKEN)
+    if base_url:
+        builder = builder.base_url(base_url)
+    if update_queue is None:
+        update_queue = create_update_queue(policy=catch_up)
+    builder = builder.update_queue(update_queue)
+    if request is not None:
+        builder = builder.request(request).get_updates_request(request)
+    else:
+        regular, get_updates = create_requests()
+        builder = builder.request(regular).get_updates_request(get_updates)
+    scheduler = None
+    if OUTBOUND_SCHEDULER_ENABLED:
+        # Every Bot API call, including reply_text, goes through the scheduler
+        scheduler = create_outbound_scheduler(processes)
+        builder = builder.rate_limiter(scheduler)
+    if UPDATE_LANES > 1:
+        # Different chats run in parallel; each chat stays strictly ordered
+        builder = builder.concurrent_updates(
+            ChatShardedUpdateProcessor(UPDATE_LANES, UPDATE_LANE_QUEUE_SIZE)
+        )
+    else:
+        # PTB's sequential processing, without a stale log context in between
+        builder = builder.concurrent_updates(SequentialUpdateProcessor())
+    persistence = None
+    if PERSISTENCE_FILE:
+        persistence = SqlitePersistence(
+            PERSISTENCE_FILE,
+            update_interval=PERSISTENCE_UPDATE_INTERVAL,
+            flush_interval=PERSISTENCE_FLUSH_INTERVAL,
+            batch_size=PERSISTENCE_BATCH_SIZE,
+            lazy=PERSISTENCE_LAZY,
+        )
+        builder = builder.persistence(persistence)
+    app = builder.build()
+    logger.debug("✅ Application built")
+    if persistence is not None and persistence.lazy:
+        # Entries are faulted in from the database on first access
+        install_context_stores(
+            app,
+            CONTEXT_DATA_MAX_ENTRIES or sys.maxsize,
+            CONTEXT_DATA_TTL,
+            spill=persistence,
+        )
+    elif CONTEXT_DATA_MAX_ENTRIES:
+        install_context_stores(
+            app, CONTEXT_DATA_MAX_ENTRIES, CONTEXT_DATA_TTL, CONTEXT_DATA_SPILL_FILE
+        )
+    attach_log_context(app)
+    if UPDATE_DEDUP_WINDOW:
+        attach_deduplicator(app, UPDATE_DEDUP_WINDOW)
+    register_dispatch_table(app)
     app.post_init = make_set_commands()
+    attach_catch_up(app)
+    if HOT_RELOAD:
+        attach_reloader(app, register_dispatch_table)
     app.add_error_handler(handle_error)
+    attach_error_digest(app)
+    register_app_metrics(app, scheduler)
+    if metrics_port:
+        attach_metrics_server(app, metrics_port)
+    if record_file:
+        attach_recorder(app, record_file)
     return app
 
 
@@ -42,11 +272,20 @@ def start_webhook(app: Application) -> None:
         listen=WEBHOOK_LISTEN,
         port=WEBHOOK_PORT,
         webhook_url=WEBHOOK_URL,
+        secret_token=WEBHOOK_SECRET_TOKEN,
+        allowed_updates=resolve_allowed_updates(app),
+        # The supervisor may run a new application on the same loop
+        close_loop=False,
     )
 
 
 def run_webhook() -> None:
     """Build the bot application and run it in webhook mode."""
+    if WEBHOOK_SERVER == "aiohttp":
+        from src.core.webhook_server import run_aiohttp_webhook
+
+        run_aiohttp_webhook(create_application)
+        return
     app = create_application()
     start_webhook(app)
 
@@ -54,7 +293,8 @@ def run_webhook() -> None:
 def start_polling(app: Application) -> None:
     """Start the bot using Application.run_polling."""
     logger.info("🚀 Launching polling mode")
-    app.run_polling()
+    # The supervisor may run a new application on the same loop
+    app.run_polling(allowed_updates=resolve_allowed_updates(app), close_loop=False)
 
 
 def run_polling() -> None:
@@ -63,16 +303,26 @@ def run_polling() -> None:
     start_polling(app)
 
 
-def run_telegram_bot(mode: str = RUN_MODE) -> None:
-    """Entry point to run the bot in polling or webhook mode."""
+def run_mode(mode: str, workers: int) -> None:
+    """Run the bot once in polling or webhook mode."""
+    if mode == "polling":
+        run_polling()
+    elif workers > 1:
+        # Imported lazily: the worker module re-imports this one in workers
+        from src.core.workers import run_multiprocess_webhook
+
+        run_multiprocess_webhook(workers)
+    else:
+        run_webhook()
+
+
+def run_telegram_bot(mode: str = RUN_MODE, workers: int = WEBHOOK_WORKERS) -> None:
+    """Entry point to run the bot in polling or webhook mode, restarting on failure."""
     try:
-        if mode == "polling":
-            run_polling()
-        else:
-            run_webhook()
-    except (OSError, RuntimeError) as e:
-        logger.exception("🚨 Bot failed to start: %s", e)
-        import time
-
-        logger.info("⏳ Waiting 5 seconds before exit to avoid restart loop...")
-        time.sleep(5)
+        supervise(partial(run_mode, mode, workers))
+    except RETRYABLE_ERRORS:
+        # Already logged by the supervisor; a non-zero exit lets systemd take over
+        sys.exit(1)
+    finally:
+        # Flush queued log records before the process exits
+        shutdown_logging()
@@ -0,0 +1,111 @@
+"""In-process supervisor restarting the bot with jittered exponential backoff.
+
+:func:`supervise` runs the bot until it stops normally. When it fails with a
+retryable error (network errors, ``OSError`` such as a port in use,
+``RuntimeError``), it starts it again after a delay that doubles with every
+consecutive failure up to ``SUPERVISOR_BACKOFF_MAX``. Half of each delay is
+random ("equal jitter"), so several instances never retry in lockstep. A run
+that lasted ``SUPERVISOR_HEALTHY_AFTER`` seconds resets the delay. After
+``SUPERVISOR_MAX_RESTARTS`` consecutive failures (0 retries forever) the last
+error is re-raised.
+
+After a restart the backlog that piled up meanwhile is caught up according to
+``CATCHUP_POLICY`` (see :mod:`src.core.catchup`).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING
+
+from telegram.error import NetworkError
+
+from src.config import (
+    SUPERVISOR_BACKOFF_INITIAL,
+    SUPERVISOR_BACKOFF_MAX,
+    SUPERVISOR_HEALTHY_AFTER,
+    SUPERVISOR_MAX_RESTARTS,
+)
+from src.utils.logger import logger
+from src.utils.metrics import METRICS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Errors after which a restart may help; anything else (e.g. InvalidToken) is fatal
+RETRYABLE_ERRORS = (NetworkError, OSError, RuntimeError)
+
+SUPERVISOR_RESTARTS = METRICS.counter(
+    "bot_supervisor_restarts_total",
+    "Restarts of the bot after a retryable failure.",
+)
+
+
+class Backoff:
+    """Exponential backoff with equal jitter."""
+
+    __slots__ = ("attempt", "initial", "maximum", "_random")
+
+    def __init__(
+        self,
+        initial: float = SUPERVISOR_BACKOFF_INITIAL,
+        maximum: float = SUPERVISOR_BACKOFF_MAX,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Start at ``initial`` seconds and never exceed ``maximum``."""
+        self.initial = initial
+        self.maximum = maximum
+        self.attempt = 0
+        self._random = rng
+
+    def next_delay(self) -> float:
+        """Return the delay before the next attempt and double the base."""
+        base = min(self.maximum, self.initial * 2**self.attempt)
+        if base < self.maximum:
+            self.attempt += 1
+        return base / 2 + base / 2 * self._random()
+
+    def reset(self) -> None:
+        """Start over from the initial delay."""
+        self.attempt = 0
+
+
+def supervise(
+    run: Callable[[], None],
+    *,
+    backoff: Backoff | None = None,
+    max_restarts: int = SUPERVISOR_MAX_RESTARTS,
+    healthy_after: float = SUPERVISOR_HEALTHY_AFTER,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> None:
+    """Call ``run`` until it returns, restarting it after retryable errors."""
+    backoff = backoff or Backoff()
+    failures = 0
+    while True:
+        started = clock()
+        try:
+            run()
+        except RETRYABLE_ERRORS as exc:
+            if clock() - started >= healthy_after:
+                backoff.reset()
+                failures = 0
+            failures += 1
+            if max_restarts and failures > max_restarts:
+                logger.critical(
+                    "🛑 Giving up after %s failed starts: %s", failures, exc
+                )
+                raise
+            delay = backoff.next_delay()
+            logger.exception(
+                "🚨 Bot stopped: %s; restarting in %.1fs (failure %s)",
+                exc,
+                delay,
+                failures,
+            )
+            SUPERVISOR_RESTARTS.inc()
+            # Nothing else runs between attempts, so blocking here is fine
+            sleep(delay)
+        else:
+            return
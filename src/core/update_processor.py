@@ -0,0 +1,141 @@
+"""Chat-sharded update processor for the Telegram bot.
+
+Plugs into python-telegram-bot as a :class:`~telegram.ext.BaseUpdateProcessor`.
+Each update is hashed by its chat id (falling back to the user id) onto one of
+``lanes`` asyncio worker lanes. A lane processes its updates strictly in order,
+so a conversation never sees its messages handled out of sequence, while
+different chats run in parallel and one slow handler only delays its own lane.
+
+:class:`SequentialUpdateProcessor` keeps PTB's default of one update at a
+time. Both processors clear the update logging context (see
+:mod:`src.core.log_context`) once an update has been handled, so records logged
+afterwards in the same task are not tagged with it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, Any
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor, SimpleUpdateProcessor
+
+from src.utils.logger import UPDATE_CONTEXT
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+
+async def _process_in_update_context(coroutine: Awaitable[Any]) -> None:
+    """Await ``coroutine``, then drop the update context it set."""
+    token = UPDATE_CONTEXT.set(None)
+    try:
+        await coroutine
+    finally:
+        UPDATE_CONTEXT.reset(token)
+
+
+class SequentialUpdateProcessor(SimpleUpdateProcessor):
+    """Process one update at a time, like PTB's default processor."""
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """Allow a single update in flight, so the fetcher awaits each one."""
+        super().__init__(max_concurrent_updates=1)
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        """Handle the update in the fetcher task, then clear its log context."""
+        await _process_in_update_context(coroutine)
+
+
+class ChatShardedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates on per-chat ordered lanes that run concurrently."""
+
+    __slots__ = ("_lane_count", "_lanes", "_queue_size", "_workers")
+
+    def __init__(self, lanes: int, queue_size: int = 100) -> None:
+        """Configure the number of lanes and the bound of each lane's queue."""
+        if lanes < 1 or queue_size < 1:
+            error_msg = "Lane count and lane queue size must be positive integers"
+            raise ValueError(error_msg)
+        # Updates waiting in a lane still hold a processing slot, so allow
+        # every lane to be full while another update is admitted
+        super().__init__(max_concurrent_updates=lanes * (queue_size + 1))
+        self._lane_count = lanes
+        self._queue_size = queue_size
+        self._lanes: list[asyncio.Queue] = []
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def lane_count(self) -> int:
+        """Number of ordered lanes."""
+        return self._lane_count
+
+    @property
+    def queue_depths(self) -> list[int]:
+        """Number of updates waiting in each lane."""
+        return [lane.qsize() for lane in self._lanes]
+
+    def lane_for(self, update: object) -> int:
+        """Return the lane index an update is routed to."""
+        if isinstance(update, Update):
+            chat = update.effective_chat
+            if chat is not None:
+                return chat.id % self._lane_count
+            user = update.effective_user
+            if user is not None:
+                return user.id % self._lane_count
+            return update.update_id % self._lane_count
+        return 0
+
+    async def initialize(self) -> None:
+        """Start one worker task per lane."""
+        if self._workers:
+            return
+        self._lanes = [
+            asyncio.Queue(maxsize=self._queue_size) for _ in range(self._lane_count)
+        ]
+        self._workers = [
+            asyncio.create_task(self._drain(lane), name=f"UpdateLane:{index}")
+            for index, lane in enumerate(self._lanes)
+        ]
+
+    async def shutdown(self) -> None:
+        """Let queued updates finish, then stop the lane workers."""
+        for lane in self._lanes:
+            await lane.join()
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        self._workers = []
+        self._lanes = []
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        """Queue the update on its lane and wait until it has been handled."""
+        future = asyncio.get_running_loop().create_future()
+        await self._lanes[self.lane_for(update)].put((coroutine, future))
+        await future
+
+    @staticmethod
+    async def _drain(lane: asyncio.Queue) -> None:
+        """Run the queued coroutines of one lane, one at a time."""
+        while True:
+            coroutine, future = await lane.get()
+            try:
+                await _process_in_update_context(coroutine)
+            except Exception as exc:  # noqa: BLE001
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(None)
+            finally:
+                lane.task_done()
@@ -0,0 +1,183 @@
+"""Lean aiohttp webhook server for the Telegram bot.
+
+An alternative to PTB's built-in tornado webhook server with explicit control
+over the request path:
+
+- the ``X-Telegram-Bot-Api-Secret-Token`` header is checked before the body is
+  read, so forged requests cost almost nothing;
+- request bodies are capped at ``WEBHOOK_MAX_BODY`` bytes;
+- JSON is decoded with ``orjson`` or ``ujson`` when installed;
+- updates are pushed into a bounded queue, and a full queue answers ``503`` so
+  Telegram retries later instead of the process buffering without limit.
+
+The same request handling backs the multi-process ingress in
+:mod:`src.core.workers`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hmac
+import json
+import signal
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from aiohttp import web
+from telegram import Update
+
+from src.config import (
+    WEBHOOK_LISTEN,
+    WEBHOOK_MAX_BODY,
+    WEBHOOK_PORT,
+    WEBHOOK_QUEUE_SIZE,
+    WEBHOOK_SECRET_TOKEN,
+    WEBHOOK_URL,
+)
+from src.core.allowed_updates import resolve_allowed_updates
+from src.core.catchup import create_update_queue
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from telegram import Bot
+    from telegram.ext import Application
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+try:
+    import orjson
+
+    json_loads: Callable[[bytes], Any] = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import ujson
+
+        json_loads = ujson.loads
+        JSON_BACKEND = "ujson"
+    except ImportError:
+        json_loads = json.loads
+        JSON_BACKEND = "json"
+
+
+def webhook_path() -> str:
+    """Return the local path Telegram's POSTs arrive on, taken from WEBHOOK_URL."""
+    return urlparse(WEBHOOK_URL or "").path or "/"
+
+
+def create_webhook_app(
+    submit: Callable[[dict[str, Any], bytes], bool],
+    path: str = "/",
+    secret_token: str | None = WEBHOOK_SECRET_TOKEN,
+    max_body: int = WEBHOOK_MAX_BODY,
+) -> web.Application:
+    """Build an aiohttp app that validates, decodes and submits webhook updates.
+
+    ``submit`` receives the decoded update and the raw body and returns False
+    when it cannot accept more work, which is answered with ``503``. It raises
+    ``ValueError`` for JSON that is not a valid update, answered with ``400``.
+    """
+    expected_token = (secret_token or "").encode()
+
+    async def receive_update(request: web.Request) -> web.Response:
+        if expected_token:
+            received = request.headers.get(SECRET_HEADER, "").encode()
+            if not hmac.compare_digest(received, expected_token):
+                return web.Response(status=403)
+        if request.content_length is not None and request.content_length > max_body:
+            return web.Response(status=413)
+
+        payload = await request.read()
+        try:
+            data = json_loads(payload)
+        except ValueError:
+            return web.Response(status=400)
+        if not isinstance(data, dict):
+            return web.Response(status=400)
+        try:
+            accepted = submit(data, payload)
+        except ValueError:
+            return web.Response(status=400)
+        if not accepted:
+            # Telegram retries later instead of us buffering without bound
+            return web.Response(status=503, headers={"Retry-After": "1"})
+        return web.Response()
+
+    app = web.Application(client_max_size=max_body)
+    app.router.add_post(path, receive_update)
+    return app
+
+
+def decode_update(data: dict[str, Any], bot: Bot) -> Update:
+    """Build an ``Update`` from decoded JSON; ``ValueError`` if it is not one."""
+    try:
+        return Update.de_json(data, bot)
+    except (AttributeError, KeyError, TypeError) as exc:
+        # PTB fails with whatever the missing or mistyped field triggers
+        error_msg = f"Invalid update: {exc!r}"
+        raise ValueError(error_msg) from exc
+
+
+def queue_submitter(
+    application: Application,
+) -> Callable[[dict[str, Any], bytes], bool]:
+    """Return a ``submit`` callable that feeds the application's update queue."""
+    update_queue: asyncio.Queue = application.update_queue
+    bot = application.bot
+
+    def submit(data: dict[str, Any], _payload: bytes) -> bool:
+        if update_queue.full():
+            return False
+        update_queue.put_nowait(decode_update(data, bot))
+        return True
+
+    return submit
+
+
+async def serve_webhook(application: Application) -> None:
+    """Run ``application`` behind the aiohttp webhook server until signalled."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    async with application:
+        await application.start()
+        if application.post_init:
+            await application.post_init(application)
+        await application.bot.set_webhook(
+            WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET_TOKEN,
+            allowed_updates=resolve_allowed_updates(application),
+        )
+
+        runner = web.AppRunner(
+            create_webhook_app(queue_submitter(application), webhook_path()),
+            access_log=None,
+        )
+        await runner.setup()
+        site = web.TCPSite(runner, WEBHOOK_LISTEN, WEBHOOK_PORT)
+        await site.start()
+        logger.info("📨 aiohttp webhook server ready (JSON: %s)", JSON_BACKEND)
+        try:
+            await stop.wait()
+        finally:
+            await runner.cleanup()
+            await application.stop()
+    if application.post_shutdown:
+        await application.post_shutdown(application)
+
+
+def run_aiohttp_webhook(application_factory: Callable[..., Application]) -> None:
+    """Build the application with a bounded update queue and serve it."""
+    logger.info("🚀 Launching aiohttp webhook server")
+    logger.info("🌍 Listening on: http://%s:%s", WEBHOOK_LISTEN, WEBHOOK_PORT)
+    logger.info("🔗 Webhook URL: %s", WEBHOOK_URL)
+    application = application_factory(
+        update_queue=create_update_queue(WEBHOOK_QUEUE_SIZE)
+    )
+    asyncio.run(serve_webhook(application))
@@ -0,0 +1,347 @@
+"""Multi-process webhook mode for the Telegram bot.
+
+A single aiohttp ingress process accepts Telegram's webhook POSTs and forwards
+each raw update to one of ``N`` worker processes. The worker is chosen by a
+stable hash of the update's chat id (falling back to the user id), so all
+updates of a chat are handled by the same worker, in order. Each worker runs a
+full :class:`~telegram.ext.Application` without an updater and feeds the
+received updates into its update queue, which spreads decoding, handler
+execution and reply serialization across CPU cores.
+
+Workers are restarted gracefully: a stop sentinel is queued behind the pending
+updates, the old process drains them and exits, and only then does a new
+process start consuming the same queue. Crashed workers are revived the same
+way by the ingress' monitor task. ``SIGHUP`` to the ingress restarts the
+workers one by one (:meth:`WorkerPool.rolling_restart`), so new handler code
+and configuration are picked up while the other workers keep serving.
+
+The ingress also drops redelivered updates (see :mod:`src.core.dedup`) before
+routing them, so one window of update ids covers every worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing
+import queue
+import signal
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from src.config import (
+    METRICS_LISTEN,
+    METRICS_PORT,
+    UPDATE_DEDUP_WINDOW,
+    UPDATE_RECORD_FILE,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET_TOKEN,
+    WEBHOOK_URL,
+    WORKER_QUEUE_SIZE,
+)
+from src.core.dedup import DUPLICATE_UPDATES, UpdateIdWindow
+from src.core.recorder import UpdateRecorder
+from src.core.webhook_server import (
+    create_webhook_app,
+    decode_update,
+    json_loads,
+    webhook_path,
+)
+from src.utils.logger import logger, setup_logging
+from src.utils.metrics import start_metrics_server
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from multiprocessing.context import SpawnProcess
+
+# How often the ingress checks for crashed workers, in seconds
+MONITOR_INTERVAL = 1.0
+# How long a worker may take to drain its queue on a graceful stop, in seconds
+WORKER_STOP_TIMEOUT = 30.0
+
+
+def _object_id(value: object) -> int | None:
+    """Return the integer ``id`` of a raw chat or user object, if it has one."""
+    object_id = value.get("id") if isinstance(value, dict) else None
+    return object_id if isinstance(object_id, int) else None
+
+
+def extract_chat_id(data: dict[str, Any]) -> int | None:
+    """Return the chat id (or user id) of a raw update, if it has one.
+
+    Only the routing key is read here; fields of the wrong type are ignored and
+    left to the worker, which drops updates PTB cannot decode.
+    """
+    for key, value in data.items():
+        if key == "update_id" or not isinstance(value, dict):
+            continue
+        message = value.get("message")
+        chat = value.get("chat") or (
+            message.get("chat") if isinstance(message, dict) else None
+        )
+        if chat:
+            return _object_id(chat)
+        user = value.get("from") or value.get("user")
+        if user:
+            return _object_id(user)
+    return None
+
+
+def run_worker(index: int, updates: multiprocessing.Queue, workers: int = 1) -> None:
+    """Process entry point: serve updates from ``updates`` until a stop sentinel."""
+    setup_logging()
+    asyncio.run(_serve_worker(index, updates, workers))
+
+
+async def _serve_worker(
+    index: int, updates: multiprocessing.Queue, workers: int = 1
+) -> None:
+    """Run an Application and feed it the updates routed to this worker.
+
+    The ``workers`` processes split the global outbound send limit.
+    """
+    # Imported here so the ingress process never loads the handlers
+    from src.core.allowed_updates import resolve_allowed_updates
+    from src.core.runner import create_application
+
+    # The ingress records updates; metrics get a per-worker port below. The
+    # startup backlog is global, so workers do not try to pace their share of it
+    app = create_application(
+        metrics_port=0, record_file=None, catch_up="none", processes=workers
+    )
+    metrics_runner = None
+    async with app:
+        await app.start()
+        # Only one worker publishes the command list and registers the webhook,
+        # since only workers load the handlers allowed_updates is derived from
+        if index == 0:
+            if app.post_init:
+                await app.post_init(app)
+            await app.bot.set_webhook(
+                WEBHOOK_URL,
+                secret_token=WEBHOOK_SECRET_TOKEN,
+                allowed_updates=resolve_allowed_updates(app),
+            )
+        if METRICS_PORT:
+            # Every worker has its own registry, served on consecutive ports
+            metrics_runner = await start_metrics_server(
+                METRICS_LISTEN, METRICS_PORT + index
+            )
+        logger.info("👷 Worker %s ready", index)
+        loop = asyncio.get_running_loop()
+        while True:
+            payload = await loop.run_in_executor(None, updates.get)
+            if payload is None:
+                break
+            try:
+                update = decode_update(json_loads(payload), app.bot)
+            except ValueError:
+                # Dropping it keeps the worker, and the updates it holds, alive
+                logger.exception("👷 Worker %s dropped an invalid update", index)
+                continue
+            await app.update_queue.put(update)
+        # Lets the update fetcher finish everything queued before stopping
+        await app.stop()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+    logger.info("👷 Worker %s stopped", index)
+
+
+class WorkerPool:
+    """Fixed set of worker processes, each with its own bounded update queue."""
+
+    def __init__(
+        self,
+        size: int,
+        target: Callable[..., None] = run_worker,
+        target_args: tuple[Any, ...] = (),
+        queue_size: int = WORKER_QUEUE_SIZE,
+    ) -> None:
+        """Prepare ``size`` workers; processes start with :meth:`start`."""
+        if size < 1:
+            error_msg = "Worker pool size must be a positive integer"
+            raise ValueError(error_msg)
+        self._context = multiprocessing.get_context("spawn")
+        self._target = target
+        self._target_args = target_args
+        self.queues: list[multiprocessing.Queue] = [
+            self._context.Queue(maxsize=queue_size) for _ in range(size)
+        ]
+        self.processes: list[SpawnProcess | None] = [None] * size
+        self.restarts = 0
+        # Workers being restarted on purpose, which the monitor must not revive
+        self._restarting: set[int] = set()
+
+    @property
+    def size(self) -> int:
+        """Number of workers."""
+        return len(self.queues)
+
+    def route(self, data: dict[str, Any]) -> int:
+        """Return the worker index for a raw update."""
+        key = extract_chat_id(data)
+        if key is None:
+            key = data.get("update_id", 0)
+        return key % self.size
+
+    def submit(self, index: int, payload: bytes) -> bool:
+        """Queue a raw update for worker ``index``; False when its queue is full."""
+        try:
+            self.queues[index].put_nowait(payload)
+        except queue.Full:
+            return False
+        return True
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=self._target,
+            args=(index, self.queues[index], *self._target_args),
+            name=f"bot-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[index] = process
+
+    def start(self) -> None:
+        """Start every worker process."""
+        for index in range(self.size):
+            self._spawn(index)
+
+    def _stop_worker(self, index: int) -> None:
+        """Queue a stop sentinel behind pending updates and wait for the worker."""
+        process = self.processes[index]
+        if process is None:
+            return
+        if process.is_alive():
+            self.queues[index].put(None)
+            process.join(WORKER_STOP_TIMEOUT)
+            if process.is_alive():
+                logger.warning("Worker %s did not stop in time; terminating", index)
+                process.terminate()
+                process.join()
+        self.processes[index] = None
+
+    def restart(self, index: int) -> None:
+        """Restart one worker after it has drained its pending updates."""
+        self._restarting.add(index)
+        try:
+            self._stop_worker(index)
+            self._spawn(index)
+        finally:
+            self._restarting.discard(index)
+        self.restarts += 1
+        logger.info("🔁 Worker %s restarted", index)
+
+    def rolling_restart(self) -> None:
+        """Restart the workers one at a time; updates queue up meanwhile."""
+        for index in range(self.size):
+            self.restart(index)
+
+    def revive_dead(self) -> list[int]:
+        """Restart workers whose process exited unexpectedly."""
+        revived = []
+        for index, process in enumerate(self.processes):
+            if index in self._restarting:
+                continue
+            if process is not None and not process.is_alive():
+                logger.error("Worker %s exited with code %s", index, process.exitcode)
+                self._spawn(index)
+                self.restarts += 1
+                revived.append(index)
+        return revived
+
+    def stop(self) -> None:
+        """Stop all workers gracefully."""
+        for index in range(self.size):
+            self._stop_worker(index)
+
+
+def create_ingress(
+    pool: WorkerPool,
+    path: str = "/",
+    secret_token: str | None = WEBHOOK_SECRET_TOKEN,
+    recorder: UpdateRecorder | None = None,
+    window: UpdateIdWindow | None = None,
+) -> web.Application:
+    """Build the aiohttp application that routes webhook POSTs to workers.
+
+    With ``window`` updates whose id was already routed are acknowledged
+    without being forwarded.
+    """
+    duplicates = DUPLICATE_UPDATES.labels("ingress")
+
+    def submit(data: dict[str, Any], payload: bytes) -> bool:
+        update_id = data.get("update_id")
+        if not isinstance(update_id, int):
+            error_msg = f"Invalid update_id: {update_id!r}"
+            raise ValueError(error_msg)
+        if window is not None:
+            if update_id in window:
+                duplicates.inc()
+                return True
+            if not pool.submit(pool.route(data), payload):
+                return False
+            # Only accepted updates count as seen: a 503 is retried
+            window.add(update_id)
+        elif not pool.submit(pool.route(data), payload):
+            return False
+        if recorder is not None:
+            recorder.record(data)
+        return True
+
+    async def monitor() -> None:
+        while True:
+            await asyncio.sleep(MONITOR_INTERVAL)
+            pool.revive_dead()
+
+    restart: asyncio.Future | None = None
+
+    def on_sighup() -> None:
+        nonlocal restart
+        if restart is None or restart.done():
+            logger.info("🔁 SIGHUP: restarting %s workers one by one", pool.size)
+            loop = asyncio.get_running_loop()
+            restart = loop.run_in_executor(None, pool.rolling_restart)
+
+    async def monitor_workers(_app: web.Application) -> AsyncIterator[None]:
+        task = asyncio.create_task(monitor())
+        loop = asyncio.get_running_loop()
+        # Windows has no SIGHUP
+        with contextlib.suppress(AttributeError, NotImplementedError):
+            loop.add_signal_handler(signal.SIGHUP, on_sighup)
+        yield
+        with contextlib.suppress(AttributeError, NotImplementedError):
+            loop.remove_signal_handler(signal.SIGHUP)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    ingress = create_webhook_app(submit, path, secret_token)
+    ingress.cleanup_ctx.append(monitor_workers)
+    return ingress
+
+
+def run_multiprocess_webhook(workers: int) -> None:
+    """Run the webhook ingress with ``workers`` worker processes."""
+    logger.info("🚀 Launching webhook ingress with %s workers", workers)
+    logger.info("🌍 Listening on: http://%s:%s", WEBHOOK_LISTEN, WEBHOOK_PORT)
+    logger.info("🔗 Webhook URL: %s", WEBHOOK_URL)
+
+    pool = WorkerPool(workers, target_args=(workers,))
+    recorder = UpdateRecorder(UPDATE_RECORD_FILE) if UPDATE_RECORD_FILE else None
+    window = UpdateIdWindow(UPDATE_DEDUP_WINDOW) if UPDATE_DEDUP_WINDOW else None
+    pool.start()
+    try:
+        web.run_app(
+            create_ingress(pool, webhook_path(), recorder=recorder, window=window),
+            host=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            print=None,
+            access_log=None,
+        )
+    finally:
+        pool.stop()
+        if recorder is not None:
+            recorder.close()
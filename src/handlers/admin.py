@@ -3,6 +3,7 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from src.core.reload import ReloadReport, reloader_for
 from src.utils.commands import command
 from src.utils.decorators import admin_required
 
@@ -15,3 +16,30 @@ async def secret_command(update: Update, _context: ContextTypes.DEFAULT_TYPE) ->
     """Respond with a secret message for admins."""
     if update.message:
         await update.message.reply_text("🤫 This is a secret admin command.")
+
+
+def reload_reply(report: ReloadReport | None) -> str:
+    """Describe the outcome of a reload for the admin."""
+    if report is None:
+        return "❌ Reload failed; the running handlers were kept. See the logs."
+    modules = ", ".join(name.rpartition(".")[2] for name in report.modules)
+    return (
+        "🔁 Reloaded.\n"
+        f"Modules: {modules or 'unchanged'}\n"
+        f"Settings: {', '.join(report.settings) or 'unchanged'}\n"
+        f"Command list: {'republished' if report.commands_changed else 'unchanged'}"
+    )
+
+
+# Re-reads .env and re-imports changed handler modules without a restart
+@command("Reload handlers and configuration", admin_only=True)
+@admin_required
+async def reload_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Hot reload the handler modules and configuration of this process."""
+    reloader = reloader_for(context.application)
+    if reloader is None:
+        text = "Hot reload is disabled (HOT_RELOAD=false)."
+    else:
+        text = reload_reply(await reloader.reload())
+    if update.message:
+        await update.message.reply_text(text)
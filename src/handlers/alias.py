@@ -6,9 +6,13 @@ and responds with confirmation of invocation.
 
 from telegram import Update
 from telegram.ext import ContextTypes
-from telegram.helpers import escape_markdown
 
 from src.utils.commands import command
+from src.utils.markdown import MarkdownTemplate
+
+ALIAS_TEXT = MarkdownTemplate(
+    "You triggered the /alias command (or its alias /a)."
+).render()
 
 
 # Marks this function as a visible command with a description used in /help listing
@@ -17,9 +21,5 @@ async def alias_command(
     update: Update, _context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Reply confirming that the alias command (or its alias) was triggered."""
-    text = escape_markdown(
-        "You triggered the /alias command (or its alias /a).", version=2
-    )
-
     if update.message:
-        await update.message.reply_text(text, parse_mode="MarkdownV2")
+        await update.message.reply_text(ALIAS_TEXT, parse_mode="MarkdownV2")
@@ -1,32 +1,111 @@
 """Fallback handler for unknown commands.
 
-Logs unrecognized slash commands and provides a user-friendly response
-prompting them to use /help. Ensures the bot gracefully handles invalid input.
+Replies to unrecognized slash commands with the closest registered commands
+(see :mod:`src.utils.suggest`) and a hint to use /help. Ensures the bot
+gracefully handles invalid input.
+
+Misses are not logged one by one: :class:`UnknownCommandCounter` aggregates
+them and logs the most frequent names once per ``REPORT_INTERVAL``.
 """
 
 import logging
+import time
+from collections import Counter
+from collections.abc import Callable
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from src.utils import commands
 from src.utils.commands import command
+from src.utils.metrics import METRICS
+from src.utils.suggest import suggest_commands
 
 logger = logging.getLogger("bot_bot")
 
+# Seconds between summaries of unknown commands
+REPORT_INTERVAL = 60.0
+# Distinct names counted per interval; the rest are counted as "other"
+MAX_TRACKED_NAMES = 1000
+# Names listed in a summary
+REPORT_TOP = 10
+
+UNKNOWN_COMMANDS_TOTAL = METRICS.counter(
+    "bot_unknown_commands_total",
+    "Unknown commands received, by whether a suggestion was offered.",
+    ("outcome",),
+)
+_SUGGESTED = UNKNOWN_COMMANDS_TOTAL.labels("suggested")
+_NO_SUGGESTION = UNKNOWN_COMMANDS_TOTAL.labels("no_suggestion")
+
+
+class UnknownCommandCounter:
+    """Count unknown command names and log them periodically."""
+
+    def __init__(
+        self,
+        interval: float = REPORT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Log a summary at most once per ``interval`` seconds."""
+        self.interval = interval
+        self._clock = clock
+        self._counts: Counter[str] = Counter()
+        self._started = clock()
+
+    def add(self, name: str) -> None:
+        """Count one miss of ``name``, logging the summary when it is due."""
+        if name in self._counts or len(self._counts) < MAX_TRACKED_NAMES:
+            self._counts[name] += 1
+        else:
+            self._counts["(other)"] += 1
+        if self._clock() - self._started >= self.interval:
+            self.report()
+
+    def report(self) -> None:
+        """Log the most frequent names since the last summary and reset."""
+        now = self._clock()
+        if self._counts:
+            top = ", ".join(
+                f"/{name}×{count}"
+                for name, count in self._counts.most_common(REPORT_TOP)
+            )
+            logger.warning(
+                "❓ %s unknown commands in the last %.0fs: %s",
+                self._counts.total(),
+                now - self._started,
+                top,
+            )
+            self._counts.clear()
+        self._started = now
+
+
+UNKNOWN_COMMANDS = UnknownCommandCounter()
+
+
+def unknown_reply(name: str) -> str:
+    """Return the hint for ``name``, suggesting the closest commands."""
+    suggestions = suggest_commands(name, commands.COMMAND_REGISTRY)
+    if not suggestions:
+        _NO_SUGGESTION.inc()
+        return "Unknown command. Type /help to see the available commands."
+    _SUGGESTED.inc()
+    options = " or ".join(f"/{suggestion}" for suggestion in suggestions)
+    return f"Unknown command. Did you mean {options}?\nType /help to see all commands."
+
 
 # Registers this as a hidden command using the @command decorator.
 # Hidden commands are not shown in the /help listing.
 @command(hidden=True)
 
-# Handles any unknown slash commands like /wrong, logs them, and replies with a hint.
+# Handles any unknown slash commands like /wrong, counts them, and replies with a hint.
 async def unknown_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
-    """Handle unknown slash commands and guide user to /help."""
+    """Handle unknown slash commands and suggest the closest known ones."""
     # Reference context to avoid unused argument warning
     _ = context
     if update.message and update.message.text.startswith("/"):
-        logger.warning("Unknown command received: %s", update.message.text)
-        await update.message.reply_text(
-            "Unknown command. Type /help to see the available commands."
-        )
+        name = update.message.text.split(maxsplit=1)[0][1:].partition("@")[0].lower()
+        UNKNOWN_COMMANDS.add(name)
+        await update.message.reply_text(unknown_reply(name))
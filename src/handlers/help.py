@@ -1,23 +1,37 @@
 """Handler for the /help command.
 
 Dynamically generates a list of all available bot commands, excluding hidden ones,
-and responds with a MarkdownV2-formatted message. Supports optional caching and
-respects DEBUG mode to ensure fresh command list during development.
+and responds with a MarkdownV2-formatted message. Command names and
+descriptions are escaped through templates, so a ``.`` or ``-`` in a
+description no longer breaks the message. The full message is cached in the
+command registry and only rebuilt when a command is registered.
 """
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from src.utils.commands import command, get_commands_descriptions
+from src.utils import commands
+from src.utils.commands import command
+from src.utils.markdown import MarkdownTemplate
+
+HELP_HEADER = MarkdownTemplate("Use these commands to control me:\n\n").render()
+HELP_LINE = MarkdownTemplate("/{name} — {description}")
+
+
+def build_help_text() -> str:
+    """Build the /help message from the visible command descriptions."""
+    return HELP_HEADER + "\n".join(
+        HELP_LINE.render(name=meta.name, description=meta.description)
+        for meta in commands.COMMAND_REGISTRY.visible
+    )
 
 
 # Marks this function as a visible command with a description used in /help listing
 @command("Show available commands")
 async def help_command(update: Update, _context: ContextTypes.DEFAULT_TYPE) -> None:
     """Reply with a list of available commands."""
-    text = "Use these commands to control me:\n\n"
-    # Fetches all registered command descriptions, excluding hidden ones
-    text += get_commands_descriptions()
+    # Served from the registry cache; rebuilt only after new registrations
+    text = commands.COMMAND_REGISTRY.view("help_message", build_help_text)
 
     if update.message:
         await update.message.reply_text(text, parse_mode="MarkdownV2")
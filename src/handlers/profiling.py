@@ -0,0 +1,209 @@
+"""Admin commands for profiling the live bot.
+
+``/profile start [30s|500u]`` enables cProfile for a number of seconds or
+updates (60 seconds by default), ``/profile stop`` ends the session early and
+``/profile dump`` sends the raw statistics as a ``.prof`` file. ``/tracemalloc
+snapshot|diff|stop`` traces allocations and reports the top allocation sites.
+Summaries come back as a MarkdownV2 code block, or as a document when too long.
+Nothing is hooked into update processing while profiling is off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from telegram import InputFile, Update
+from telegram.constants import MessageLimit
+from telegram.ext import ContextTypes, TypeHandler
+
+from src.utils.commands import command
+from src.utils.decorators import admin_required
+from src.utils.markdown import escape_markdown
+from src.utils.profiling import ALLOCATIONS, CPU_PROFILER
+
+if TYPE_CHECKING:
+    from telegram import Bot
+    from telegram.ext import Application
+
+DEFAULT_PROFILE_SECONDS = 60
+# Runs before every regular handler group while an update limit is set
+PROFILE_HANDLER_GROUP = -100
+
+PROFILE_USAGE = "Usage: /profile start [30s|500u] | stop | dump"
+TRACEMALLOC_USAGE = "Usage: /tracemalloc snapshot | diff | stop"
+
+
+@dataclass
+class _ProfileRun:
+    """Bookkeeping for the running profiling session."""
+
+    application: Application
+    chat_id: int
+    remaining_updates: int | None = None
+    timer: asyncio.TimerHandle | None = None
+    counter: TypeHandler | None = None
+    # Task finishing a time-limited session; the loop keeps only weak references
+    task: asyncio.Task | None = None
+
+
+_run: _ProfileRun | None = None
+
+
+async def send_report(bot: Bot, chat_id: int, text: str, filename: str) -> None:
+    """Send ``text`` as a code block, or as a document if it is too long."""
+    message = f"```\n{escape_markdown(text, version=2, entity_type='pre')}\n```"
+    if len(message) <= MessageLimit.MAX_TEXT_LENGTH:
+        await bot.send_message(chat_id, message, parse_mode="MarkdownV2")
+    else:
+        await bot.send_document(chat_id, InputFile(text.encode(), filename=filename))
+
+
+def parse_limit(arg: str | None) -> tuple[float | None, int | None]:
+    """Parse ``30s`` / ``500u`` into (seconds, updates); bare numbers are seconds.
+
+    Raises ``ValueError`` for malformed, zero, negative or infinite limits.
+    """
+    if not arg:
+        return DEFAULT_PROFILE_SECONDS, None
+    value = arg.lower()
+    if value.endswith("u"):
+        updates = int(value[:-1])
+        if updates <= 0:
+            error_msg = f"Update limit must be positive: {arg}"
+            raise ValueError(error_msg)
+        return None, updates
+    seconds = float(value.removesuffix("s"))
+    if not 0 < seconds < math.inf:
+        error_msg = f"Time limit must be positive: {arg}"
+        raise ValueError(error_msg)
+    return seconds, None
+
+
+def _set_counters(application: Application, handlers: list[TypeHandler]) -> None:
+    """Install ``handlers`` as the profiling group without mutating live groups.
+
+    ``Application.add_handler`` and ``remove_handler`` insert or delete the group
+    in the dict that ``process_update`` is iterating, for ``/profile start``, for
+    the update ending the session or ``/profile stop`` and for others in
+    flight. A new dict is assigned instead; those updates finish on the old one.
+    """
+    groups = {
+        group: group_handlers
+        for group, group_handlers in application.handlers.items()
+        if group != PROFILE_HANDLER_GROUP
+    }
+    if handlers:
+        groups[PROFILE_HANDLER_GROUP] = handlers
+    application.handlers = dict(sorted(groups.items()))
+
+
+async def _finish() -> None:
+    """Stop the running session, unhook it and report to the admin chat."""
+    global _run  # noqa: PLW0603
+    run, _run = _run, None
+    if run is None:
+        return
+    if run.timer is not None:
+        run.timer.cancel()
+    if run.counter is not None:
+        handlers = run.application.handlers.get(PROFILE_HANDLER_GROUP, [])
+        _set_counters(
+            run.application, [other for other in handlers if other is not run.counter]
+        )
+    CPU_PROFILER.stop()
+    await send_report(
+        run.application.bot, run.chat_id, CPU_PROFILER.summary(), "profile.txt"
+    )
+
+
+async def _count_update(_update: object, _context: object) -> None:
+    """Count an update towards the session's update limit."""
+    if _run is None or _run.remaining_updates is None:
+        return
+    _run.remaining_updates -= 1
+    if _run.remaining_updates <= 0:
+        await _finish()
+
+
+async def _start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> str:
+    """Start a session limited by time or by number of updates."""
+    global _run  # noqa: PLW0603
+    if CPU_PROFILER.active:
+        return "Profiling is already running."
+    arg = context.args[1] if len(context.args) > 1 else None
+    try:
+        seconds, updates = parse_limit(arg)
+    except ValueError:
+        return PROFILE_USAGE
+    run = _ProfileRun(context.application, update.effective_chat.id, updates)
+    if updates is not None:
+        run.counter = TypeHandler(Update, _count_update)
+        handlers = context.application.handlers.get(PROFILE_HANDLER_GROUP, [])
+        _set_counters(context.application, [*handlers, run.counter])
+    else:
+        loop = asyncio.get_running_loop()
+
+        def expire() -> None:
+            run.task = loop.create_task(_finish())
+
+        run.timer = loop.call_later(seconds, expire)
+    _run = run
+    CPU_PROFILER.start()
+    limit = f"{updates} updates" if updates is not None else f"{seconds:g}s"
+    return f"Profiling started for {limit}."
+
+
+# Admin-only: CPU profiling of the running process
+@command("Profile the bot: start [30s|500u], stop, dump", admin_only=True)
+@admin_required
+async def profile_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Start, stop or dump a CPU profiling session."""
+    if not update.message:
+        return
+    action = context.args[0].lower() if context.args else ""
+    if action == "start":
+        await update.message.reply_text(await _start(update, context))
+    elif action == "stop":
+        if not CPU_PROFILER.active:
+            await update.message.reply_text("Profiling is not running.")
+            return
+        await _finish()
+    elif action == "dump":
+        if CPU_PROFILER.last_stats is None:
+            await update.message.reply_text("No profile recorded yet.")
+            return
+        await update.message.reply_document(
+            InputFile(CPU_PROFILER.dump(), filename="bot.prof"),
+            caption="Open with pstats or snakeviz.",
+        )
+    else:
+        await update.message.reply_text(PROFILE_USAGE)
+
+
+# Admin-only: allocation tracking with tracemalloc
+@command("Trace allocations: snapshot, diff, stop", admin_only=True)
+@admin_required
+async def tracemalloc_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Take allocation snapshots and report the top allocation sites."""
+    if not update.message:
+        return
+    action = context.args[0].lower() if context.args else ""
+    chat_id = update.message.chat_id
+    if action == "snapshot":
+        report = ALLOCATIONS.snapshot()
+        await send_report(context.bot, chat_id, report, "tracemalloc.txt")
+    elif action == "diff":
+        report = ALLOCATIONS.diff()
+        await send_report(context.bot, chat_id, report, "tracemalloc_diff.txt")
+    elif action == "stop":
+        ALLOCATIONS.stop()
+        await update.message.reply_text("Allocation tracing stopped.")
+    else:
+        await update.message.reply_text(TRACEMALLOC_USAGE)
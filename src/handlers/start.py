@@ -9,9 +9,19 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from src.utils.commands import command
-from src.utils.markdown import escape_markdown
+from src.utils.logger import SampledLogger
+from src.utils.markdown import MarkdownTemplate
 
-logger = logging.getLogger("bot_bot")
+# /start is a hot path: only a sample of its DEBUG records is kept
+logger = SampledLogger(logging.getLogger("bot_bot"))
+
+# Static text is escaped once here; only the user ID is escaped per call
+START_TEMPLATE = MarkdownTemplate(
+    "Hello! User ID: {user_id}\n\n"
+    "This is a base template for a Telegram bot.\n"
+    "Use this bot as a starting point to build your own functionality.\n\n"
+    "You can see the list of commands by typing /help."
+)
 
 
 # Register the /start command with a description shown in /help
@@ -24,11 +34,5 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     # Get user ID and greet the user with instructions
     user_id = update.effective_user.id if update.effective_user else "unknown"
     # /start command: greet the user
-    text = escape_markdown(
-        f"Hello! User ID: {user_id}\n\n"
-        "This is a base template for a Telegram bot.\n"
-        "Use this bot as a starting point to build your own functionality.\n\n"
-        "You can see the list of commands by typing /help.",
-        version=2,
-    )
+    text = START_TEMPLATE.render(user_id=user_id)
     await update.message.reply_text(text, parse_mode="MarkdownV2")
@@ -4,41 +4,56 @@ This module discovers command handlers by importing every module inside the
 ``handlers`` package. Importing a module executes any ``@command`` decorators
 from :mod:`utils.commands`, which appends metadata to ``COMMAND_REGISTRY``.
 Callback query handlers can still be declared via a ``__callbacks__`` dictionary
-inside each module.
+inside each module. Entries with a ``prefix`` are routed by a single
+:class:`~src.core.callback_router.CallbackRouter`; entries with a regex
+``pattern`` get their own ``CallbackQueryHandler``.
+
+Commands are registered either as one ``CommandHandler`` per command and alias
+(``"handlers"``) or through a single :class:`~src.core.dispatcher.CommandDispatcher`
+backed by a dictionary index (``"indexed"``), selected by ``COMMAND_DISPATCH``.
+
+With ``HANDLER_LOADING=lazy`` modules are not imported at startup. Their commands
+and callbacks are read from a static manifest (see :mod:`src.handlers_manifest`)
+and each module is imported on the first update that needs it.
 """
 
+from __future__ import annotations
+
 import importlib
 import pkgutil
+import re
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler
 
 from src import handlers
-from src.utils.commands import COMMAND_REGISTRY
+from src.config import COMMAND_DISPATCH, HANDLER_LOADING, HANDLER_MANIFEST_FILE
+from src.core.callback_router import CallbackRouter
+from src.core.dispatcher import CommandDispatcher, build_command_index
+from src.handlers_manifest import LazyCallback, build_manifest
+from src.utils import commands
+from src.utils.commands import CommandMeta
 from src.utils.logger import logger
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+    from types import ModuleType
 
-def register_handlers(app: Application) -> None:
-    """Auto-register handlers from the ``handlers`` package."""
-    for _, module_name, _ in pkgutil.iter_modules(handlers.__path__):
-        try:
-            module = importlib.import_module(f"{handlers.__name__}.{module_name}")
-        except Exception as exc:  # noqa: BLE001
-            logger.exception(
-                "Failed to import handler module %s: %s",
-                module_name,
-                exc,
-            )
-            continue
 
-        # Register callback query handlers
-        for attr, meta in getattr(module, "__callbacks__", {}).items():
-            callback_func = getattr(module, attr)
-            pattern = meta.get("pattern")
-            app.add_handler(CallbackQueryHandler(callback_func, pattern=pattern))
+def register_command_handlers(
+    app: Application,
+    registry: Iterable[CommandMeta],
+    dispatch: str = COMMAND_DISPATCH,
+) -> None:
+    """Register command handlers for ``registry`` using the given strategy."""
+    if dispatch == "indexed":
+        app.add_handler(CommandDispatcher(build_command_index(registry)))
+        return
 
-    # Register all command handlers once after importing modules
     seen_commands: set[str] = set()
-    for meta in COMMAND_REGISTRY:
+    for meta in registry:
         if meta.name in seen_commands:
             continue
 
@@ -48,3 +63,101 @@ def register_handlers(app: Application) -> None:
             if alias not in seen_commands:
                 app.add_handler(CommandHandler(alias, meta.func))
                 seen_commands.add(alias)
+
+
+def register_callback(
+    app: Application,
+    func: Callable[..., Awaitable[object]],
+    meta: dict,
+    router: CallbackRouter | None = None,
+) -> None:
+    """Register one ``__callbacks__`` entry by prefix or by regex pattern."""
+    prefix = meta.get("prefix")
+    if prefix is not None and router is not None:
+        router.add(prefix, func)
+        return
+    pattern = meta.get("pattern")
+    if pattern is None and prefix is not None:
+        pattern = f"^{re.escape(prefix)}(:|$)"
+    app.add_handler(CallbackQueryHandler(func, pattern=pattern))
+
+
+def import_handler_module(
+    app: Application, module_name: str, router: CallbackRouter | None = None
+) -> None:
+    """Import a handler module and register its callback query handlers."""
+    try:
+        module = importlib.import_module(module_name)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception(
+            "Failed to import handler module %s: %s",
+            module_name,
+            exc,
+        )
+        return
+
+    # Register callback query handlers
+    for attr, meta in getattr(module, "__callbacks__", {}).items():
+        register_callback(app, getattr(module, attr), meta, router)
+
+
+def register_lazy_handlers(
+    app: Application,
+    package: ModuleType,
+    manifest_file: str | None,
+    router: CallbackRouter | None = None,
+) -> None:
+    """Register commands and callbacks from the manifest without importing modules."""
+    cache_file = Path(manifest_file) if manifest_file else None
+    package_dir = Path(package.__path__[0])
+    # An application rebuilt in the same process finds them registered already
+    registered = {(meta.module, meta.name) for meta in commands.COMMAND_REGISTRY}
+    for entry in build_manifest(package_dir, package.__name__, cache_file):
+        # Modules that are already imported registered themselves at import time
+        if entry.module in sys.modules:
+            import_handler_module(app, entry.module, router)
+            continue
+        if not entry.static:
+            logger.debug("Importing %s eagerly (not static)", entry.module)
+            import_handler_module(app, entry.module, router)
+            continue
+
+        for attr, meta in entry.callbacks.items():
+            register_callback(app, LazyCallback(entry.module, attr), meta, router)
+        for meta in entry.commands:
+            if (entry.module, meta["name"]) in registered:
+                continue
+            commands.COMMAND_REGISTRY.register(
+                CommandMeta(
+                    name=meta["name"],
+                    func=LazyCallback(entry.module, meta["attr"]),
+                    description=meta["description"],
+                    hidden=meta["hidden"],
+                    admin_only=meta["admin_only"],
+                    aliases=meta["aliases"],
+                    module=entry.module,
+                )
+            )
+
+
+def register_handlers(
+    app: Application,
+    dispatch: str = COMMAND_DISPATCH,
+    loading: str = HANDLER_LOADING,
+    package: ModuleType = handlers,
+) -> None:
+    """Auto-register handlers from the ``handlers`` package."""
+    # Added first so prefixed callbacks never scan the regex handlers
+    router = CallbackRouter()
+    app.add_handler(router)
+    if loading == "lazy":
+        register_lazy_handlers(app, package, HANDLER_MANIFEST_FILE, router)
+    else:
+        for _, module_name, _ in pkgutil.iter_modules(package.__path__):
+            import_handler_module(app, f"{package.__name__}.{module_name}", router)
+
+    # Register all command handlers once after importing modules
+    register_command_handlers(app, commands.COMMAND_REGISTRY, dispatch)
+    logger.debug(
+        "✅ Command handlers registered (%s loading, %s dispatch)", loading, dispatch
+    )
@@ -0,0 +1,233 @@
+"""Static command manifest for lazy handler loading.
+
+Handler modules are scanned with :mod:`ast` instead of being imported. The scan
+records every ``@command`` registration (name, aliases, description and flags)
+and the ``__callbacks__`` patterns of each module, which is enough to publish
+the command list and route updates. Module imports are deferred until a
+command or callback of that module is first used, via :class:`LazyCallback`.
+
+Scan results are cached in a JSON file. A cached entry is reused while the
+module's mtime and size are unchanged, or while its content hash still matches.
+Modules that use non-literal decorator arguments cannot be described statically
+and are marked for eager import instead.
+"""
+
+from __future__ import annotations
+
+import ast
+import contextlib
+import hashlib
+import importlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.utils import commands
+from src.utils.logger import logger
+
+MANIFEST_VERSION = 1
+
+
+@dataclass(slots=True)
+class ModuleManifest:
+    """Statically extracted handler metadata of one module."""
+
+    module: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    static: bool = True
+    commands: list[dict[str, Any]] = field(default_factory=list)
+    callbacks: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+class LazyCallback:
+    """Async callable that imports its handler module on first call."""
+
+    __slots__ = ("__name__", "__qualname__", "_func", "attr", "module")
+
+    def __init__(self, module: str, attr: str) -> None:
+        """Remember where the real callback lives."""
+        self.module = module
+        self.attr = attr
+        self.__name__ = attr
+        self.__qualname__ = f"{module}.{attr}"
+        self._func: Any = None
+
+    def resolve(self) -> Any:  # noqa: ANN401
+        """Import the module (once) and return the real callback."""
+        if self._func is None:
+            # The module's @command decorators already ran via the manifest
+            with commands.COMMAND_REGISTRY.registration_paused():
+                module = importlib.import_module(self.module)
+            self._func = getattr(module, self.attr)
+            logger.debug("📦 Lazily imported handler module %s", self.module)
+        return self._func
+
+    async def __call__(self, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        """Resolve the callback and await it."""
+        return await self.resolve()(*args, **kwargs)
+
+
+def _command_aliases(tree: ast.Module) -> tuple[set[str], set[str]]:
+    """Return local names bound to ``command`` and to the commands module."""
+    names: set[str] = set()
+    modules: set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        for alias in node.names:
+            if node.module == "src.utils.commands" and alias.name == "command":
+                names.add(alias.asname or alias.name)
+            elif node.module == "src.utils" and alias.name == "commands":
+                modules.add(alias.asname or alias.name)
+    return names, modules
+
+
+def _is_command_call(node: ast.AST, names: set[str], modules: set[str]) -> bool:
+    """Return whether ``node`` is a call to the ``command`` decorator factory."""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id in names
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "command"
+        and isinstance(func.value, ast.Name)
+        and func.value.id in modules
+    )
+
+
+def _command_entry(
+    func: ast.AsyncFunctionDef | ast.FunctionDef, call: ast.Call
+) -> dict[str, Any]:
+    """Evaluate the literal arguments of a ``command(...)`` call."""
+    description = ast.literal_eval(call.args[0]) if call.args else None
+    options = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+    description = options.pop("description", description)
+    name = func.name.replace("_command", "")
+    return {
+        "name": name,
+        "attr": func.name,
+        "description": description or name.capitalize(),
+        "hidden": bool(options.get("hidden", False)),
+        "admin_only": bool(options.get("admin_only", False)),
+        "aliases": list(options.get("aliases") or []),
+    }
+
+
+def scan_source(source: str) -> tuple[bool, list[dict], dict[str, dict]]:
+    """Extract commands and callbacks from module source.
+
+    Returns ``(static, commands, callbacks)``; ``static`` is False when the module
+    registers commands in a way that cannot be evaluated without importing it.
+    """
+    tree = ast.parse(source)
+    names, modules = _command_aliases(tree)
+    found: list[dict] = []
+    callbacks: dict[str, dict] = {}
+    handled: set[int] = set()
+    try:
+        for node in tree.body:
+            if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef)):
+                for decorator in node.decorator_list:
+                    if _is_command_call(decorator, names, modules):
+                        found.append(_command_entry(node, decorator))
+                        handled.add(id(decorator))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = (
+                    node.targets if isinstance(node, ast.Assign) else [node.target]
+                )
+                names_assigned = {t.id for t in targets if isinstance(t, ast.Name)}
+                if "__callbacks__" in names_assigned:
+                    callbacks = ast.literal_eval(node.value)
+    except (ValueError, TypeError, SyntaxError):
+        return False, [], {}
+
+    # Registrations outside top-level function decorators need a real import
+    for node in ast.walk(tree):
+        if _is_command_call(node, names, modules) and id(node) not in handled:
+            return False, [], {}
+    return True, found, callbacks
+
+
+def _scan_file(
+    module: str, path: Path, stat: os.stat_result, digest: str
+) -> ModuleManifest:
+    """Scan a module file into a manifest entry."""
+    static, found, callbacks = scan_source(path.read_text(encoding="utf-8"))
+    return ModuleManifest(
+        module=module,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        sha256=digest,
+        static=static,
+        commands=found,
+        callbacks=callbacks,
+    )
+
+
+def _read_cache(cache_file: Path | None) -> dict[str, ModuleManifest]:
+    """Load cached manifest entries, ignoring unreadable or outdated caches."""
+    if cache_file is None or not cache_file.exists():
+        return {}
+    try:
+        raw = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if raw.get("version") != MANIFEST_VERSION:
+        return {}
+    return {name: ModuleManifest(**entry) for name, entry in raw["modules"].items()}
+
+
+def _write_cache(cache_file: Path, entries: list[ModuleManifest]) -> None:
+    """Atomically persist the manifest."""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": MANIFEST_VERSION,
+        "modules": {entry.module: asdict(entry) for entry in entries},
+    }
+    tmp_file = cache_file.with_suffix(cache_file.suffix + ".tmp")
+    tmp_file.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    tmp_file.replace(cache_file)
+
+
+def build_manifest(
+    package_dir: Path, package_name: str, cache_file: Path | None = None
+) -> list[ModuleManifest]:
+    """Return manifest entries for every module of a handler package.
+
+    Cached entries are reused when the file's mtime and size are unchanged, or
+    when its content hash still matches; other modules are rescanned.
+    """
+    cached = _read_cache(cache_file)
+    entries: list[ModuleManifest] = []
+    changed = False
+    for path in sorted(package_dir.glob("*.py")):
+        if path.stem == "__init__":
+            continue
+        module = f"{package_name}.{path.stem}"
+        stat = path.stat()
+        entry = cached.get(module)
+        if entry is not None and (entry.mtime_ns, entry.size) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            entries.append(entry)
+            continue
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if entry is not None and entry.sha256 == digest:
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+        else:
+            entry = _scan_file(module, path, stat, digest)
+        entries.append(entry)
+        changed = True
+
+    if cache_file is not None and (changed or len(entries) != len(cached)):
+        with contextlib.suppress(OSError):
+            _write_cache(cache_file, entries)
+    return entries
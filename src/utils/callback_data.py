@@ -0,0 +1,174 @@
+"""Compact, typed ``callback_data`` encoding for inline keyboard buttons.
+
+Telegram limits ``callback_data`` to 64 bytes. :class:`CallbackData` declares a
+namespace prefix and typed fields once and packs values densely::
+
+    VOTE = CallbackData("vote", poll=int, choice=Choice, note=str)
+    VOTE.encode(poll=123456, choice=Choice.NO, note="hi")  # "vote:U90.1.hi"
+    VOTE.decode("vote:U90.1.hi")  # {"poll": 123456, "choice": Choice.NO, ...}
+
+Integers use a base-64 alphabet (``~`` marks negative numbers), enums are
+stored by their position in the enum, booleans as ``1``/``0`` and strings with
+only the separator and ``%`` escaped. The prefix is what the callback router
+(:mod:`src.core.callback_router`) dispatches on, and :meth:`CallbackData.encode`
+rejects payloads over the limit instead of letting Telegram refuse the keyboard.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CALLBACK_DATA_LIMIT = 64  # bytes, enforced by Telegram
+PREFIX_SEPARATOR = ":"
+FIELD_SEPARATOR = "."
+
+_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+_DIGITS = {char: value for value, char in enumerate(_ALPHABET)}
+_BASE = len(_ALPHABET)
+_NEGATIVE = "~"
+
+
+class CallbackDataError(ValueError):
+    """Raised for payloads that cannot be encoded or decoded."""
+
+
+def encode_int(value: int) -> str:
+    """Encode an integer in base 64."""
+    if value < 0:
+        return _NEGATIVE + encode_int(-value)
+    digits = []
+    while True:
+        value, digit = divmod(value, _BASE)
+        digits.append(_ALPHABET[digit])
+        if not value:
+            return "".join(reversed(digits))
+
+
+def decode_int(text: str) -> int:
+    """Decode an integer produced by :func:`encode_int`."""
+    if text.startswith(_NEGATIVE):
+        return -decode_int(text[1:])
+    if not text:
+        msg = "Empty integer field"
+        raise CallbackDataError(msg)
+    value = 0
+    try:
+        for char in text:
+            value = value * _BASE + _DIGITS[char]
+    except KeyError as exc:
+        msg = f"Invalid integer field {text!r}"
+        raise CallbackDataError(msg) from exc
+    return value
+
+
+def callback_prefix(data: str) -> str:
+    """Return the namespace prefix of ``callback_data``."""
+    return data.partition(PREFIX_SEPARATOR)[0]
+
+
+def _encode_bool(value: object) -> str:
+    return "1" if value else "0"
+
+
+def _decode_bool(part: str) -> bool:
+    return part == "1"
+
+
+def _encode_str(value: str) -> str:
+    return value.replace("%", "%25").replace(FIELD_SEPARATOR, "%2E")
+
+
+def _field_codec(
+    field_type: type,
+) -> tuple[Callable[[Any], str], Callable[[str], Any]]:
+    """Return the ``(encode, decode)`` functions for one field type."""
+    if field_type is bool:
+        return _encode_bool, _decode_bool
+    if field_type is int:
+        return encode_int, decode_int
+    if field_type is str:
+        return _encode_str, unquote
+    members = list(field_type)
+    codes = {member: encode_int(index) for index, member in enumerate(members)}
+
+    def decode_member(part: str) -> Enum:
+        index = decode_int(part)
+        if not 0 <= index < len(members):
+            msg = f"No {field_type.__name__} member at position {index}"
+            raise CallbackDataError(msg)
+        return members[index]
+
+    return codes.__getitem__, decode_member
+
+
+class CallbackData:
+    """Codec for one ``callback_data`` namespace with typed fields."""
+
+    __slots__ = ("_codecs", "fields", "prefix")
+
+    def __init__(self, prefix: str, **fields: type) -> None:
+        """Declare the namespace ``prefix`` and its fields in order."""
+        if not prefix or PREFIX_SEPARATOR in prefix or FIELD_SEPARATOR in prefix:
+            msg = f"Invalid callback prefix {prefix!r}"
+            raise CallbackDataError(msg)
+        for name, field_type in fields.items():
+            if field_type not in (int, bool, str) and not issubclass(field_type, Enum):
+                msg = f"Unsupported type {field_type!r} for field {name!r}"
+                raise CallbackDataError(msg)
+        self.prefix = prefix
+        self.fields = fields
+        # Resolved once, so encoding and decoding skip the type dispatch
+        self._codecs = [
+            (name, field_type, *_field_codec(field_type))
+            for name, field_type in fields.items()
+        ]
+
+    def encode(self, *args: Any, **kwargs: Any) -> str:  # noqa: ANN401
+        """Pack field values (positional or by name) into ``callback_data``."""
+        if len(args) + len(kwargs) != len(self._codecs):
+            msg = f"{self.prefix} expects fields {list(self.fields)}"
+            raise CallbackDataError(msg)
+        parts = []
+        for position, (name, field_type, encode, _) in enumerate(self._codecs):
+            value = args[position] if position < len(args) else kwargs.get(name)
+            if not isinstance(value, field_type) or (
+                field_type is int and isinstance(value, bool)
+            ):
+                msg = f"Field {name!r} expects {field_type.__name__}, got {value!r}"
+                raise CallbackDataError(msg)
+            parts.append(encode(value))
+        data = self.prefix + PREFIX_SEPARATOR + FIELD_SEPARATOR.join(parts)
+        if len(data) > CALLBACK_DATA_LIMIT // 4:
+            # Only payloads that might exceed the limit pay for the UTF-8 encode
+            size = len(data.encode())
+            if size > CALLBACK_DATA_LIMIT:
+                msg = (
+                    f"callback_data for {self.prefix} is {size} bytes, "
+                    f"the limit is {CALLBACK_DATA_LIMIT}: {data!r}"
+                )
+                raise CallbackDataError(msg)
+        return data
+
+    def decode(self, data: str) -> dict[str, Any]:
+        """Unpack ``callback_data`` produced by :meth:`encode`."""
+        prefix, _, payload = data.partition(PREFIX_SEPARATOR)
+        if prefix != self.prefix:
+            msg = f"Expected prefix {self.prefix!r}, got {data!r}"
+            raise CallbackDataError(msg)
+        parts = payload.split(FIELD_SEPARATOR) if self._codecs else []
+        if len(parts) != len(self._codecs):
+            msg = f"Expected {len(self._codecs)} fields in {data!r}"
+            raise CallbackDataError(msg)
+        return {
+            name: decode(part)
+            for (name, _, _, decode), part in zip(self._codecs, parts, strict=True)
+        }
+
+    def matches(self, data: str) -> bool:
+        """Whether ``data`` belongs to this namespace."""
+        return callback_prefix(data) == self.prefix
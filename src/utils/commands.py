@@ -2,20 +2,35 @@
 
 Provides helper functions and helpers for registering command handlers and
 generating their descriptions for the bot's command list.
+
+Commands live in a :class:`CommandRegistry` whose version counter bumps on every
+registration. Derived views (visible commands, admin commands, help text and the
+``BotCommand`` list) are memoized and only rebuilt after the registry changes,
+which in practice means once, after all handler modules are imported.
+
+With ``METRICS_ENABLED`` the :func:`command` decorator wraps each callback so
+its calls, errors, latency and in-flight count are recorded in
+:mod:`src.utils.metrics`.
 """
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar, cast
 
 from telegram import BotCommand
 
+from src.config import METRICS_ENABLED
+from src.utils.metrics import instrument_command
+
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
+    from collections.abc import Awaitable, Callable, Iterable, Iterator
 
     from telegram.ext import Application
 
+T = TypeVar("T")
+
 
 @dataclass(slots=True)
 class CommandMeta:
@@ -27,9 +42,108 @@ class CommandMeta:
     hidden: bool = False
     admin_only: bool = False
     aliases: list[str] = field(default_factory=list)
+    # Module that registered the command, so a reload can replace its commands
+    module: str = ""
+
+
+class CommandRegistry:
+    """Ordered collection of command metadata with memoized views."""
+
+    __slots__ = ("_cache", "_commands", "_paused", "_version")
+
+    def __init__(self, commands: Iterable[CommandMeta] = ()) -> None:
+        """Initialize the registry with optional initial commands."""
+        self._commands: list[CommandMeta] = list(commands)
+        self._version = 0
+        self._cache: dict[str, tuple[int, object]] = {}
+        self._paused = False
+
+    @property
+    def version(self) -> int:
+        """Return a counter that increases on every registration."""
+        return self._version
+
+    def register(self, meta: CommandMeta) -> None:
+        """Add a command and invalidate the memoized views."""
+        if self._paused:
+            return
+        self._commands.append(meta)
+        self._version += 1
+
+    @contextmanager
+    def registration_paused(self) -> Iterator[None]:
+        """Ignore registrations, e.g. while importing an already described module."""
+        self._paused = True
+        try:
+            yield
+        finally:
+            self._paused = False
+
+    def __iter__(self) -> Iterator[CommandMeta]:
+        """Iterate over commands in registration order."""
+        return iter(self._commands)
+
+    def __len__(self) -> int:
+        """Return the number of registered commands."""
+        return len(self._commands)
+
+    def __getitem__(self, index: int) -> CommandMeta:
+        """Return the command registered at ``index``."""
+        return self._commands[index]
+
+    def view(self, name: str, build: Callable[[], T]) -> T:
+        """Return the cached result of ``build`` for the current registry version."""
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == self._version:
+            return cast("T", cached[1])
+        value = build()
+        self._cache[name] = (self._version, value)
+        return value
+
+    @property
+    def visible(self) -> tuple[CommandMeta, ...]:
+        """Commands shown to every user (not hidden, not admin-only)."""
+        return self.view(
+            "visible",
+            lambda: tuple(
+                meta
+                for meta in self._commands
+                if not meta.hidden and not meta.admin_only
+            ),
+        )
+
+    @property
+    def admin(self) -> tuple[CommandMeta, ...]:
+        """Admin-only commands that are not hidden."""
+        return self.view(
+            "admin",
+            lambda: tuple(
+                meta for meta in self._commands if meta.admin_only and not meta.hidden
+            ),
+        )
+
+    @property
+    def help_text(self) -> str:
+        """One ``/name — description`` line per visible command."""
+        return self.view(
+            "help_text",
+            lambda: "\n".join(
+                f"/{meta.name} — {meta.description}" for meta in self.visible
+            ),
+        )
+
+    @property
+    def bot_commands(self) -> tuple[BotCommand, ...]:
+        """``BotCommand`` objects for the visible commands."""
+        return self.view(
+            "bot_commands",
+            lambda: tuple(
+                BotCommand(meta.name, meta.description) for meta in self.visible
+            ),
+        )
 
 
-COMMAND_REGISTRY: list[CommandMeta] = []
+COMMAND_REGISTRY = CommandRegistry()
 
 
 def command(
@@ -45,7 +159,10 @@ def command(
         func: Callable[..., Awaitable[None]],
     ) -> Callable[..., Awaitable[None]]:
         command_name = func.__name__.replace("_command", "")
-        COMMAND_REGISTRY.append(
+        module = func.__module__
+        if METRICS_ENABLED:
+            func = instrument_command(command_name, func)
+        COMMAND_REGISTRY.register(
             CommandMeta(
                 name=command_name,
                 func=func,
@@ -53,6 +170,7 @@ def command(
                 hidden=hidden,
                 admin_only=admin_only,
                 aliases=aliases or [],
+                module=module,
             )
         )
         return func
@@ -61,25 +179,15 @@ def command(
 
 
 def make_set_commands() -> Callable[[Application], Awaitable[None]]:
-    """Return an async command setter function with optional caching."""
+    """Return an async command setter function serving the cached command list."""
 
     async def set_commands(application: Application) -> None:
-        """Set commands on the bot instance, with filtering."""
-        commands = [
-            BotCommand(meta.name, meta.description)
-            for meta in COMMAND_REGISTRY
-            if not meta.hidden and not meta.admin_only
-        ]
-        await application.bot.set_my_commands(commands)
+        """Set the visible commands on the bot instance."""
+        await application.bot.set_my_commands(list(COMMAND_REGISTRY.bot_commands))
 
     return set_commands
 
 
 def get_commands_descriptions() -> str:
     """Return a formatted string of all visible bot commands and their descriptions."""
-    visible_commands = [
-        (meta.name, meta.description)
-        for meta in COMMAND_REGISTRY
-        if not meta.hidden and not meta.admin_only
-    ]
-    return "\n".join(f"/{cmd} — {desc}" for cmd, desc in visible_commands)
+    return COMMAND_REGISTRY.help_text
@@ -3,7 +3,8 @@ This module provides utility decorators for use with Telegram bot handlers.
 
 - `admin_required`: A decorator to restrict command access to the configured admin user.
   It checks if the command issuer's Telegram ID matches the `ADMIN_ID` from the config.
-  If not, it sends an unauthorized access message.
+  If not, it sends an unauthorized access message. The ID is read on every call,
+  so a configuration reload takes effect immediately.
 """
 
 from collections.abc import Awaitable, Callable
@@ -13,7 +14,7 @@ from typing import Any
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from src.config import ADMIN_ID
+from src import config
 
 
 def admin_required(
@@ -28,7 +29,7 @@ def admin_required(
         *args: object,
         **kwargs: dict[str, object]
     ) -> None | bool:
-        if update.effective_user and update.effective_user.id == ADMIN_ID:
+        if update.effective_user and update.effective_user.id == config.ADMIN_ID:
             return await func(update, context, *args, **kwargs)
         if update.message:
             await update.message.reply_text(
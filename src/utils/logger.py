@@ -3,26 +3,134 @@
 Initializes loggers with rotating file handlers, separate log files for components,
 and colored console output using Colorama. Integrates multiple log levels and
 structured formatting with support for user tagging in log messages.
+
+When ``LOG_QUEUE_ENABLED`` is set, loggers only enqueue records into a bounded
+in-memory queue; formatting and file I/O happen on a background listener thread,
+so handlers running on the event loop never wait on disk. ``shutdown_logging``
+drains the queue and restores direct handlers.
+
+Every record carries the update being processed: it is stored in the
+:data:`UPDATE_CONTEXT` context variable at dispatch time (see
+:mod:`src.core.log_context`), and the record factory installed by
+:func:`setup_logging` copies it onto the record, so it survives the hand-off to
+the queue listener thread. Its update, chat and user id and command are only
+extracted when a record is formatted. With ``LOG_FORMAT=json`` the file
+handlers write one JSON object per line (:class:`JsonFormatter`).
+
+Hot paths log DEBUG records through a :class:`SampledLogger`, which keeps only
+a ``LOG_DEBUG_SAMPLE_RATE`` share of them and decides before the record is
+built.
 """
 
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from collections.abc import Iterable
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import ClassVar
+from typing import Any, ClassVar
 
 from colorama import Fore, Style
 from colorama import init as colorama_init
 
 from src.config import (  # Import log level and log directory from centralized config
     LOG_BOT_FILE,
+    LOG_DEBUG_SAMPLE_RATE,
     LOG_DIR,
     LOG_ERRORS_FILE,
+    LOG_FORMAT,
     LOG_LEVEL,
+    LOG_QUEUE_ENABLED,
+    LOG_QUEUE_OVERFLOW,
+    LOG_QUEUE_SIZE,
 )
 
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_DEBUG = "drop_debug"
+OVERFLOW_COUNT = "count"
+OVERFLOW_POLICIES = frozenset({OVERFLOW_BLOCK, OVERFLOW_DROP_DEBUG, OVERFLOW_COUNT})
+
+# Fill ratio above which DEBUG records are dropped under the "drop_debug" policy
+DEBUG_HIGH_WATER = 0.9
+
+LOG_FORMATS = frozenset({"text", "json"})
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# The update being processed, set at dispatch time
+UPDATE_CONTEXT: ContextVar[Any] = ContextVar("update_context", default=None)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson_encode = None
+else:
+
+    def _orjson_encode(payload: dict[str, object]) -> str:
+        """Serialize ``payload`` with orjson, falling back to ``str``."""
+        return orjson.dumps(payload, default=str).decode()
+
+
 colorama_init()
 
 
+def command_name(text: str | None) -> str | None:
+    """Return the command of a ``/command@bot args`` message text."""
+    if not text or not text.startswith("/"):
+        return None
+    return text.split(maxsplit=1)[0][1:].partition("@")[0].lower() or None
+
+
+def update_fields(update: Any) -> dict[str, object]:  # noqa: ANN401
+    """Return the update, chat and user id and command of a Telegram update."""
+    chat = update.effective_chat
+    user = update.effective_user
+    message = update.message
+    return {
+        "update_id": update.update_id,
+        "chat_id": chat.id if chat else None,
+        "user_id": user.id if user else None,
+        "command": command_name(message.text) if message else None,
+    }
+
+
+_default_record_factory = logging.getLogRecordFactory()
+
+
+def record_factory(*args: object, **kwargs: object) -> logging.LogRecord:
+    """Build a record carrying the update being processed, if any."""
+    record = _default_record_factory(*args, **kwargs)
+    record.telegram_update = UPDATE_CONTEXT.get()
+    return record
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """Logger adapter that keeps only a random share of DEBUG records.
+
+    The decision is made in :meth:`isEnabledFor`, so dropped records are never
+    built or formatted. Other levels are logged as usual.
+    """
+
+    def __init__(
+        self, logger: logging.Logger, rate: float = LOG_DEBUG_SAMPLE_RATE
+    ) -> None:
+        """Wrap ``logger``, keeping DEBUG records with probability ``rate``."""
+        super().__init__(logger, {})
+        self.rate = rate
+
+    def isEnabledFor(self, level: int) -> bool:  # noqa: N802
+        """Whether a record of ``level`` is enabled and sampled."""
+        if level > logging.DEBUG or self.rate >= 1:
+            return self.logger.isEnabledFor(level)
+        enabled = self.logger.isEnabledFor(level)
+        return enabled and random.random() < self.rate  # noqa: S311
+
+    def process(self, msg: object, kwargs: dict) -> tuple[object, dict]:
+        """Pass the message through; there are no adapter extras to merge."""
+        return msg, kwargs
+
+
 # ColorFormatter for pretty colored logs in console
 class ColorFormatter(logging.Formatter):
     """Custom logging formatter that adds color and user metadata to log messages."""
@@ -40,21 +148,145 @@ class ColorFormatter(logging.Formatter):
         color = self.COLORS.get(record.levelno, "")
         reset = Style.RESET_ALL
         message = super().format(record)
-        # Append user info to log if present in message
-        if hasattr(record, "user_id") and hasattr(record, "user_name"):
-            user_display = f"{record.user_name} (ID: {record.user_id})"
-        elif hasattr(record, "user_id"):
-            user_display = f"ID: {record.user_id}"
-        elif hasattr(record, "user_name"):
-            user_display = f"{record.user_name}"
+        # Append user info from the record's extras or the update context
+        user_id = getattr(record, "user_id", None)
+        if user_id is None:
+            update = getattr(record, "telegram_update", None)
+            user = update.effective_user if update is not None else None
+            user_id = user.id if user else None
+        user_name = getattr(record, "user_name", None)
+        if user_id is not None and user_name is not None:
+            user_display = f"{user_name} (ID: {user_id})"
+        elif user_id is not None:
+            user_display = f"ID: {user_id}"
         else:
-            user_display = None
+            user_display = user_name
 
         if user_display:
             message += f" | 👤 {user_display}"
         return f"{color}{message}{reset}"
 
 
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects with the update context.
+
+    The encoder (``orjson`` when installed) and the record attributes to copy
+    are set up once per formatter; formatting a record only builds one dict
+    and encodes it.
+    """
+
+    # JSON key -> LogRecord attribute
+    FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("ts", "created"),
+        ("level", "levelname"),
+        ("logger", "name"),
+        # Tells worker processes writing to the same file apart
+        ("pid", "process"),
+    )
+
+    def __init__(self) -> None:
+        """Set up the encoder shared by all records."""
+        super().__init__()
+        self._encode = _orjson_encode or json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the record as one line of JSON."""
+        payload = {key: getattr(record, name) for key, name in self.FIELDS}
+        payload["message"] = record.getMessage()
+        update = getattr(record, "telegram_update", None)
+        if update is not None:
+            payload.update(update_fields(update))
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return self._encode(payload)
+
+
+def file_formatter(log_format: str = LOG_FORMAT) -> logging.Formatter:
+    """Return the formatter of the log files for ``log_format``."""
+    if log_format not in LOG_FORMATS:
+        error_msg = f"Unknown log format: {log_format}"
+        raise ValueError(error_msg)
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Enqueue records for a fixed set of target handlers with an overflow policy.
+
+    Policies when the queue is full:
+    - ``block``: wait for the listener to free a slot.
+    - ``drop_debug``: drop DEBUG records once the queue is nearly full; other
+      records wait for a free slot.
+    - ``count``: drop the record and count it.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        targets: Iterable[logging.Handler],
+        overflow: str = OVERFLOW_DROP_DEBUG,
+    ) -> None:
+        """Initialize the handler with its queue, targets and overflow policy."""
+        if overflow not in OVERFLOW_POLICIES:
+            error_msg = f"Unknown log queue overflow policy: {overflow}"
+            raise ValueError(error_msg)
+        super().__init__(log_queue)
+        self.targets = tuple(targets)
+        self.overflow = overflow
+        self.dropped = 0
+        self._high_water = max(1, int(log_queue.maxsize * DEBUG_HIGH_WATER))
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Pass the record through untouched; formatting happens on the listener."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, applying the overflow policy."""
+        item = (self.targets, record)
+        if (
+            self.overflow == OVERFLOW_DROP_DEBUG
+            and record.levelno <= logging.DEBUG
+            and self.queue.qsize() >= self._high_water
+        ):
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow == OVERFLOW_COUNT:
+                self.dropped += 1
+            else:
+                self.queue.put(item)
+
+
+class LogQueueListener(QueueListener):
+    """Drain queued ``(targets, record)`` items and emit them to their handlers."""
+
+    def handle(
+        self, item: tuple[tuple[logging.Handler, ...], logging.LogRecord]
+    ) -> None:
+        """Emit the record to each target handler that accepts its level."""
+        targets, record = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        """Enqueue the stop sentinel, waiting for space in a full queue."""
+        self.queue.put(self._sentinel)
+
+
+_listener: LogQueueListener | None = None
+_queued_loggers: dict[str, BoundedQueueHandler] = {}
+
+
 def configure_logger(name: str, handlers: list[logging.Handler], level: int) -> None:
     """Configure a logger with the given handlers and log level."""
     logger = logging.getLogger(name)
@@ -64,8 +296,10 @@ def configure_logger(name: str, handlers: list[logging.Handler], level: int) ->
         logger.addHandler(handler)
 
 
-def setup_logging() -> None:
+def setup_logging(*, queued: bool = LOG_QUEUE_ENABLED) -> None:
     """Set up logging with rotating files, color console output, and level filtering."""
+    global _listener  # noqa: PLW0603
+
     # Prepare logging directories and paths
     Path(LOG_DIR).mkdir(parents=True, exist_ok=True)
     bot_log_path = Path(LOG_DIR) / LOG_BOT_FILE
@@ -73,46 +307,76 @@ def setup_logging() -> None:
 
     # Reduce verbosity of external libraries (e.g., HTTPX)
     logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Records capture the update context on the thread that logs them
+    logging.setLogRecordFactory(record_factory)
 
     rotating_bot_handler = RotatingFileHandler(
         bot_log_path, maxBytes=5_000_000, backupCount=3
     )
-    rotating_bot_handler.setFormatter(
-        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    )
+    rotating_bot_handler.setFormatter(file_formatter())
     rotating_bot_handler.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
 
     error_handler = logging.FileHandler(errors_log_path)
-    error_handler.setFormatter(
-        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    )
+    error_handler.setFormatter(file_formatter())
     error_handler.setLevel(logging.ERROR)
 
-    console_formatter = ColorFormatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    console_formatter = ColorFormatter(TEXT_FORMAT)
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
 
-    configure_logger(
-        "bot_bot",
-        [rotating_bot_handler, console_handler],
-        getattr(logging, LOG_LEVEL, logging.DEBUG),
-    )
+    routes: dict[str, tuple[list[logging.Handler], int]] = {
+        "bot_bot": (
+            [rotating_bot_handler, console_handler],
+            getattr(logging, LOG_LEVEL, logging.DEBUG),
+        ),
+        "startup": (
+            [console_handler, rotating_bot_handler],
+            getattr(logging, LOG_LEVEL, logging.INFO),
+        ),
+        "errors": ([error_handler, rotating_bot_handler], logging.ERROR),
+    }
 
-    configure_logger(
-        "startup",
-        [console_handler, rotating_bot_handler],
-        getattr(logging, LOG_LEVEL, logging.INFO),
-    )
+    if not queued:
+        for name, (route_handlers, level) in routes.items():
+            configure_logger(name, route_handlers, level)
+        return
 
-    configure_logger(
-        "errors",
-        [error_handler, rotating_bot_handler],
-        logging.ERROR,
-    )
+    # Loggers only enqueue; a single listener thread formats and writes
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    for name, (route_handlers, level) in routes.items():
+        queue_handler = BoundedQueueHandler(
+            log_queue, route_handlers, LOG_QUEUE_OVERFLOW
+        )
+        _queued_loggers[name] = queue_handler
+        configure_logger(name, [queue_handler], level)
+    _listener = LogQueueListener(log_queue)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Drain the log queue, stop the listener and restore direct handlers."""
+    global _listener  # noqa: PLW0603
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+    dropped = 0
+    for name, queue_handler in _queued_loggers.items():
+        named_logger = logging.getLogger(name)
+        named_logger.removeHandler(queue_handler)
+        for handler in queue_handler.targets:
+            named_logger.addHandler(handler)
+            handler.flush()
+        dropped += queue_handler.dropped
+    _queued_loggers.clear()
+
+    if dropped:
+        logging.getLogger("startup").warning(
+            "⚠️ %s log records were dropped by the log queue", dropped
+        )
 
 
 logger = logging.getLogger("bot_bot")
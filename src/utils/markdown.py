@@ -3,18 +3,76 @@
 Provides a version-aware function to escape special Markdown characters
 required by Telegram's MarkdownV1 and MarkdownV2 formats. Supports
 entity-type specific escaping for safer formatting in messages.
+
+Escape tables are built once per ``(version, entity_type)`` at import time.
+Escaping runs one ``str.replace`` per special character that actually occurs in
+the text, which keeps the common case (few special characters) allocation-light.
+
+:class:`MarkdownTemplate` goes one step further for messages that are mostly
+static: the literal parts are escaped once when the template is created, and
+only the interpolated values are escaped (per placeholder type) when rendering.
 """
 
+from __future__ import annotations
+
 import logging
 import re
+from collections.abc import Callable, Iterable, Mapping
+from string import Formatter
+from typing import TypeVar, overload
+
+from src.utils.logger import SampledLogger
 
 TELEGRAM_MD_V1 = 1
 TELEGRAM_MD_V2 = 2
 
 logger = logging.getLogger("bot_bot")
+# Escaping is a hot path: only a sample of its DEBUG records is kept
+debug_logger = SampledLogger(logger)
+
+K = TypeVar("K")
+
+# Characters to escape for each (version, entity_type) combination
+_ESCAPE_CHARS: dict[tuple[int, str | None], str] = {
+    (TELEGRAM_MD_V1, None): "_*`[",
+    (TELEGRAM_MD_V2, None): "\\_*[]()~`>#+-=|{}.!",
+    (TELEGRAM_MD_V2, "pre"): "\\`",
+    (TELEGRAM_MD_V2, "code"): "\\`",
+    (TELEGRAM_MD_V2, "text_link"): "\\)",
+}
 
+# Precompiled (char, replacement) pairs; the backslash always comes first so
+# escapes inserted by later replacements are not escaped again
+_ESCAPE_TABLES: dict[tuple[int, str | None], tuple[tuple[str, str], ...]] = {
+    key: tuple((char, "\\" + char) for char in chars)
+    for key, chars in _ESCAPE_CHARS.items()
+}
 
-def escape_markdown(text: str, version: int = 2, entity_type: str | None = None) -> str:
+_NESTED_EMPHASIS = re.compile(r"\*{2,}|_{2,}")
+
+
+def _resolve_table(
+    version: int | str, entity_type: str | None
+) -> tuple[tuple[str, str], ...]:
+    """Return the escape table for inputs not covered by the fast lookup."""
+    version = int(version)
+    if version == TELEGRAM_MD_V1:
+        return _ESCAPE_TABLES[TELEGRAM_MD_V1, None]
+    if version == TELEGRAM_MD_V2:
+        return _ESCAPE_TABLES.get(
+            (TELEGRAM_MD_V2, entity_type), _ESCAPE_TABLES[TELEGRAM_MD_V2, None]
+        )
+    error_msg = "Markdown version must be either 1 or 2!"
+    raise ValueError(error_msg)
+
+
+def escape_markdown(
+    text: str,
+    version: int = 2,
+    entity_type: str | None = None,
+    *,
+    diagnostics: bool = False,
+) -> str:
     """Escape Telegram Markdown special characters for MarkdownV1 or MarkdownV2.
 
     Args:
@@ -22,28 +80,148 @@ def escape_markdown(text: str, version: int = 2, entity_type: str | None = None)
         version (int): Telegram Markdown version (1 or 2). Defaults to 2.
         entity_type (Optional[str]): Entity type for selective escaping in MarkdownV2.
             Options: "pre", "code", "text_link".
+        diagnostics (bool): Log the escaped text and warn about nested or
+            excessive bold/italic syntax. Defaults to False.
+
+    """
+    table = _ESCAPE_TABLES.get((version, entity_type))
+    if table is None:
+        table = _resolve_table(version, entity_type)
+
+    escaped = text
+    for char, replacement in table:
+        if char in escaped:
+            escaped = escaped.replace(char, replacement)
+
+    if diagnostics:
+        debug_logger.debug(
+            "Escaped MarkdownV%s (entity='%s'): %s", version, entity_type, escaped
+        )
+        if int(version) == TELEGRAM_MD_V2 and _NESTED_EMPHASIS.search(text):
+            logger.warning("Possible nested or excessive bold/italic syntax detected.")
+    return escaped
+
+
+@overload
+def escape_many(
+    values: Mapping[K, object], version: int = 2, entity_type: str | None = None
+) -> dict[K, str]: ...
+
+
+@overload
+def escape_many(
+    values: Iterable[object], version: int = 2, entity_type: str | None = None
+) -> list[str]: ...
+
+
+def escape_many(
+    values: Mapping[K, object] | Iterable[object],
+    version: int = 2,
+    entity_type: str | None = None,
+) -> dict[K, str] | list[str]:
+    """Escape every value of a list or mapping with a single table lookup.
 
+    Mappings keep their keys and get escaped values; other iterables return a
+    list. Non-string values are converted with ``str()`` before escaping.
     """
-    if int(version) == TELEGRAM_MD_V1:
-        escape_chars = r"_*`["
-    elif int(version) == TELEGRAM_MD_V2:
-        if entity_type in {"pre", "code"}:
-            escape_chars = r"\`"
-        elif entity_type == "text_link":
-            escape_chars = r"\)"
-        else:
-            escape_chars = r"_*\[\]()~`>#+\-=|{}.!"
-    else:
-        error_msg = "Markdown version must be either 1 or 2!"
-        raise ValueError(error_msg)
-
-    escaped = re.sub(f"([{re.escape(escape_chars)}])", r"\\\1", text)
-    logger.debug("Escaped MarkdownV%s: %s", version, escaped)
-    if version == TELEGRAM_MD_V2 and re.search(r"(\*{2,}|_{2,})", text):
-        logger.warning("Possible nested or excessive bold/italic syntax detected.")
-    logger.debug(
-        "Escaping text for Markdown v%s with entity='%s'",
-        version,
-        entity_type,
+    table = _ESCAPE_TABLES.get((version, entity_type))
+    if table is None:
+        table = _resolve_table(version, entity_type)
+
+    def _escape(value: object) -> str:
+        escaped = value if isinstance(value, str) else str(value)
+        for char, replacement in table:
+            if char in escaped:
+                escaped = escaped.replace(char, replacement)
+        return escaped
+
+    if isinstance(values, Mapping):
+        return {key: _escape(value) for key, value in values.items()}
+    return [_escape(value) for value in values]
+
+
+_Table = tuple[re.Pattern[str], tuple[tuple[str, str], ...]]
+
+
+def _template_table(entity_type: str | None) -> _Table:
+    """Pair a MarkdownV2 escape table with a pattern matching its characters."""
+    chars = _ESCAPE_CHARS[TELEGRAM_MD_V2, entity_type]
+    return (
+        re.compile(f"[{re.escape(chars)}]"),
+        _ESCAPE_TABLES[TELEGRAM_MD_V2, entity_type],
     )
+
+
+def _escape(value: object, table: _Table) -> str:
+    """Escape ``value`` (converted with ``str()``) for a template placeholder."""
+    escaped = value if isinstance(value, str) else str(value)
+    special, replacements = table
+    # Interpolated values are short and rarely need escaping: one C-level scan
+    if special.search(escaped) is None:
+        return escaped
+    for char, replacement in replacements:
+        if char in escaped:
+            escaped = escaped.replace(char, replacement)
     return escaped
+
+
+_TEXT_TABLE = _template_table(None)
+_CODE_TABLE = _template_table("code")
+_LINK_TABLE = _template_table("text_link")
+
+
+def _render_link(value: object) -> str:
+    label, url = value  # type: ignore[misc]
+    return f"[{_escape(label, _TEXT_TABLE)}]({_escape(url, _LINK_TABLE)})"
+
+
+# Placeholder types: ``{name}`` is plain text, ``{name:code}`` inline code,
+# ``{name:bold}`` bold text and ``{name:link}`` a ``(label, url)`` pair
+TEMPLATE_RENDERERS: dict[str, Callable[[object], str]] = {
+    "": lambda value: _escape(value, _TEXT_TABLE),
+    "plain": lambda value: _escape(value, _TEXT_TABLE),
+    "code": lambda value: f"`{_escape(value, _CODE_TABLE)}`",
+    "bold": lambda value: f"*{_escape(value, _TEXT_TABLE)}*",
+    "link": _render_link,
+}
+
+
+class MarkdownTemplate:
+    """MarkdownV2 message with static text escaped once and typed placeholders.
+
+    ``MarkdownTemplate("Hello, {name:bold}! Your ID: {user_id:code}")`` escapes
+    ``"Hello, "``, ``"! Your ID: "`` when it is created; :meth:`render` only
+    escapes ``name`` and ``user_id`` and joins the pieces in a single pass.
+    Literal braces are written as ``{{`` and ``}}``.
+    """
+
+    __slots__ = ("_parts", "fields", "source")
+
+    def __init__(self, source: str) -> None:
+        """Parse ``source`` and escape its literal parts."""
+        self.source = source
+        # (escaped literal, None) or (placeholder name, renderer)
+        parts: list[tuple[str, Callable[[object], str] | None]] = []
+        fields: list[str] = []
+        for literal, name, spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append((_escape(literal, _TEXT_TABLE), None))
+            if name is None:
+                continue
+            renderer = TEMPLATE_RENDERERS.get(spec or "")
+            if not name or conversion or renderer is None:
+                error_msg = f"Invalid placeholder {{{name}:{spec}}} in {source!r}"
+                raise ValueError(error_msg)
+            parts.append((name, renderer))
+            fields.append(name)
+        self._parts = tuple(parts)
+        self.fields = tuple(fields)
+
+    def render(self, **values: object) -> str:
+        """Return the MarkdownV2 text with every placeholder filled in."""
+        return "".join(
+            [
+                text if render is None else render(values[text])
+                for text, render in self._parts
+            ]
+        )
@@ -0,0 +1,323 @@
+"""In-process metrics for the Telegram bot.
+
+A small registry of counters, gauges and fixed-bucket histograms, rendered in
+the Prometheus text exposition format and optionally served over HTTP.
+
+Metrics are built for the handler hot path: label values are resolved once into
+a child object (``metric.labels("start")``), after which recording is a couple
+of attribute updates. Everything runs on the event loop thread, so no locking
+is involved. Values that already live elsewhere (queue depths, outbound send
+counters) are read through callbacks at scrape time instead of being mirrored.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from aiohttp import web
+
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+
+# Upper bounds of the latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = tuple[str, tuple[tuple[str, str], ...], float]
+C = TypeVar("C")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # One slot per bucket plus the implicit +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class _Metric(Generic[C]):
+    """Base class for a metric family with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+    ) -> None:
+        if function is not None and labelnames:
+            error_msg = "Callback metrics cannot have labels"
+            raise ValueError(error_msg)
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.function = function
+        self._children: dict[tuple[str, ...], C] = {}
+        self._unlabeled = self.labels() if not labelnames else None
+
+    def _new_child(self) -> C:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> C:
+        """Return the child for the given label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                error_msg = f"{self.name} expects labels {self.labelnames}"
+                raise ValueError(error_msg)
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _label_pairs(self, values: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, values, strict=True))
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield ``(name, labels, value)`` for every child."""
+        if self.function is not None:
+            yield self.name, (), float(self.function())
+            return
+        for values, child in self._children.items():
+            value = child.value  # type: ignore[attr-defined]
+            yield self.name, self._label_pairs(values), value
+
+
+class Counter(_Metric[_CounterChild]):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabeled counter."""
+        self._unlabeled.inc(amount)  # type: ignore[union-attr]
+
+
+class Gauge(_Metric[_GaugeChild]):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabeled gauge."""
+        self._unlabeled.set(value)  # type: ignore[union-attr]
+
+
+class Histogram(_Metric[_HistogramChild]):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabeled histogram."""
+        self._unlabeled.observe(value)  # type: ignore[union-attr]
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield cumulative bucket counts, the sum and the count of each child."""
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for values, child in self._children.items():
+            labels = self._label_pairs(values)
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket", (*labels, ("le", bound)), cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, child.count
+
+
+class MetricsRegistry:
+    """Named collection of metric families."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric[Any]] = {}
+
+    def _add(self, metric: _Metric[Any]) -> Any:  # noqa: ANN401
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                error_msg = f"Metric {metric.name} is already registered"
+                raise ValueError(error_msg)
+            if metric.function is not None:
+                # Re-registering a callback metric points it at the new source
+                existing.function = metric.function
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+    ) -> Counter:
+        """Return the counter ``name``, registering it on first use."""
+        return self._add(Counter(name, documentation, labelnames, function))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+    ) -> Gauge:
+        """Return the gauge ``name``, registering it on first use."""
+        return self._add(Gauge(name, documentation, labelnames, function))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram ``name``, registering it on first use."""
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+COMMAND_CALLS = METRICS.counter(
+    "bot_command_calls_total", "Completed command invocations.", ("command",)
+)
+COMMAND_ERRORS = METRICS.counter(
+    "bot_command_errors_total",
+    "Command invocations that raised, by exception type.",
+    ("command", "exception"),
+)
+COMMAND_LATENCY = METRICS.histogram(
+    "bot_command_duration_seconds", "Command handler latency.", ("command",)
+)
+COMMAND_IN_FLIGHT = METRICS.gauge(
+    "bot_command_in_flight", "Command invocations currently running.", ("command",)
+)
+DISPATCH_TOTAL = METRICS.counter(
+    "bot_dispatch_total",
+    "Commands seen by the indexed dispatcher, by outcome.",
+    ("outcome",),
+)
+
+
+def instrument_command(
+    name: str, func: Callable[..., Awaitable[Any]]
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a command callback to record calls, errors, latency and in-flight."""
+    calls = COMMAND_CALLS.labels(name)
+    latency = COMMAND_LATENCY.labels(name)
+    in_flight = COMMAND_IN_FLIGHT.labels(name)
+    clock = time.perf_counter
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        in_flight.value += 1
+        start = clock()
+        try:
+            return await func(*args, **kwargs)
+        except Exception as exc:
+            COMMAND_ERRORS.labels(name, type(exc).__name__).inc()
+            raise
+        finally:
+            latency.observe(clock() - start)
+            in_flight.value -= 1
+            calls.value += 1
+
+    return wrapper
+
+
+async def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = METRICS
+) -> web.AppRunner:
+    """Serve ``registry`` on ``http://host:port/metrics``; return the runner."""
+
+    async def scrape(_request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", scrape)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("📈 Metrics available on http://%s:%s/metrics", host, port)
+    return runner
@@ -0,0 +1,149 @@
+"""On-demand CPU and allocation profiling of the running bot.
+
+Both profilers are inert until started: ``cProfile`` is only enabled for the
+duration of a session and ``tracemalloc`` only traces between ``start`` and
+``stop``, so the bot pays nothing while they are off. Results are summarized as
+plain-text tables of the top functions and allocation sites, ready to be sent
+back to the admin.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import marshal
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+
+# Rows shown in a summary by default
+TOP_N = 15
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 1
+
+
+def _short_path(filename: str) -> str:
+    """Trim a source path to something readable in a chat message."""
+    if "site-packages/" in filename:
+        return filename.rsplit("site-packages/", 1)[1]
+    try:
+        return str(Path(filename).relative_to(Path.cwd()))
+    except ValueError:
+        return filename
+
+
+class CpuProfiler:
+    """A cProfile session that can be started and stopped at runtime."""
+
+    def __init__(self) -> None:
+        """Initialize an idle profiler."""
+        self._profile: cProfile.Profile | None = None
+        self._started_at = 0.0
+        self.last_stats: pstats.Stats | None = None
+        self.last_duration = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Whether a profiling session is running."""
+        return self._profile is not None
+
+    def start(self) -> None:
+        """Start profiling every function call on this thread."""
+        if self._profile is not None:
+            error_msg = "Profiling is already running"
+            raise RuntimeError(error_msg)
+        self._profile = cProfile.Profile()
+        self._started_at = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self) -> pstats.Stats:
+        """Stop the running session and keep its statistics."""
+        if self._profile is None:
+            error_msg = "Profiling is not running"
+            raise RuntimeError(error_msg)
+        self._profile.disable()
+        self.last_duration = time.perf_counter() - self._started_at
+        self.last_stats = pstats.Stats(self._profile)
+        self._profile = None
+        return self.last_stats
+
+    def summary(self, limit: int = TOP_N) -> str:
+        """Return the top ``limit`` functions of the last session by cumulative time."""
+        if self.last_stats is None:
+            return "No profile recorded yet."
+        rows = sorted(
+            self.last_stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][3],
+            reverse=True,
+        )[:limit]
+        lines = [
+            f"{self.last_duration:.1f}s profiled, "
+            f"{self.last_stats.total_calls} calls",  # type: ignore[attr-defined]
+            f"{'calls':>8} {'tottime':>8} {'cumtime':>8}  function",
+        ]
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows:
+            location = name if filename == "~" else f"{_short_path(filename)}:{line}"
+            if filename != "~":
+                location += f"({name})"
+            lines.append(f"{calls:>8} {tottime:>8.3f} {cumtime:>8.3f}  {location}")
+        return "\n".join(lines)
+
+    def dump(self) -> bytes:
+        """Return the last session in ``pstats`` file format (for snakeviz etc.)."""
+        if self.last_stats is None:
+            error_msg = "No profile recorded yet"
+            raise RuntimeError(error_msg)
+        return marshal.dumps(self.last_stats.stats)  # type: ignore[attr-defined]
+
+
+class AllocationTracker:
+    """Start/stop wrapper around ``tracemalloc`` that remembers a baseline."""
+
+    def __init__(self) -> None:
+        """Initialize a tracker that is not tracing."""
+        self.baseline: tracemalloc.Snapshot | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether allocations are being traced."""
+        return tracemalloc.is_tracing()
+
+    def snapshot(self, limit: int = TOP_N) -> str:
+        """Take a new baseline (starting tracing if needed) and list top sites."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.baseline = tracemalloc.take_snapshot()
+            return "Allocation tracing started; baseline snapshot taken."
+        self.baseline = tracemalloc.take_snapshot()
+        stats = self.baseline.statistics("lineno")[:limit]
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"traced {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB"]
+        lines.extend(
+            f"{stat.size / 1024:>9.1f} KiB {stat.count:>7}  "
+            f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}"
+            for stat in stats
+        )
+        return "\n".join(lines)
+
+    def diff(self, limit: int = TOP_N) -> str:
+        """List the allocation sites that grew most since the baseline."""
+        if not tracemalloc.is_tracing() or self.baseline is None:
+            return "Allocation tracing is off; take a snapshot first."
+        current = tracemalloc.take_snapshot()
+        stats = current.compare_to(self.baseline, "lineno")[:limit]
+        lines = [f"{'size diff':>13} {'count':>7}  site"]
+        lines.extend(
+            f"{stat.size_diff / 1024:>+9.1f} KiB {stat.count_diff:>+7}  "
+            f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}"
+            for stat in stats
+        )
+        return "\n".join(lines)
+
+    def stop(self) -> None:
+        """Stop tracing and drop the baseline."""
+        tracemalloc.stop()
+        self.baseline = None
+
+
+CPU_PROFILER = CpuProfiler()
+ALLOCATIONS = AllocationTracker()
@@ -0,0 +1,135 @@
+""""Did you mean" lookups for mistyped command names.
+
+:class:`NgramIndex` maps every letter pair (bigram) to the words containing
+it. A word within edit distance ``k`` of a query shares all but ``2 * k`` of
+the query's bigrams, so a lookup only counts the posting lists of the query's
+bigrams and computes the (bounded) edit distance for the few words passing
+that filter, instead of for every registered name.
+
+:func:`suggest_commands` answers from a bigram index of the visible commands
+and their aliases, built as a memoized :class:`~src.utils.commands.CommandRegistry`
+view, i.e. once after the handler modules have registered their commands.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.utils.commands import CommandRegistry
+
+# How many suggestions the fallback offers
+MAX_SUGGESTIONS = 3
+# Marks the word boundaries, so first and last letters form pairs too
+PAD = "\0"
+
+
+def edit_distance(a: str, b: str, limit: int | None = None) -> int:
+    """Return the Levenshtein distance between ``a`` and ``b``.
+
+    With ``limit`` the computation stops as soon as the distance is known to
+    exceed it and returns ``limit + 1``.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_typo_distance(word: str) -> int:
+    """Edits tolerated in ``word``: one for short names, two otherwise.
+
+    A swapped pair of letters ("hepl") counts as two edits.
+    """
+    return 1 if len(word) <= 3 else 2  # noqa: PLR2004
+
+
+def bigrams(word: str) -> set[str]:
+    """Return the distinct letter pairs of ``word``, padded at both ends."""
+    padded = f"{PAD}{word}{PAD}"
+    return {padded[i : i + 2] for i in range(len(padded) - 1)}
+
+
+class NgramIndex:
+    """Inverted index from letter pairs to the words containing them."""
+
+    __slots__ = ("_postings", "_words")
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        """Index ``words``; duplicates are stored once."""
+        self._words: list[str] = list(dict.fromkeys(words))
+        self._postings: dict[str, list[int]] = {}
+        for index, word in enumerate(self._words):
+            for gram in bigrams(word):
+                self._postings.setdefault(gram, []).append(index)
+
+    def __len__(self) -> int:
+        """Number of indexed words."""
+        return len(self._words)
+
+    def candidates(self, word: str, max_distance: int) -> list[str]:
+        """Return the words that may be within ``max_distance`` of ``word``.
+
+        Each edit destroys at most two of ``word``'s letter pairs, so a match
+        shares at least ``len(bigrams(word)) - 2 * max_distance`` of them.
+        """
+        grams = bigrams(word)
+        needed = len(grams) - 2 * max_distance
+        if needed <= 0:
+            # Too short for the filter to rule anything out
+            return self._words
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for index in self._postings.get(gram, ()):
+                counts[index] = counts.get(index, 0) + 1
+        words = self._words
+        return [words[index] for index, count in counts.items() if count >= needed]
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """Return ``(distance, word)`` pairs within ``max_distance``, closest first."""
+        matches = []
+        for candidate in self.candidates(word, max_distance):
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        matches.sort()
+        return matches
+
+
+def command_index(registry: CommandRegistry) -> NgramIndex:
+    """Return the memoized bigram index of visible command names and aliases."""
+
+    def build() -> NgramIndex:
+        words = []
+        for meta in registry.visible:
+            words.append(meta.name.lower())
+            words.extend(alias.lower() for alias in meta.aliases)
+        return NgramIndex(words)
+
+    return registry.view("suggestions", build)
+
+
+def suggest_commands(
+    name: str, registry: CommandRegistry, limit: int = MAX_SUGGESTIONS
+) -> list[str]:
+    """Return up to ``limit`` registered names closest to the mistyped ``name``."""
+    name = name.lower()
+    matches = command_index(registry).search(name, max_typo_distance(name))
+    return [word for _, word in matches[:limit]]
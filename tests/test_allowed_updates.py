@@ -0,0 +1,69 @@
+"""Tests for deriving ``allowed_updates`` from the registered handlers."""
+
+from __future__ import annotations
+
+from telegram import Update
+from telegram.ext import (
+    Application,
+    ApplicationBuilder,
+    CallbackQueryHandler,
+    CommandHandler,
+    ConversationHandler,
+    PollAnswerHandler,
+    TypeHandler,
+)
+
+from src.core.allowed_updates import derive_allowed_updates, resolve_allowed_updates
+from src.core.dedup import attach_deduplicator
+from src.core.log_context import attach_log_context
+
+
+async def noop(_update: object, _context: object) -> None:
+    """Handler callback that does nothing."""
+
+
+def build_app() -> Application:
+    """Build an application with commands, callbacks and an observer."""
+    app = ApplicationBuilder().token("123456:test").build()
+    attach_log_context(app)
+    attach_deduplicator(app, 100)
+    app.add_handler(TypeHandler(Update, noop), -1000)
+    app.add_handler(CallbackQueryHandler(noop, pattern=r"^btn:"))
+    app.add_handler(CommandHandler("start", noop))
+    app.add_handler(
+        ConversationHandler(
+            entry_points=[CommandHandler("vote", noop)],
+            states={0: [PollAnswerHandler(noop)]},
+            fallbacks=[],
+            per_chat=False,
+        )
+    )
+    return app
+
+
+def test_derive_allowed_updates_from_handlers() -> None:
+    """Handlers map to their update types; observers do not widen the list."""
+    allowed = derive_allowed_updates(build_app())
+    if allowed != ["message", "callback_query", "poll_answer"]:
+        msg = f"Unexpected allowed_updates: {allowed}"
+        raise AssertionError(msg)
+
+
+def test_override_allowed_updates() -> None:
+    """``all`` and explicit lists replace the derived set; typos are rejected."""
+    app = build_app()
+    if resolve_allowed_updates(app, "all") != list(Update.ALL_TYPES):
+        msg = "'all' should request every update type"
+        raise AssertionError(msg)
+    if resolve_allowed_updates(app, "message, edited_message") != [
+        "message",
+        "edited_message",
+    ]:
+        msg = "An explicit list should be used as given"
+        raise AssertionError(msg)
+    try:
+        resolve_allowed_updates(app, "mesage")
+    except ValueError:
+        return
+    msg = "Unknown update types should raise ValueError"
+    raise AssertionError(msg)
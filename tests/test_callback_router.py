@@ -0,0 +1,75 @@
+"""Tests for the callback router and the ``callback_data`` codec."""
+
+from __future__ import annotations
+
+from enum import Enum
+
+from telegram import CallbackQuery, Update, User
+
+from src.core.callback_router import CallbackRouter
+from src.utils.callback_data import CALLBACK_DATA_LIMIT, CallbackData, CallbackDataError
+
+
+class Choice(Enum):
+    """Sample enum field."""
+
+    YES = "yes"
+    NO = "no"
+
+
+VOTE = CallbackData("vote", poll=int, choice=Choice, note=str, final=bool)
+
+
+def make_query(data: str) -> Update:
+    """Build an update carrying a callback query with ``data``."""
+    query = CallbackQuery("1", User(1, "test", is_bot=False), "chat", data=data)
+    return Update(update_id=1, callback_query=query)
+
+
+async def on_vote(update: object = None, context: object = None) -> None:
+    """Stand-in for a callback query handler."""
+
+
+def test_codec_round_trip() -> None:
+    """Typed values survive encoding, including separators inside strings."""
+    values = {"poll": -123456, "choice": Choice.NO, "note": "a.b%c", "final": True}
+    data = VOTE.encode(**values)
+    if VOTE.decode(data) != values:
+        msg = f"Round trip changed {values} into {VOTE.decode(data)} ({data!r})"
+        raise AssertionError(msg)
+    if VOTE.encode(123456, Choice.NO, "hi", final=False) != "vote:U90.1.hi.0":
+        msg = "Positional and keyword values should encode densely"
+        raise AssertionError(msg)
+
+
+def test_codec_rejects_oversized_and_malformed_data() -> None:
+    """Payloads over 64 bytes fail at encode time; wrong data fails to decode."""
+    bad_calls = [
+        lambda: VOTE.encode(1, Choice.YES, "x" * CALLBACK_DATA_LIMIT, final=False),
+        lambda: VOTE.encode(1, "yes", "", final=False),
+        lambda: VOTE.decode("poll:1.0.x.1"),
+        lambda: VOTE.decode("vote:1.9.x.1"),
+    ]
+    for index, call in enumerate(bad_calls):
+        try:
+            call()
+        except CallbackDataError:
+            continue
+        msg = f"Call {index} should raise CallbackDataError"
+        raise AssertionError(msg)
+
+
+def test_router_resolves_prefix_and_falls_through() -> None:
+    """Known prefixes resolve through the index; others are left unclaimed."""
+    router = CallbackRouter()
+    router.add("vote", on_vote)
+    data = VOTE.encode(1, Choice.YES, "", final=False)
+    if router.check_update(make_query(data)) is not on_vote:
+        msg = "Prefixed callback data should resolve to its callback"
+        raise AssertionError(msg)
+    if router.check_update(make_query("vote")) is not on_vote:
+        msg = "A bare prefix should resolve too"
+        raise AssertionError(msg)
+    if router.check_update(make_query("other:1")) is not None:
+        msg = "Unknown prefixes should fall through"
+        raise AssertionError(msg)
@@ -0,0 +1,68 @@
+"""Tests for the startup backlog catch-up policies."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from telegram import Chat, Message, Update
+
+from src.core.catchup import CatchUpQueue
+
+NOW = 1_700_000_000.0
+
+
+def make_update(update_id: int, chat_id: int, age: float) -> Update:
+    """Create a message update sent ``age`` seconds before ``NOW``."""
+    sent = datetime.fromtimestamp(NOW - age, UTC)
+    message = Message(update_id, sent, Chat(chat_id, "private"), text="hi")
+    return Update(update_id, message=message)
+
+
+def test_backlog_drops_stale_updates_and_serves_chats_newest_first() -> None:
+    """Old updates are dropped; each chat's backlog is served newest first."""
+    queue = CatchUpQueue(
+        policies=frozenset({"drop", "newest_first"}),
+        max_age=60,
+        wall_clock=lambda: NOW,
+    )
+    queue.begin(5)
+    backlog = [(1, 10, 120), (2, 10, 50), (3, 20, 45), (4, 10, 40), (5, 10, 30)]
+    for update_id, chat_id, age in backlog:
+        queue.put_nowait(make_update(update_id, chat_id, age))
+    queue.put_nowait(make_update(6, 20, 1))
+    counts = (queue.qsize(), queue.dropped, queue.remaining)
+    if counts != (5, 1, 4):
+        msg = f"Unexpected backlog: {queue.qsize()} queued, {queue.dropped} dropped"
+        raise AssertionError(msg)
+    order = [queue.get_nowait().update_id for _ in range(queue.qsize())]
+    if order != [5, 3, 4, 2, 6]:
+        msg = f"Unexpected order: {order}"
+        raise AssertionError(msg)
+    if queue.remaining or queue.progress != 1.0:
+        msg = f"Catch-up should be complete, {queue.remaining} remain"
+        raise AssertionError(msg)
+
+
+def test_rate_policy_paces_only_the_backlog() -> None:
+    """Backlog updates leave at the capped rate, live updates right away."""
+    queue = CatchUpQueue(policies=frozenset({"rate"}), rate=50, wall_clock=lambda: NOW)
+    queue.begin(5)
+    for update_id in range(5):
+        queue.put_nowait(make_update(update_id, 10, 600))
+
+    async def drain() -> float:
+        started = time.perf_counter()
+        for _ in range(queue.qsize()):
+            await queue.get()
+        return time.perf_counter() - started
+
+    backlog_seconds = asyncio.run(drain())
+    for update_id in range(5, 10):
+        queue.put_nowait(make_update(update_id, 10, 0))
+    live_seconds = asyncio.run(drain())
+    # Four waits of 1/50 s after the first token
+    if backlog_seconds < 0.07 or live_seconds >= 0.07:  # noqa: PLR2004
+        msg = f"Backlog took {backlog_seconds:.3f}s, live {live_seconds:.3f}s"
+        raise AssertionError(msg)
@@ -34,7 +34,7 @@ class DummyApp:
 
 def test_command_registry_and_descriptions(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test the command registry and command descriptions functionality."""
-    registry: list[commands.CommandMeta] = []
+    registry = commands.CommandRegistry()
     monkeypatch.setattr(commands, "COMMAND_REGISTRY", registry, raising=False)
 
     @commands.command("Foo command")
@@ -67,7 +67,7 @@ def test_command_registry_and_descriptions(monkeypatch: pytest.MonkeyPatch) -> N
 
 def test_make_set_commands(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test the make_set_commands utility for setting bot commands."""
-    registry: list[commands.CommandMeta] = []
+    registry = commands.CommandRegistry()
     monkeypatch.setattr(commands, "COMMAND_REGISTRY", registry, raising=False)
 
     @commands.command("Foo")
@@ -85,3 +85,33 @@ def test_make_set_commands(monkeypatch: pytest.MonkeyPatch) -> None:
     if app.bot.received != [BotCommand("foo", "Foo")]:
         msg = f"Expected {[BotCommand('foo', 'Foo')]}, got {app.bot.received}"
         raise AssertionError(msg)
+
+
+def test_registry_views_rebuild_on_registration(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Memoized views are reused until a new command bumps the version."""
+    registry = commands.CommandRegistry()
+    monkeypatch.setattr(commands, "COMMAND_REGISTRY", registry, raising=False)
+
+    @commands.command("Foo")
+    async def foo_command(update: object = None, context: object = None) -> None:
+        pass
+
+    first = registry.bot_commands
+    if registry.bot_commands is not first:
+        msg = "Expected the cached BotCommand list to be reused"
+        raise AssertionError(msg)
+
+    version = registry.version
+
+    @commands.command("Bar")
+    async def bar_command(update: object = None, context: object = None) -> None:
+        pass
+
+    if registry.version != version + 1:
+        msg = f"Expected version {version + 1}, got {registry.version}"
+        raise AssertionError(msg)
+    if commands.get_commands_descriptions() != "/foo — Foo\n/bar — Bar":
+        msg = f"Unexpected help text: {commands.get_commands_descriptions()!r}"
+        raise AssertionError(msg)
@@ -0,0 +1,60 @@
+"""Tests for the bounded user and chat data store."""
+
+from __future__ import annotations
+
+import gc
+import sys
+from typing import TYPE_CHECKING
+
+from src.core.context_store import BoundedContextStore, SqliteSpillStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+USERS = 2_000_000
+CHECKPOINT = 500_000
+
+
+def test_memory_stays_flat_for_millions_of_users() -> None:
+    """Two million distinct users never grow the store past its cap."""
+    store = BoundedContextStore(dict, max_entries=1000, ttl=3600)
+    objects: list[int] = []
+    sizes: list[int] = []
+    for user_id in range(USERS):
+        store[user_id]["last_command"] = "/start"
+        if user_id % CHECKPOINT == CHECKPOINT - 1:
+            gc.collect()
+            objects.append(len(gc.get_objects()))
+            sizes.append(sys.getsizeof(store._entries))  # noqa: SLF001
+    if len(store) != 1000 or store.evictions != USERS - 1000:  # noqa: PLR2004
+        msg = f"Unexpected store state: {store.stats()}"
+        raise AssertionError(msg)
+    if max(objects) - min(objects) > 1000 or len(set(sizes)) != 1:  # noqa: PLR2004
+        msg = f"Memory grew: live objects {objects}, index sizes {sizes}"
+        raise AssertionError(msg)
+
+
+def test_ttl_and_lru_eviction_with_spill(tmp_path: Path) -> None:
+    """Idle and least recently used entries spill and fault back in on access."""
+    now = [0.0]
+    spill = SqliteSpillStore(tmp_path / "spill.sqlite")
+    store = BoundedContextStore(
+        dict, max_entries=2, ttl=60, spill=spill, clock=lambda: now[0]
+    )
+    store[1]["name"] = "one"
+    store[2]["name"] = "two"
+    store[1]  # noqa: B018
+    store[3]["name"] = "three"  # evicts 2, the least recently used
+    now[0] = 120.0
+    store[4]  # noqa: B018  # 1 and 3 are idle past the TTL
+    if list(store) != [4] or (store.evictions, store.expirations) != (1, 2):
+        msg = f"Unexpected eviction: {list(store)} {store.stats()}"
+        raise AssertionError(msg)
+    if store[2] != {"name": "two"} or store.restored != 1:
+        msg = f"Spilled entry was not restored: {store.stats()}"
+        raise AssertionError(msg)
+    store.pop(3, None)
+    if store[3] != {}:
+        msg = "Dropped entries should not come back from the spill store"
+        raise AssertionError(msg)
+    spill.close()
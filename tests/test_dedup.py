@@ -0,0 +1,54 @@
+"""Tests for dropping redelivered updates."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+from telegram import Update
+from telegram.ext import ApplicationBuilder, ApplicationHandlerStop
+
+from src.core.dedup import DEDUP_HANDLER_GROUP, UpdateIdWindow, attach_deduplicator
+
+
+def test_window_drops_duplicates_with_bounded_memory() -> None:
+    """Ids are remembered for ``size`` ids; out-of-order ids inside still count."""
+    window = UpdateIdWindow(1000)
+    size = sys.getsizeof(window._bits)  # noqa: SLF001
+    first = 500_000_000
+    for update_id in range(first, first + 100_000):
+        if not window.add(update_id):
+            msg = f"New update {update_id} was reported as a duplicate"
+            raise AssertionError(msg)
+    last = first + 99_999
+    if window.add(last) or window.add(last - 999) or last - 1000 in window:
+        msg = "Ids inside the window should be duplicates, older ones forgotten"
+        raise AssertionError(msg)
+    if not window.add(last + 5) or not window.add(last + 3) or window.add(last + 3):
+        msg = "Out-of-order ids should be recorded once"
+        raise AssertionError(msg)
+    if not window.add(42) or window.resets != 1:
+        msg = "A restarted id sequence should reset the window"
+        raise AssertionError(msg)
+    grown = sys.getsizeof(window._bits) != size  # noqa: SLF001
+    if grown or window.duplicates != 3:  # noqa: PLR2004
+        msg = f"Unexpected window state: {window.duplicates} duplicates"
+        raise AssertionError(msg)
+
+
+def test_duplicates_stop_before_all_handler_groups() -> None:
+    """The filter claims only redelivered updates and stops their dispatch."""
+    app = ApplicationBuilder().token("123:abc").build()
+    attach_deduplicator(app, 100)
+    group = min(app.handlers)
+    (dedup,) = app.handlers[group]
+    claimed = [dedup.check_update(Update(update_id)) for update_id in (1, 2, 1, 3, 2)]
+    if claimed != [False, False, True, False, True] or group != DEDUP_HANDLER_GROUP:
+        msg = f"Unexpected duplicates {claimed} in group {group}"
+        raise AssertionError(msg)
+    try:
+        asyncio.run(dedup.handle_update(Update(1), app, True, None))
+    except ApplicationHandlerStop:
+        return
+    msg = "Duplicates should raise ApplicationHandlerStop"
+    raise AssertionError(msg)
@@ -0,0 +1,70 @@
+"""Tests for the indexed command dispatcher."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from src.core.dispatcher import CommandDispatcher, build_command_index
+from src.utils.commands import CommandMeta
+from telegram import Chat, Message, MessageEntity, Update
+
+
+class DummyBot:
+    """Bot stub exposing only the username."""
+
+    username = "test_bot"
+
+
+def make_update(text: str, offset: int = 0) -> Update:
+    """Build an update with a bot command entity at ``offset``."""
+    length = len(text[offset:].split()[0])
+    message = Message(
+        message_id=1,
+        date=datetime.now(UTC),
+        chat=Chat(1, Chat.PRIVATE),
+        text=text,
+        entities=[MessageEntity(MessageEntity.BOT_COMMAND, offset, length)],
+    )
+    message.set_bot(DummyBot())
+    return Update(update_id=1, message=message)
+
+
+async def foo(update: object = None, context: object = None) -> None:
+    """Stand-in for a command callback."""
+
+
+async def bar(update: object = None, context: object = None) -> None:
+    """Stand-in for a second command callback."""
+
+
+def test_dispatcher_resolves_commands_and_aliases() -> None:
+    """Commands and aliases resolve through the index; first registration wins."""
+    registry = [
+        CommandMeta(name="foo", func=foo, description="Foo", aliases=["f"]),
+        CommandMeta(name="bar", func=bar, description="Bar", aliases=["f"]),
+    ]
+    dispatcher = CommandDispatcher(build_command_index(registry))
+
+    result = dispatcher.check_update(make_update("/F@Test_Bot one two"))
+    if result != (foo, ["one", "two"]):
+        msg = f"Expected alias to resolve to foo with args, got {result}"
+        raise AssertionError(msg)
+    if dispatcher.check_update(make_update("/bar"))[0] is not bar:
+        msg = "Expected /bar to resolve to bar"
+        raise AssertionError(msg)
+
+
+def test_dispatcher_falls_through() -> None:
+    """Unknown commands and commands for other bots are left unclaimed."""
+    registry = [CommandMeta(name="foo", func=foo, description="Foo")]
+    dispatcher = CommandDispatcher(build_command_index(registry))
+
+    updates = {
+        "/missing": make_update("/missing"),
+        "/foo@other_bot": make_update("/foo@other_bot"),
+        "hello /foo": make_update("hello /foo", offset=6),
+    }
+    for text, update in updates.items():
+        if dispatcher.check_update(update) is not None:
+            msg = f"Expected {text!r} to fall through"
+            raise AssertionError(msg)
@@ -0,0 +1,74 @@
+"""Tests for error grouping and notice rate limits."""
+
+from __future__ import annotations
+
+from src.core.error_handler import (
+    MAX_ERROR_GROUPS,
+    MAX_NOTICE_CHATS,
+    ErrorTracker,
+    error_fingerprint,
+)
+
+
+def fail(user_id: int) -> Exception:
+    """Raise and return an error whose message differs per user."""
+    try:
+        msg = f"Timed out for user {user_id}"
+        raise TimeoutError(msg)  # noqa: TRY301
+    except TimeoutError as exc:
+        return exc
+
+
+def test_storm_logs_one_traceback_per_window() -> None:
+    """Identical failures share a fingerprint and only the first is logged."""
+    now = [0.0]
+    tracker = ErrorTracker(window=60, clock=lambda: now[0])
+    logged = [tracker.record(fail(user_id))[1] for user_id in range(1000)]
+    if logged.count(True) != 1 or len(tracker) != 1:
+        msg = f"Expected one traceback and group, got {logged.count(True)}"
+        raise AssertionError(msg)
+    if error_fingerprint(fail(1)) == error_fingerprint(ValueError("other")):
+        msg = "Different exception types should not share a fingerprint"
+        raise AssertionError(msg)
+    now[0] = 61.0
+    group, logged_again = tracker.record(fail(0))
+    if not logged_again or group.total != 1001 or group.suppressed:  # noqa: PLR2004
+        msg = f"Traceback should be logged again after the window: {group}"
+        raise AssertionError(msg)
+    digest = tracker.digest(300) or ""
+    expected = ("⚠️ 1001 errors", "\n1001× TimeoutError")
+    if not digest.startswith(expected[0]) or expected[1] not in digest:
+        msg = f"Unexpected digest: {digest!r}"
+        raise AssertionError(msg)
+    if tracker.digest(300) is not None:
+        msg = "The digest should reset its counts"
+        raise AssertionError(msg)
+
+
+def test_notices_are_limited_per_chat_and_globally() -> None:
+    """Each chat gets one notice per interval within a global token bucket."""
+    now = [0.0]
+    tracker = ErrorTracker(
+        chat_interval=60, notice_rate=1, notice_burst=3, clock=lambda: now[0]
+    )
+    allowed = [tracker.allow_notice(chat_id) for chat_id in (1, 1, 2, 3, 4)]
+    if allowed != [True, False, True, True, False]:
+        msg = f"Unexpected notices: {allowed}"
+        raise AssertionError(msg)
+    for second in range(1, 3 * MAX_NOTICE_CHATS):
+        now[0] = float(second)
+        tracker.allow_notice(second)
+    remembered = len(tracker._noticed)  # noqa: SLF001
+    if remembered > 60 or not tracker.allow_notice(1):  # noqa: PLR2004
+        msg = "Chats whose interval is over should be forgotten"
+        raise AssertionError(msg)
+
+
+def test_error_groups_are_bounded() -> None:
+    """Unbounded distinct errors never grow the tracker past its cap."""
+    tracker = ErrorTracker()
+    for index in range(MAX_ERROR_GROUPS * 4):
+        tracker.record(type(f"Error{index}", (Exception,), {})())
+    if len(tracker) != MAX_ERROR_GROUPS:
+        msg = f"Tracker holds {len(tracker)} groups"
+        raise AssertionError(msg)
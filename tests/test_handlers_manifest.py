@@ -0,0 +1,65 @@
+"""Tests for the static handler manifest."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.handlers_manifest import build_manifest, scan_source
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MODULE_SOURCE = '''
+from src.utils.commands import command
+
+__callbacks__ = {"on_button": {"pattern": r"^btn:"}}
+
+
+@command("Say hi", aliases=["hi"], admin_only=True)
+async def greet_command(update, context):
+    pass
+'''
+
+
+def test_scan_source_extracts_commands_and_callbacks() -> None:
+    """Decorator arguments and ``__callbacks__`` are read without importing."""
+    static, found, callbacks = scan_source(MODULE_SOURCE)
+    expected = {
+        "name": "greet",
+        "attr": "greet_command",
+        "description": "Say hi",
+        "hidden": False,
+        "admin_only": True,
+        "aliases": ["hi"],
+    }
+    if not static or found != [expected]:
+        msg = f"Unexpected scan result: static={static} commands={found}"
+        raise AssertionError(msg)
+    if callbacks != {"on_button": {"pattern": "^btn:"}}:
+        msg = f"Unexpected callbacks: {callbacks}"
+        raise AssertionError(msg)
+
+    dynamic = MODULE_SOURCE.replace('"Say hi"', "DESCRIPTION")
+    if scan_source(dynamic)[0]:
+        msg = "Expected non-literal decorator arguments to disable static loading"
+        raise AssertionError(msg)
+
+
+def test_manifest_cache_invalidated_by_content(tmp_path: Path) -> None:
+    """A cached entry is rescanned once the module content changes."""
+    package = tmp_path / "pkg"
+    package.mkdir()
+    module = package / "greet.py"
+    module.write_text(MODULE_SOURCE, encoding="utf-8")
+    cache_file = tmp_path / "manifest.json"
+
+    first = build_manifest(package, "pkg", cache_file)
+    if not cache_file.exists() or first[0].commands[0]["description"] != "Say hi":
+        msg = "Expected the manifest to be written to the cache file"
+        raise AssertionError(msg)
+
+    module.write_text(MODULE_SOURCE.replace("Say hi", "Say hello"), encoding="utf-8")
+    second = build_manifest(package, "pkg", cache_file)
+    if second[0].commands[0]["description"] != "Say hello":
+        msg = f"Expected a rescanned description, got {second[0].commands}"
+        raise AssertionError(msg)
@@ -0,0 +1,38 @@
+"""Tests for the instrumented Bot API connection pools."""
+
+from __future__ import annotations
+
+import asyncio
+
+from telegram.error import TimedOut
+
+from src.core.http import POOL_SATURATED, POOL_WAIT, InstrumentedHTTPXRequest
+
+
+def test_saturated_pool_waits_and_times_out() -> None:
+    """Calls beyond the pool size wait, are counted and fail after the timeout."""
+
+    async def scenario() -> tuple[bool, bool]:
+        request = InstrumentedHTTPXRequest("test-saturated", 1)
+        await request._acquire(1.0)  # noqa: SLF001
+        timed_out = False
+        try:
+            await request._acquire(0.01)  # noqa: SLF001
+        except TimedOut:
+            timed_out = True
+        waiter = asyncio.create_task(request._acquire(1.0))  # noqa: SLF001
+        await asyncio.sleep(0.02)
+        request._slots.release()  # noqa: SLF001
+        await waiter
+        await request.shutdown()
+        return timed_out, waiter.done()
+
+    timed_out, acquired = asyncio.run(scenario())
+    if not timed_out or not acquired:
+        msg = f"Expected a timeout then a successful wait, got {timed_out, acquired}"
+        raise AssertionError(msg)
+    saturated = POOL_SATURATED.labels("test-saturated").value
+    wait = POOL_WAIT.labels("test-saturated")
+    if saturated != 2 or wait.count != 2:  # noqa: PLR2004
+        msg = f"Expected 2 saturated waits, got {saturated} / {wait.count}"
+        raise AssertionError(msg)
@@ -0,0 +1,153 @@
+"""Tests for the queued logging pipeline and structured log records."""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from datetime import UTC, datetime
+
+from telegram import Chat, Message, Update, User
+
+from src.core.log_context import LogContextHandler
+from src.utils.logger import (
+    UPDATE_CONTEXT,
+    BoundedQueueHandler,
+    JsonFormatter,
+    LogQueueListener,
+    SampledLogger,
+    record_factory,
+)
+
+
+class RecordingHandler(logging.Handler):
+    """Handler that keeps emitted messages in memory."""
+
+    def __init__(self) -> None:
+        """Initialize with an empty message list."""
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Store the formatted message."""
+        self.messages.append(self.format(record))
+
+
+def make_record(level: int, msg: str) -> logging.LogRecord:
+    """Create a log record at ``level``."""
+    return logging.LogRecord("bot_bot", level, __file__, 1, msg, None, None)
+
+
+def test_overflow_policies() -> None:
+    """Full queues drop DEBUG first under drop_debug and everything under count."""
+    target = RecordingHandler()
+
+    debug_queue: queue.Queue = queue.Queue(maxsize=2)
+    drop_debug = BoundedQueueHandler(debug_queue, [target], "drop_debug")
+    drop_debug.handle(make_record(logging.INFO, "kept"))
+    drop_debug.handle(make_record(logging.DEBUG, "dropped"))
+    if drop_debug.dropped != 1 or debug_queue.qsize() != 1:
+        msg = f"Expected one dropped DEBUG record, got {drop_debug.dropped}"
+        raise AssertionError(msg)
+
+    count_queue: queue.Queue = queue.Queue(maxsize=1)
+    counting = BoundedQueueHandler(count_queue, [target], "count")
+    counting.handle(make_record(logging.ERROR, "first"))
+    counting.handle(make_record(logging.ERROR, "second"))
+    if counting.dropped != 1:
+        msg = f"Expected one dropped record, got {counting.dropped}"
+        raise AssertionError(msg)
+
+
+def test_block_policy_waits_instead_of_dropping() -> None:
+    """Under block a full queue delays every record, DEBUG included."""
+    log_queue: queue.Queue = queue.Queue(maxsize=1)
+    blocking = BoundedQueueHandler(log_queue, [RecordingHandler()], "block")
+    blocking.handle(make_record(logging.INFO, "first"))
+    writer = threading.Thread(
+        target=blocking.handle, args=(make_record(logging.DEBUG, "waiting"),)
+    )
+    writer.start()
+    writer.join(0.05)
+    if not writer.is_alive():
+        msg = "The DEBUG record should wait for a free slot"
+        raise AssertionError(msg)
+    log_queue.get_nowait()
+    writer.join(1)
+    _, record = log_queue.get_nowait()
+    if blocking.dropped or record.msg != "waiting":
+        msg = f"Expected the DEBUG record to be queued, dropped {blocking.dropped}"
+        raise AssertionError(msg)
+
+
+def test_listener_emits_to_targets() -> None:
+    """The listener formats records on its thread and respects handler levels."""
+    info_target = RecordingHandler()
+    error_target = RecordingHandler()
+    error_target.setLevel(logging.ERROR)
+    log_queue: queue.Queue = queue.Queue(maxsize=10)
+    handler = BoundedQueueHandler(log_queue, [info_target, error_target], "block")
+
+    listener = LogQueueListener(log_queue)
+    listener.start()
+    handler.handle(make_record(logging.INFO, "hello %s"))
+    handler.handle(make_record(logging.ERROR, "boom"))
+    listener.stop()
+
+    if info_target.messages != ["hello %s", "boom"]:
+        msg = f"Unexpected messages: {info_target.messages}"
+        raise AssertionError(msg)
+    if error_target.messages != ["boom"]:
+        msg = f"Unexpected error messages: {error_target.messages}"
+        raise AssertionError(msg)
+
+
+def test_json_records_carry_the_update_context() -> None:
+    """Records logged while an update is dispatched carry its ids and command."""
+    message = Message(
+        1,
+        datetime.now(UTC),
+        Chat(-100, "group"),
+        from_user=User(42, "Ann", is_bot=False),
+        text="/start@bench_bot now",
+    )
+    token = UPDATE_CONTEXT.set(None)
+    try:
+        claimed = LogContextHandler().check_update(Update(7, message=message))
+        record = record_factory(
+            "bot_bot", logging.INFO, __file__, 1, "hi %s", ("ann",), None
+        )
+    finally:
+        UPDATE_CONTEXT.reset(token)
+    line = JsonFormatter().format(record)
+    data = json.loads(line)
+    expected = {
+        "message": "hi ann",
+        "level": "INFO",
+        "update_id": 7,
+        "chat_id": -100,
+        "user_id": 42,
+        "command": "start",
+    }
+    if claimed or "\n" in line or data.items() < expected.items():
+        msg = f"Unexpected JSON record: {line}"
+        raise AssertionError(msg)
+
+
+def test_sampled_logger_keeps_a_share_of_debug_records() -> None:
+    """DEBUG records are sampled before they are built; other levels pass."""
+    target = RecordingHandler()
+    base = logging.getLogger("tests.sampled")
+    base.setLevel(logging.DEBUG)
+    base.propagate = False
+    base.addHandler(target)
+    never, always = SampledLogger(base, 0.0), SampledLogger(base, 1.0)
+    for _ in range(100):
+        never.debug("never")
+        always.debug("always")
+    never.info("info")
+    base.removeHandler(target)
+    if target.messages != ["always"] * 100 + ["info"]:
+        msg = f"Unexpected sampling: {len(target.messages)} records"
+        raise AssertionError(msg)
@@ -0,0 +1,83 @@
+"""Tests for Markdown escaping and MarkdownV2 message templates."""
+
+from __future__ import annotations
+
+from telegram.helpers import escape_markdown as ptb_escape_markdown
+
+from src.utils.markdown import MarkdownTemplate, escape_many, escape_markdown
+
+SAMPLE = "a\\b_c*d[e]f(g)h~i`j>k#l+m-n=o|p{q}r.s!t"
+ENTITY_TYPES = [(1, None), (2, None), (2, "pre"), (2, "code"), (2, "text_link")]
+
+
+def test_escape_tables_match_telegram_rules() -> None:
+    """Every version and entity type escapes exactly like PTB's helper."""
+    for version, entity_type in [*ENTITY_TYPES, ("2", None), (2, "bold")]:
+        escaped = escape_markdown(SAMPLE, version, entity_type)
+        expected = ptb_escape_markdown(SAMPLE, int(version), entity_type)
+        if escaped != expected:
+            msg = f"V{version} {entity_type}: {escaped!r} != {expected!r}"
+            raise AssertionError(msg)
+    try:
+        escape_markdown(SAMPLE, 3)
+    except ValueError:
+        return
+    msg = "Unknown Markdown versions should raise ValueError"
+    raise AssertionError(msg)
+
+
+def test_escape_many_escapes_lists_and_mappings() -> None:
+    """Iterables give lists, mappings keep their keys; values go through str()."""
+    for version, entity_type in ENTITY_TYPES:
+        values = [SAMPLE, "plain", 1.5, ""]
+        expected = [
+            escape_markdown(str(value), version, entity_type) for value in values
+        ]
+        escaped = escape_many(iter(values), version, entity_type)
+        if escaped != expected:
+            msg = f"V{version} {entity_type}: {escaped!r} != {expected!r}"
+            raise AssertionError(msg)
+        mapping = escape_many(dict(enumerate(values)), version, entity_type)
+        if mapping != dict(enumerate(expected)):
+            msg = f"V{version} {entity_type}: {mapping!r}"
+            raise AssertionError(msg)
+
+
+def test_template_escapes_literals_once_and_values_by_type() -> None:
+    """Static text and each placeholder type get their own escaping."""
+    template = MarkdownTemplate(
+        "Hi {name}! ID: {user_id:code}, {title:bold}, see {docs:link} {{ok}}."
+    )
+    text = template.render(
+        name="a_b.c",
+        user_id="12`3",
+        title="v1.0",
+        docs=("the docs", "https://example.com/a_(b)"),
+    )
+    expected = (
+        "Hi a\\_b\\.c\\! ID: `12\\`3`, *v1\\.0*, "
+        "see [the docs](https://example.com/a_(b\\)) \\{ok\\}\\."
+    )
+    if text != expected:
+        msg = f"Unexpected rendering: {text!r}"
+        raise AssertionError(msg)
+
+
+def test_template_matches_escaping_everything() -> None:
+    """Plain placeholders render exactly like escaping the formatted text."""
+    template = MarkdownTemplate("/{name} — {description}")
+    values = {"name": "set_limit", "description": "Set the limit (1-10)."}
+    expected = escape_markdown("/{name} — {description}".format(**values))
+    if template.render(**values) != expected:
+        msg = f"{template.render(**values)!r} != {expected!r}"
+        raise AssertionError(msg)
+
+
+def test_template_rejects_unknown_placeholder_types() -> None:
+    """Typos in placeholder types fail when the template is created."""
+    try:
+        MarkdownTemplate("{name:italics}")
+    except ValueError:
+        return
+    msg = "Unknown placeholder types should raise ValueError"
+    raise AssertionError(msg)
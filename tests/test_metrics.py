@@ -0,0 +1,66 @@
+"""Tests for the in-process metrics registry."""
+
+from __future__ import annotations
+
+import asyncio
+
+from src.utils.metrics import METRICS, MetricsRegistry, instrument_command
+
+
+def test_render_prometheus_text() -> None:
+    """Counters, callback gauges and histograms render in exposition format."""
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ("command",))
+    calls.labels('say "hi"').inc(2)
+    registry.gauge("depth", "Depth.", function=lambda: 7)
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+
+    lines = registry.render().splitlines()
+    expected = [
+        "# TYPE calls_total counter",
+        'calls_total{command="say \\"hi\\""} 2',
+        "# TYPE depth gauge",
+        "depth 7",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 3.55",
+        "latency_seconds_count 3",
+    ]
+    missing = [line for line in expected if line not in lines]
+    if missing:
+        msg = f"Missing lines {missing} in:\n" + "\n".join(lines)
+        raise AssertionError(msg)
+
+
+def test_instrument_command_records_calls_and_errors() -> None:
+    """Every invocation is counted, timed and exceptions are recorded by type."""
+
+    async def flaky_command(fail: bool) -> None:  # noqa: FBT001
+        if fail:
+            msg = "boom"
+            raise ValueError(msg)
+
+    wrapped = instrument_command("flaky_test", flaky_command)
+    asyncio.run(wrapped(False))  # noqa: FBT003
+    try:
+        asyncio.run(wrapped(True))  # noqa: FBT003
+    except ValueError:
+        pass
+    else:
+        msg = "Expected the wrapped command to re-raise"
+        raise AssertionError(msg)
+
+    text = METRICS.render()
+    for line in (
+        'bot_command_calls_total{command="flaky_test"} 2',
+        'bot_command_errors_total{command="flaky_test",exception="ValueError"} 1',
+        'bot_command_duration_seconds_count{command="flaky_test"} 2',
+        'bot_command_in_flight{command="flaky_test"} 0',
+    ):
+        if line not in text.splitlines():
+            msg = f"Missing {line!r} in metrics output"
+            raise AssertionError(msg)
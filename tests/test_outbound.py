@@ -0,0 +1,115 @@
+"""Tests for the outbound send scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from src.core.outbound import OutboundScheduler
+from telegram.error import RetryAfter
+
+
+class FloodBot:
+    """Bot stub that answers with 429 ``RetryAfter`` on selected calls."""
+
+    def __init__(self, flood_on: set[int] | None = None) -> None:
+        """Initialize the stub with the call numbers that should fail."""
+        self.flood_on = flood_on or set()
+        self.calls = 0
+        self.sent: list[tuple[int, str]] = []
+
+    async def do_post(self, endpoint: str, data: dict[str, Any], **_: Any) -> dict:
+        """Record a sendMessage call or raise a flood error."""
+        self.calls += 1
+        if self.calls in self.flood_on:
+            raise RetryAfter(0.01)  # type: ignore[arg-type]
+        self.sent.append((data["chat_id"], data["text"]))
+        return {"endpoint": endpoint, "message_id": self.calls}
+
+
+async def send(
+    scheduler: OutboundScheduler, bot: FloodBot, chat_id: int, text: str
+) -> Any:  # noqa: ANN401
+    """Send a message through the scheduler the way ``ExtBot`` would."""
+    data = {"chat_id": chat_id, "text": text}
+    return await scheduler.process_request(
+        callback=bot.do_post,
+        args=("sendMessage", data),
+        kwargs={},
+        endpoint="sendMessage",
+        data=data,
+        rate_limit_args=None,
+    )
+
+
+def test_retry_after_keeps_per_chat_order() -> None:
+    """A 429 is retried automatically and each chat's messages stay in order."""
+    bot = FloodBot(flood_on={3})
+    scheduler = OutboundScheduler(global_rate=1000, chat_rate=1000, chat_burst=10)
+
+    async def scenario() -> list[Any]:
+        await scheduler.initialize()
+        try:
+            return await asyncio.gather(
+                *(
+                    send(scheduler, bot, chat_id, f"{chat_id}-{i}")
+                    for i in range(4)
+                    for chat_id in (1, 2, 3)
+                )
+            )
+        finally:
+            await scheduler.shutdown()
+
+    results = asyncio.run(scenario())
+
+    expected = 12
+    if len(results) != expected or scheduler.sent != expected or scheduler.retried != 1:
+        msg = f"Unexpected counters: sent={scheduler.sent} retried={scheduler.retried}"
+        raise AssertionError(msg)
+    for chat_id in (1, 2, 3):
+        texts = [text for chat, text in bot.sent if chat == chat_id]
+        if texts != [f"{chat_id}-{i}" for i in range(4)]:
+            msg = f"Chat {chat_id} received messages out of order: {texts}"
+            raise AssertionError(msg)
+
+
+def test_per_chat_rate_is_enforced() -> None:
+    """Messages to one chat are spaced according to the per-chat bucket."""
+    bot = FloodBot()
+    scheduler = OutboundScheduler(global_rate=1000, chat_rate=50, chat_burst=1)
+
+    async def scenario() -> float:
+        await scheduler.initialize()
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(send(scheduler, bot, 7, str(i)) for i in range(5)))
+        finally:
+            await scheduler.shutdown()
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(scenario())
+    if elapsed < 0.07:  # noqa: PLR2004
+        msg = f"Expected at least ~0.08s for 5 messages at 50/s, took {elapsed:.3f}s"
+        raise AssertionError(msg)
+
+
+def test_coalesces_consecutive_messages() -> None:
+    """Queued messages to the same chat are merged into one API call."""
+    bot = FloodBot()
+    scheduler = OutboundScheduler(global_rate=1000, chat_rate=1000, coalesce=True)
+
+    async def scenario() -> list[Any]:
+        await scheduler.initialize()
+        try:
+            return await asyncio.gather(*(send(scheduler, bot, 5, t) for t in "abc"))
+        finally:
+            await scheduler.shutdown()
+
+    results = asyncio.run(scenario())
+    if bot.sent != [(5, "a\nb\nc")] or scheduler.coalesced != 2:  # noqa: PLR2004
+        msg = f"Expected one merged message, got {bot.sent}"
+        raise AssertionError(msg)
+    if len({id(result) for result in results}) != 1:
+        msg = "Expected every caller to receive the merged message result"
+        raise AssertionError(msg)
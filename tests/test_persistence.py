@@ -0,0 +1,144 @@
+"""Tests for the SQLite persistence."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+from benchmarks import bench_persistence
+from src import config
+from src.core import runner
+from src.core.context_store import BoundedContextStore
+from src.core.persistence import SqlitePersistence
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_flush_writes_only_changed_keys(tmp_path: Path) -> None:
+    """Buffered changes survive a restart; drops and conversations round-trip."""
+    path = tmp_path / "bot.sqlite"
+
+    async def first_run() -> None:
+        persistence = SqlitePersistence(path, flush_interval=60, batch_size=3)
+        await persistence.update_user_data(1, {"lang": "en"})
+        await persistence.update_user_data(2, {"lang": "de"})
+        if persistence.load("user_data", 2) != {"lang": "de"}:
+            msg = "Buffered changes should be visible before they are flushed"
+            raise AssertionError(msg)
+        # The third dirty key reaches the batch size and starts a flush
+        await persistence.update_chat_data(-5, {"title": "group"})
+        await asyncio.sleep(0.2)
+        if persistence._dirty:  # noqa: SLF001
+            msg = f"Batch was not flushed: {persistence._dirty}"  # noqa: SLF001
+            raise AssertionError(msg)
+        await persistence.drop_user_data(2)
+        await persistence.update_bot_data({"started": 1})
+        await persistence.update_conversation("signup", (7, 7), "NAME")
+        await persistence.flush()
+
+    async def second_run() -> SqlitePersistence:
+        persistence = SqlitePersistence(path)
+        if await persistence.get_user_data() != {}:
+            msg = "Lazy persistence should not read user data at startup"
+            raise AssertionError(msg)
+        conversations = await persistence.get_conversations("signup")
+        if (await persistence.get_bot_data(), conversations) != (
+            {"started": 1},
+            {(7, 7): "NAME"},
+        ):
+            msg = "Bot data or conversation state was not persisted"
+            raise AssertionError(msg)
+        return persistence
+
+    asyncio.run(first_run())
+    persistence = asyncio.run(second_run())
+    store = BoundedContextStore(dict, 10, spill=persistence, kind="user_data")
+    if (store[1], store[2], store.restored) != ({"lang": "en"}, {}, 1):
+        msg = f"Unexpected lazy load: {store[1]}, {store[2]}, {store.stats()}"
+        raise AssertionError(msg)
+    eager = SqlitePersistence(path, lazy=False)
+    if asyncio.run(eager.get_chat_data()) != {-5: {"title": "group"}}:
+        msg = "Eager persistence should load all chat data"
+        raise AssertionError(msg)
+    asyncio.run(persistence.flush())
+    asyncio.run(eager.flush())
+
+
+def test_flush_persists_the_data_as_it_was_when_the_flush_began(
+    tmp_path: Path,
+) -> None:
+    """Handlers mutating a dict mid-flush never reach the writer thread."""
+    path = tmp_path / "bot.sqlite"
+    data = {"lang": "en"}
+    mutated = threading.Event()
+
+    async def scenario() -> None:
+        persistence = SqlitePersistence(path, flush_interval=60)
+        write = persistence._write  # noqa: SLF001
+
+        def delayed_write(*args: object) -> None:
+            mutated.wait(5)
+            write(*args)
+
+        persistence._write = delayed_write  # noqa: SLF001
+        await persistence.update_user_data(1, data)
+        flush = asyncio.create_task(persistence._flush())  # noqa: SLF001
+        await asyncio.sleep(0)
+        # A handler changes the dict while the batch is being written
+        data["lang"] = "de"
+        mutated.set()
+        await flush
+        await persistence.flush()
+
+    asyncio.run(scenario())
+    persistence = SqlitePersistence(path)
+    stored = persistence.load("user_data", 1)
+    asyncio.run(persistence.flush())
+    if stored != {"lang": "en"}:
+        msg = f"The flush should write the data as it began, got {stored}"
+        raise AssertionError(msg)
+
+
+def test_application_spills_context_data_to_the_persistence(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """With PERSISTENCE_FILE set, the lazy context stores load from the database."""
+    monkeypatch.setattr(runner, "BOT_TOKEN", "123456:test")
+    monkeypatch.setattr(runner, "PERSISTENCE_FILE", str(tmp_path / "bot.sqlite"))
+    monkeypatch.setattr(runner, "PERSISTENCE_LAZY", True)  # noqa: FBT003
+    app = runner.create_application(metrics_port=0)
+    persistence = app.persistence
+    spills = {store.spill for store in (app._user_data, app._chat_data)}  # noqa: SLF001
+    asyncio.run(persistence.flush())
+    if not isinstance(persistence, SqlitePersistence) or spills != {persistence}:
+        msg = f"Context stores should spill to the persistence, not {spills}"
+        raise AssertionError(msg)
+
+
+def test_persistence_benchmark_runs() -> None:
+    """The PicklePersistence comparison seeds and measures a tiny store."""
+    rows = asyncio.run(bench_persistence.run([20], 10.0))
+    if [(size, name) for size, name, *_ in rows] != [(20, "pickle"), (20, "sqlite")]:
+        msg = f"Unexpected benchmark rows: {rows}"
+        raise AssertionError(msg)
+
+
+def test_persistence_is_refused_with_multiple_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Workers would overwrite each other's data in a shared PERSISTENCE_FILE."""
+    monkeypatch.setattr(config, "BOT_TOKEN", "123456:test")
+    monkeypatch.setattr(config, "WEBHOOK_URL", "https://example.com/hook")
+    monkeypatch.setattr(config, "PERSISTENCE_FILE", "bot.sqlite")
+    config.validate_config("webhook", 1)
+    config.validate_config("polling", 4)
+    try:
+        config.validate_config("webhook", 4)
+    except ValueError:
+        return
+    msg = "PERSISTENCE_FILE with several workers should be rejected"
+    raise AssertionError(msg)
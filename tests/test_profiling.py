@@ -0,0 +1,109 @@
+"""Tests for the on-demand profilers."""
+
+from __future__ import annotations
+
+import asyncio
+import marshal
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from telegram import Update
+from telegram.ext import ApplicationBuilder, CommandHandler, TypeHandler
+
+from benchmarks._util import StubRequest, make_command_update
+from src import config
+from src.handlers import profiling
+from src.utils.profiling import CPU_PROFILER, AllocationTracker, CpuProfiler
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def busy_function() -> int:
+    """Burn a little CPU so it shows up in the profile."""
+    return sum(i * i for i in range(20000))
+
+
+def test_cpu_profiler_summarizes_top_functions() -> None:
+    """A session lists profiled functions and can be dumped as pstats data."""
+    profiler = CpuProfiler()
+    profiler.start()
+    busy_function()
+    profiler.stop()
+
+    if profiler.active:
+        msg = "Expected the profiler to be idle after stop()"
+        raise AssertionError(msg)
+    summary = profiler.summary(limit=50)
+    if "(busy_function)" not in summary:
+        msg = f"Expected busy_function in summary:\n{summary}"
+        raise AssertionError(msg)
+    if not isinstance(marshal.loads(profiler.dump()), dict):  # noqa: S302
+        msg = "Expected the dump to hold pstats data"
+        raise AssertionError(msg)
+
+
+def test_allocation_tracker_reports_growth() -> None:
+    """A diff after a snapshot shows the site that allocated in between."""
+    tracker = AllocationTracker()
+    try:
+        tracker.snapshot()
+        tracker.snapshot()
+        retained = [bytearray(1024) for _ in range(200)]
+        report = tracker.diff()
+    finally:
+        tracker.stop()
+
+    if "test_profiling.py" not in report:
+        msg = f"Expected this test file in the diff:\n{report}"
+        raise AssertionError(msg)
+    if tracemalloc.is_tracing() or not retained:
+        msg = "Expected tracing to be stopped"
+        raise AssertionError(msg)
+
+
+def test_session_end_inside_an_update_keeps_dispatching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The update ending a session, or /profile stop, still reaches group 0."""
+    monkeypatch.setattr(config, "ADMIN_ID", 42)
+    request = StubRequest()
+    app = ApplicationBuilder().token("123456:test").request(request).build()
+    app.add_handler(CommandHandler("profile", profiling.profile_command))
+    seen: list[int] = []
+
+    async def record(update: Update, _context: object) -> None:
+        seen.append(update.update_id)
+
+    app.add_handler(TypeHandler(Update, record), 1)
+
+    async def scenario() -> None:
+        async with app:
+            texts = ["/profile start 2u", "a", "b", "/profile start 5u"]
+            for update_id, text in enumerate([*texts, "/profile stop"], 1):
+                update = make_command_update(
+                    text, app.bot, update_id=update_id, user_id=42
+                )
+                await app.process_update(update)
+
+    asyncio.run(scenario())
+    if seen != [1, 2, 3, 4, 5] or request.calls["sendMessage"] != 4:  # noqa: PLR2004
+        msg = f"Updates lost while ending sessions: {seen}, {request.calls}"
+        raise AssertionError(msg)
+    if profiling.PROFILE_HANDLER_GROUP in app.handlers or CPU_PROFILER.active:
+        msg = "The update counter should be unhooked after the session"
+        raise AssertionError(msg)
+
+
+def test_parse_limit_rejects_non_positive_limits() -> None:
+    """Zero, negative and infinite limits are usage errors."""
+    if profiling.parse_limit("30s") != (30, None):
+        msg = "Expected a 30 second limit"
+        raise AssertionError(msg)
+    for arg in ("0u", "-5u", "0s", "-1", "inf", "nan"):
+        try:
+            profiling.parse_limit(arg)
+        except ValueError:
+            continue
+        msg = f"{arg!r} should be rejected"
+        raise AssertionError(msg)
@@ -0,0 +1,45 @@
+"""Tests for the update recorder."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from telegram import Update
+
+from src.core.recorder import UpdateRecorder, read_recording
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+RAW_UPDATE = {
+    "update_id": 7,
+    "message": {
+        "message_id": 1,
+        "date": 1700000000,
+        "chat": {"id": 42, "type": "private"},
+        "text": "/start",
+    },
+}
+
+
+def test_recording_round_trip(tmp_path: Path) -> None:
+    """Recorded updates read back in order; a torn last line is skipped."""
+    path = tmp_path / "records" / "updates.jsonl"
+    recorder = UpdateRecorder(path)
+    recorder.record({"update_id": 6}, ts=1.5)
+    asyncio.run(recorder.record_update(Update.de_json(RAW_UPDATE, None), None))
+    recorder.close()
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"ts": 3.0, "upd')
+
+    entries = list(read_recording(path))
+    if [ts for ts, _ in entries][:1] != [1.5] or len(entries) != 2:  # noqa: PLR2004
+        msg = f"Unexpected entries: {entries}"
+        raise AssertionError(msg)
+    recorded = entries[1][1]
+    if recorded["update_id"] != RAW_UPDATE["update_id"] or (
+        recorded["message"]["text"] != "/start"
+    ):
+        msg = f"Expected the recorded update back, got {recorded}"
+        raise AssertionError(msg)
@@ -0,0 +1,127 @@
+"""Tests for hot reloading handler modules."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from typing import TYPE_CHECKING
+
+from telegram.ext import Application, ApplicationBuilder
+
+from src.core.reload import DISPATCH_GROUP, HandlerReloader, HandlerTable
+from src.handlers_loader import register_handlers
+from src.utils import commands
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+MODULE_SOURCE = '''
+from src.utils.commands import command
+
+
+@command("{description}")
+async def greet_command(update, context):
+    return "{reply}"
+'''
+
+
+def make_reloader(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str
+) -> tuple[Application, HandlerReloader, Path, list[int]]:
+    """Load a one-module handler package into an app with a reloader."""
+    package_dir = tmp_path / name
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    module = package_dir / "greet.py"
+    module.write_text(MODULE_SOURCE.format(description="Say hi", reply="hi"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(commands, "COMMAND_REGISTRY", commands.CommandRegistry())
+    package = importlib.import_module(name)
+
+    def build(table: Application | HandlerTable) -> None:
+        register_handlers(table, "indexed", "eager", package)
+
+    published: list[int] = []
+
+    async def set_commands(_app: Application) -> None:
+        published.append(len(commands.COMMAND_REGISTRY.visible))
+
+    app = ApplicationBuilder().token("123456:test").build()
+    build(app)
+    reloader = HandlerReloader(
+        app, build, package=package, loading="eager", set_commands=set_commands
+    )
+    return app, reloader, module, published
+
+
+def test_reload_swaps_the_table_and_republishes_only_on_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Changed modules land in a new table; unchanged ones cost nothing."""
+    app, reloader, module, published = make_reloader(
+        tmp_path, monkeypatch, "reload_pkg_swap"
+    )
+    old_table = app.handlers[DISPATCH_GROUP]
+    old_handlers = list(old_table)
+
+    async def scenario() -> list:
+        module.write_text(MODULE_SOURCE.format(description="Say hello", reply="hi"))
+        renamed = await reloader.reload()
+        unchanged = await reloader.reload()
+        module.write_text(MODULE_SOURCE.format(description="Say hello", reply="hey"))
+        body_only = await reloader.reload()
+        return [renamed, unchanged, body_only]
+
+    renamed, unchanged, body_only = asyncio.run(scenario())
+    if app.handlers[DISPATCH_GROUP] is old_table or old_table != old_handlers:
+        msg = "The live table should be replaced, not mutated"
+        raise AssertionError(msg)
+    descriptions = [meta.description for meta in commands.COMMAND_REGISTRY]
+    if descriptions != ["Say hello"]:
+        msg = f"Unexpected registry after reload: {descriptions}"
+        raise AssertionError(msg)
+    outcomes = [
+        (report.modules, report.commands_changed)
+        for report in (renamed, unchanged, body_only)
+    ]
+    expected = [
+        (["reload_pkg_swap.greet"], True),
+        ([], False),
+        (["reload_pkg_swap.greet"], False),
+    ]
+    if outcomes != expected or published != [1]:
+        msg = f"Unexpected reloads: {outcomes}, published {published}"
+        raise AssertionError(msg)
+
+
+def test_failed_import_keeps_the_running_handlers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A broken module leaves table and registry alone until it is fixed."""
+    app, reloader, module, _ = make_reloader(tmp_path, monkeypatch, "reload_pkg_fail")
+    table = app.handlers[DISPATCH_GROUP]
+    registry = commands.COMMAND_REGISTRY
+
+    def running() -> bool:
+        return (
+            app.handlers[DISPATCH_GROUP] is table
+            and commands.COMMAND_REGISTRY is registry
+        )
+
+    async def scenario() -> list:
+        module.write_text("async def greet_command(:\n")
+        failed = await reloader.reload()
+        kept = running()
+        module.write_text(MODULE_SOURCE.format(description="Say hey", reply="hey"))
+        fixed = await reloader.reload()
+        return [failed, kept, fixed]
+
+    failed, kept, fixed = asyncio.run(scenario())
+    if failed is not None or not kept:
+        msg = "A failed reload should keep the running table and registry"
+        raise AssertionError(msg)
+    if fixed is None or fixed.modules != ["reload_pkg_fail.greet"] or running():
+        msg = f"The fixed module should be swapped in: {fixed}"
+        raise AssertionError(msg)
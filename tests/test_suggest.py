@@ -0,0 +1,69 @@
+"""Tests for "did you mean" suggestions in the unknown-command fallback."""
+
+from __future__ import annotations
+
+import random
+import string
+
+from src.handlers.fallback import MAX_TRACKED_NAMES, UnknownCommandCounter
+from src.utils.commands import CommandMeta, CommandRegistry
+from src.utils.suggest import NgramIndex, edit_distance, suggest_commands
+
+
+async def _noop(_update: object, _context: object) -> None:
+    """Do nothing; used as a synthetic callback."""
+
+
+def test_suggests_closest_visible_commands_and_aliases() -> None:
+    """Typos resolve to names and aliases; hidden commands are never offered."""
+    registry = CommandRegistry(
+        [
+            CommandMeta("help", _noop, "Help"),
+            CommandMeta("start", _noop, "Start", aliases=["begin"]),
+            CommandMeta("secret", _noop, "Hidden", hidden=True),
+        ]
+    )
+    cases = {
+        "hepl": ["help"],
+        "strat": ["start"],
+        "begn": ["begin"],
+        "secrte": [],
+        "xyz": [],
+    }
+    for typo, expected in cases.items():
+        if suggest_commands(typo, registry) != expected:
+            msg = f"{typo!r}: {suggest_commands(typo, registry)} != {expected}"
+            raise AssertionError(msg)
+
+
+def test_index_finds_everything_a_full_scan_finds() -> None:
+    """The bigram filter never drops a word within the edit distance."""
+    rng = random.Random(7)
+    words = ["".join(rng.choices("abcde", k=rng.randint(1, 8))) for _ in range(500)]
+    index = NgramIndex(words)
+    for _ in range(100):
+        query = "".join(rng.choices("abcde", k=rng.randint(1, 8)))
+        expected = sorted(
+            (distance, word)
+            for word in set(words)
+            if (distance := edit_distance(query, word)) <= 2  # noqa: PLR2004
+        )
+        if index.search(query, 2) != expected:
+            msg = f"Index and scan disagree for {query!r}"
+            raise AssertionError(msg)
+
+
+def test_unknown_commands_are_counted_in_bounded_memory() -> None:
+    """Misses are aggregated per interval and capped in distinct names."""
+    now = [0.0]
+    counter = UnknownCommandCounter(interval=60, clock=lambda: now[0])
+    for index in range(MAX_TRACKED_NAMES * 3):
+        counter.add(f"typo{index}")
+    if len(counter._counts) != MAX_TRACKED_NAMES + 1:  # noqa: SLF001
+        msg = f"Counter tracks {len(counter._counts)} names"  # noqa: SLF001
+        raise AssertionError(msg)
+    now[0] = 60.0
+    counter.add("hepl")
+    if counter._counts:  # noqa: SLF001
+        msg = "The summary should reset the counts"
+        raise AssertionError(msg)
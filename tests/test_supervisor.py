@@ -0,0 +1,58 @@
+"""Tests for the restart supervisor."""
+
+from __future__ import annotations
+
+from telegram.error import InvalidToken, NetworkError
+
+from src.core.supervisor import Backoff, supervise
+
+
+def test_backoff_doubles_up_to_the_cap_with_jitter() -> None:
+    """Delays double until the cap; the jitter covers their upper half."""
+    highest = Backoff(1, 8, rng=lambda: 1.0)
+    lowest = Backoff(1, 8, rng=lambda: 0.0)
+    if [highest.next_delay() for _ in range(5)] != [1, 2, 4, 8, 8]:
+        msg = "Expected delays of 1, 2, 4, 8 and 8 seconds"
+        raise AssertionError(msg)
+    if [lowest.next_delay() for _ in range(3)] != [0.5, 1, 2]:
+        msg = "Expected the jitter to keep at least half of each delay"
+        raise AssertionError(msg)
+    highest.reset()
+    if highest.next_delay() != 1:
+        msg = "Expected reset to start over"
+        raise AssertionError(msg)
+
+
+def test_supervise_restarts_retryable_failures_only() -> None:
+    """Network errors are retried with backoff; fatal errors and a cap end it."""
+    sleeps: list[float] = []
+    outcomes: list[Exception | None] = [NetworkError("down"), OSError("busy"), None]
+
+    def run() -> None:
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    def always(error: Exception) -> None:
+        raise error
+
+    supervise(run, backoff=Backoff(1, 60, rng=lambda: 1.0), sleep=sleeps.append)
+    if sleeps != [1, 2] or outcomes:
+        msg = f"Expected two restarts, slept {sleeps}"
+        raise AssertionError(msg)
+    for error, expected_sleeps in ((InvalidToken(), 2), (NetworkError("x"), 4)):
+        try:
+            supervise(
+                lambda error=error: always(error),
+                backoff=Backoff(1, 60),
+                max_restarts=2,
+                sleep=sleeps.append,
+            )
+        except type(error):
+            pass
+        else:
+            msg = f"{error!r} should have been re-raised"
+            raise AssertionError(msg)
+        if len(sleeps) != expected_sleeps:
+            msg = f"Unexpected restarts for {error!r}: {sleeps}"
+            raise AssertionError(msg)
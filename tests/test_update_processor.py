@@ -0,0 +1,95 @@
+"""Tests for the update processors."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+import pytest
+
+from src.core.log_context import LogContextHandler
+from src.core.update_processor import (
+    ChatShardedUpdateProcessor,
+    SequentialUpdateProcessor,
+)
+from src.utils.logger import record_factory
+from telegram import Chat, Message, Update
+
+
+def make_update(update_id: int, chat_id: int) -> Update:
+    """Build a text message update for ``chat_id``."""
+    message = Message(
+        message_id=update_id,
+        date=datetime.now(UTC),
+        chat=Chat(chat_id, Chat.PRIVATE),
+        text=str(update_id),
+    )
+    return Update(update_id=update_id, message=message)
+
+
+def test_chats_run_in_parallel_and_stay_ordered() -> None:
+    """Updates of one chat keep their order while other chats are not blocked."""
+    processor = ChatShardedUpdateProcessor(lanes=2, queue_size=10)
+    handled: list[tuple[int, int]] = []
+
+    async def handle(update: Update, delay: float) -> None:
+        await asyncio.sleep(delay)
+        handled.append((update.effective_chat.id, update.update_id))
+
+    async def scenario() -> None:
+        async with processor:
+            # Chat 2 is slow; chat 1 lives on the other lane and must not wait
+            updates = [
+                (make_update(1, 2), 0.05),
+                (make_update(2, 2), 0.0),
+                (make_update(3, 1), 0.0),
+                (make_update(4, 1), 0.0),
+            ]
+            await asyncio.gather(
+                *(processor.process_update(u, handle(u, d)) for u, d in updates)
+            )
+
+    asyncio.run(scenario())
+
+    if handled[:2] != [(1, 3), (1, 4)]:
+        msg = f"Expected chat 1 to finish first, got {handled}"
+        raise AssertionError(msg)
+    if handled[2:] != [(2, 1), (2, 2)]:
+        msg = f"Expected chat 2 updates in order, got {handled}"
+        raise AssertionError(msg)
+
+
+@pytest.mark.parametrize(
+    "processor",
+    [SequentialUpdateProcessor(), ChatShardedUpdateProcessor(lanes=2)],
+    ids=["sequential", "sharded"],
+)
+def test_log_context_is_cleared_after_dispatch(processor: object) -> None:
+    """Records logged once an update is handled do not carry that update."""
+    update = make_update(1, 2)
+    tagged: list[object] = []
+
+    def log_record() -> object:
+        record = record_factory("bot_bot", logging.INFO, __file__, 1, "x", None, None)
+        return record.telegram_update
+
+    async def handle() -> None:
+        LogContextHandler().check_update(update)
+        tagged.append(log_record())
+
+    async def after() -> None:
+        tagged.append(log_record())
+
+    async def scenario() -> None:
+        async with processor:
+            await processor.process_update(update, handle())
+            # Same chat, so the sharded processor reuses the lane task
+            await processor.process_update(make_update(2, 2), after())
+            tagged.append(log_record())
+
+    asyncio.run(scenario())
+
+    if tagged != [update, None, None]:
+        msg = f"Expected only the handled update to be tagged, got {tagged}"
+        raise AssertionError(msg)
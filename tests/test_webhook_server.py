@@ -0,0 +1,78 @@
+"""Tests for the lean aiohttp webhook server."""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from telegram.ext import ApplicationBuilder
+
+from src.core.webhook_server import (
+    SECRET_HEADER,
+    create_webhook_app,
+    queue_submitter,
+)
+
+
+async def post_all(app: web.Application, requests: list) -> list[int]:
+    """Serve ``app`` on a free port and return the status of each request."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    url = f"http://{host}:{port}/hook"
+    statuses = []
+    try:
+        async with aiohttp.ClientSession() as session:
+            for headers, body in requests:
+                async with session.post(url, data=body, headers=headers) as resp:
+                    statuses.append(resp.status)
+    finally:
+        await runner.cleanup()
+    return statuses
+
+
+def test_webhook_checks_secret_and_applies_backpressure() -> None:
+    """Forged and malformed requests are rejected; a full sink answers 503."""
+    accepted: list[dict] = []
+
+    def submit(data: dict, _payload: bytes) -> bool:
+        if len(accepted) >= 2:  # noqa: PLR2004
+            return False
+        accepted.append(data)
+        return True
+
+    app = create_webhook_app(submit, "/hook", secret_token="s3cret")  # noqa: S106
+    good = {SECRET_HEADER: "s3cret"}
+    requests = [
+        ({SECRET_HEADER: "wrong"}, b'{"update_id": 1}'),
+        (good, b"not json"),
+        (good, b"[1, 2]"),
+        (good, b'{"update_id": 1}'),
+        (good, b'{"update_id": 2}'),
+        (good, b'{"update_id": 3}'),
+    ]
+    statuses = asyncio.run(post_all(app, requests))
+    if statuses != [403, 400, 400, 200, 200, 503]:
+        msg = f"Unexpected statuses: {statuses}"
+        raise AssertionError(msg)
+    if [data["update_id"] for data in accepted] != [1, 2]:
+        msg = f"Unexpected accepted updates: {accepted}"
+        raise AssertionError(msg)
+
+
+def test_invalid_updates_are_rejected_with_400() -> None:
+    """Well-formed JSON that PTB cannot turn into an update is a bad request."""
+    application = ApplicationBuilder().token("123456:test").build()
+    app = create_webhook_app(queue_submitter(application), "/hook", secret_token="")
+    requests = [
+        ({}, b'{"message": {"text": "hi"}}'),
+        ({}, b'{"update_id": 1, "message": 5}'),
+        ({}, b'{"update_id": 2}'),
+    ]
+    statuses = asyncio.run(post_all(app, requests))
+    if statuses != [400, 400, 200] or application.update_queue.qsize() != 1:
+        msg = f"Unexpected statuses: {statuses}"
+        raise AssertionError(msg)
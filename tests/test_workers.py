@@ -0,0 +1,160 @@
+"""Tests for the multi-process webhook ingress."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import queue
+from functools import partial
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp import web
+
+from benchmarks._util import StubRequest
+from src.core import runner, workers
+from src.core.workers import WorkerPool, create_ingress, extract_chat_id
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+    import pytest
+
+
+def record_worker(index: int, updates: Queue, results: Queue) -> None:
+    """Worker stand-in that reports which updates it received, in order."""
+    while True:
+        payload = updates.get()
+        if payload is None:
+            return
+        data = json.loads(payload)
+        results.put((index, extract_chat_id(data), data["update_id"]))
+
+
+def make_update(update_id: int, chat_id: int) -> dict:
+    """Build a minimal raw message update."""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Ann"},
+            "text": "/start",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+        },
+    }
+
+
+def test_ingress_routes_by_chat_across_restart() -> None:
+    """Each chat sticks to one worker and keeps its order across a restart."""
+    results = multiprocessing.get_context("spawn").Queue()
+    pool = WorkerPool(3, target=record_worker, target_args=(results,))
+    pool.start()
+    chats = (11, 12, 13, 14, 15)
+
+    async def scenario() -> None:
+        runner = web.AppRunner(create_ingress(pool, "/webhook"))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        url = f"http://{host}:{port}/webhook"
+        loop = asyncio.get_running_loop()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, data=b"not json") as response:
+                    if response.status != 400:  # noqa: PLR2004
+                        msg = f"Expected 400 for invalid JSON, got {response.status}"
+                        raise AssertionError(msg)
+                restart = None
+                for update_id in range(30):
+                    if update_id == 15:  # noqa: PLR2004
+                        restart = loop.run_in_executor(None, pool.restart, 1)
+                    update = make_update(update_id, chats[update_id % len(chats)])
+                    async with session.post(url, json=update) as response:
+                        if response.status != 200:  # noqa: PLR2004
+                            msg = f"Unexpected status {response.status}"
+                            raise AssertionError(msg)
+                await restart
+        finally:
+            await runner.cleanup()
+            await loop.run_in_executor(None, pool.stop)
+
+    asyncio.run(scenario())
+
+    received = [results.get(timeout=10) for _ in range(30)]
+    if pool.restarts != 1:
+        msg = f"Expected one restart, got {pool.restarts}"
+        raise AssertionError(msg)
+    for chat_id in chats:
+        per_chat = [(w, update_id) for w, chat, update_id in received if chat == chat_id]
+        workers = {worker for worker, _ in per_chat}
+        update_ids = [update_id for _, update_id in per_chat]
+        if len(workers) != 1 or update_ids != sorted(update_ids):
+            msg = f"Chat {chat_id} was split or reordered: {per_chat}"
+            raise AssertionError(msg)
+
+
+def test_ingress_rejects_type_confused_updates() -> None:
+    """Mistyped fields never crash routing; a bad update_id is a bad request."""
+    pool = WorkerPool(2)
+    bodies = [
+        {"update_id": 1, "message": {"chat": 5}},
+        {"update_id": 2, "message": {"chat": {"id": "x"}}, "from": []},
+        {"update_id": "a"},
+    ]
+
+    async def scenario() -> list[int]:
+        ingress_runner = web.AppRunner(create_ingress(pool, "/webhook", ""))
+        await ingress_runner.setup()
+        site = web.TCPSite(ingress_runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = ingress_runner.addresses[0][:2]
+        statuses = []
+        try:
+            async with aiohttp.ClientSession() as session:
+                for body in bodies:
+                    url = f"http://{host}:{port}/webhook"
+                    async with session.post(url, json=body) as response:
+                        statuses.append(response.status)
+        finally:
+            await ingress_runner.cleanup()
+        return statuses
+
+    statuses = asyncio.run(scenario())
+    if statuses != [200, 200, 400]:
+        msg = f"Unexpected statuses: {statuses}"
+        raise AssertionError(msg)
+
+
+def test_worker_survives_updates_it_cannot_decode(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The real worker loop drops an invalid update and handles the others."""
+    request = StubRequest()
+    monkeypatch.setattr(runner, "BOT_TOKEN", "123456:test")
+    build = partial(runner.create_application, request=request)
+    monkeypatch.setattr(runner, "create_application", build)
+    updates: queue.Queue = queue.Queue()
+    for payload in (
+        make_update(1, 11),
+        {"update_id": 2, "message": {"text": "x"}},
+        make_update(3, 12),
+    ):
+        updates.put(json.dumps(payload).encode())
+    updates.put(None)
+
+    asyncio.run(workers._serve_worker(1, updates))  # noqa: SLF001
+    if request.calls["sendMessage"] != 2:  # noqa: PLR2004
+        msg = f"Expected replies to both valid updates: {request.calls}"
+        raise AssertionError(msg)
+
+
+def test_workers_share_the_global_send_limit() -> None:
+    """Each worker's outbound scheduler gets an equal part of the global rate."""
+    scheduler = runner.create_outbound_scheduler(4)
+    if scheduler._global_rate != runner.OUTBOUND_GLOBAL_RATE / 4:  # noqa: SLF001
+        msg = f"Unexpected per-worker rate: {scheduler._global_rate}"  # noqa: SLF001
+        raise AssertionError(msg)